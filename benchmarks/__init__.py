@@ -0,0 +1,51 @@
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from aiohttp import web
+
+from squarecloud.http.endpoints import Router
+
+
+@asynccontextmanager
+async def local_api(application: web.Application) -> AsyncIterator[str]:
+    """Serves a stand-in for the API and routes the SDK requests to it"""
+    runner = web.AppRunner(application, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    original_base = Router.BASE_V2
+    Router.BASE_V2 = f'http://127.0.0.1:{port}/v2'
+    try:
+        yield Router.BASE_V2
+    finally:
+        Router.BASE_V2 = original_base
+        await runner.cleanup()
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> tuple[float, int]:
+    """Returns the best wall time and the traced peak memory of `func`"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def mib(size: int) -> str:
+    return f'{size / 2**20:.1f} MiB'
+
+
+def report(title: str, rows: list[tuple[str, ...]]) -> None:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    print(f'\n{title}')
+    for row in rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
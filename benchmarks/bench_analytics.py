@@ -0,0 +1,50 @@
+"""
+Top paths by bytes, visits per day and country share of a DomainAnalytics
+with 10x5000 rows: looping over the model objects against the columnar
+aggregations, conversion included.
+
+    python -m benchmarks.bench_analytics
+"""
+
+from collections import Counter
+
+from benchmarks import measure, mib, report
+from benchmarks.bench_json import analytics_payload
+from squarecloud.analytics import ColumnarAnalytics
+from squarecloud.data import DomainAnalytics
+
+
+def with_models(data: dict) -> None:
+    analytics = DomainAnalytics(**data)
+    paths: Counter[str] = Counter()
+    for row in analytics.paths:
+        paths[row.type] += row.bytes
+    paths.most_common(10)
+    days: Counter[str] = Counter()
+    for row in analytics.visits:
+        days[row.date[:10]] += row.visits
+    countries: Counter[str] = Counter()
+    for row in analytics.countries:
+        countries[row.type] += row.visits
+    overall = sum(countries.values())
+    {key: value / overall for key, value in countries.items()}
+
+
+def with_columns(data: dict) -> None:
+    analytics = ColumnarAnalytics(data)
+    analytics.top_paths(10)
+    analytics.per_day()
+    analytics.country_share()
+
+
+def main() -> None:
+    data = analytics_payload()['response']
+    rows = [('approach', 'time', 'peak memory')]
+    for name, func in (('models', with_models), ('columnar', with_columns)):
+        elapsed, peak = measure(lambda func=func: func(data))
+        rows.append((name, f'{elapsed * 1000:.1f} ms', mib(peak)))
+    report('domain analytics aggregations', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Encode time and peak memory of the create_app_file request body, the
+former list of ints encoded with json.dumps against the streamed byte
+array encoder, on 1, 10 and 50 MB files.
+
+    python -m benchmarks.bench_create_file
+"""
+
+import json
+import os
+
+from benchmarks import measure, mib, report
+from squarecloud._internal.codec import CODEC_NAME, json_dumps
+from squarecloud.http.transfer import JSONBodyPayload
+
+SIZES = (2**20, 10 * 2**20, 50 * 2**20)
+
+
+def list_of_ints(content: bytes) -> int:
+    return len(json.dumps({'content': list(content), 'path': '/file.bin'}))
+
+
+def streamed(content: bytes) -> int:
+    payload = JSONBodyPayload(
+        {'content': content, 'path': '/file.bin'}, json_dumps
+    )
+    return sum(map(len, payload._chunks()))
+
+
+def main() -> None:
+    for size in SIZES:
+        content = os.urandom(size)
+        repeat = 3 if size < 50 * 2**20 else 1
+        rows = [('encoder', 'encode', 'peak memory', 'body')]
+        for name, encode in (
+            ('list of ints', list_of_ints),
+            (f'byte array ({CODEC_NAME})', streamed),
+        ):
+            body = encode(content)
+            elapsed, peak = measure(
+                lambda encode=encode, content=content: encode(content),
+                repeat=repeat,
+            )
+            rows.append(
+                (name, f'{elapsed * 1000:.0f} ms', mib(peak), mib(body))
+            )
+        report(f'create_app_file, {mib(size)} file', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Decode time and peak memory of the JSON codecs on the largest payloads
+returned by the API (USER, DOMAIN_ANALYTICS and FILES_READ).
+
+    python -m benchmarks.bench_json
+"""
+
+import json
+import random
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks import measure, mib, report
+from squarecloud._internal.constants import USING_MSGSPEC, USING_ORJSON
+
+BREAKDOWNS = (
+    'countries',
+    'devices',
+    'os',
+    'browsers',
+    'protocols',
+    'methods',
+    'paths',
+    'referers',
+    'providers',
+)
+
+
+def user_payload(apps: int = 2000) -> dict[str, Any]:
+    return {
+        'status': 'success',
+        'response': {
+            'user': {
+                'id': '1',
+                'name': 'user',
+                'plan': {'name': 'pro', 'memory': {}, 'duration': None},
+            },
+            'applications': [
+                {
+                    'id': f'{i:032x}',
+                    'name': f'app {i}',
+                    'desc': 'a description of the application',
+                    'ram': 512,
+                    'lang': 'python',
+                    'cluster': 'florida-free-1',
+                    'domain': f'app{i}.squareweb.app',
+                    'custom': None,
+                    'created_at': '2024-01-01T00:00:00.000Z',
+                }
+                for i in range(apps)
+            ],
+        },
+    }
+
+
+def analytics_payload(rows: int = 5000) -> dict[str, Any]:
+    def row(i: int, kind: str | None = None) -> dict[str, Any]:
+        data = {
+            'visits': random.randint(0, 10_000),
+            'requests': random.randint(0, 100_000),
+            'bytes': random.randint(0, 10**9),
+            'date': f'2024-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00.000Z',
+        }
+        if kind is not None:
+            data['type'] = kind
+        return data
+
+    response = {'visits': [row(i) for i in range(rows)]}
+    for name in BREAKDOWNS:
+        response[name] = [row(i, f'{name}-{i % 50}') for i in range(rows)]
+    return {'status': 'success', 'response': response}
+
+
+def file_payload(size: int = 5 * 2**20) -> dict[str, Any]:
+    data = list(random.randbytes(size))
+    return {'status': 'success', 'response': {'type': 'Buffer', 'data': data}}
+
+
+def codecs() -> dict[str, Callable[[bytes], Any]]:
+    available: dict[str, Callable[[bytes], Any]] = {'json': json.loads}
+    if USING_ORJSON:
+        import orjson
+
+        available['orjson'] = orjson.loads
+    if USING_MSGSPEC:
+        import msgspec
+
+        available['msgspec'] = msgspec.json.decode
+    return available
+
+
+def main() -> None:
+    payloads = {
+        'USER (2000 apps)': user_payload(),
+        'DOMAIN_ANALYTICS (10x5000 rows)': analytics_payload(),
+        'FILES_READ (5 MiB file)': file_payload(),
+    }
+    for title, payload in payloads.items():
+        raw = json.dumps(payload).encode()
+        rows = [('codec', 'decode', 'peak memory')]
+        for name, loads in codecs().items():
+            elapsed, peak = measure(lambda loads=loads, raw=raw: loads(raw))
+            rows.append((name, f'{elapsed * 1000:.1f} ms', mib(peak)))
+        report(f'{title}, body of {mib(len(raw))}', rows)
+
+
+if __name__ == '__main__':
+    main()
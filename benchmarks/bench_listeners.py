@@ -0,0 +1,85 @@
+"""
+Per-call overhead of RequestListenerManager.notify for a few listener
+signatures, with the squarecloud logger at WARNING and at INFO (the
+records discarded by a NullHandler, so only building them is measured).
+
+    python -m benchmarks.bench_listeners
+"""
+
+import asyncio
+import logging
+import time
+
+from pydantic import BaseModel
+
+from benchmarks import report
+from squarecloud.http import Response
+from squarecloud.http.endpoints import Endpoint, Router
+from squarecloud.listeners import Listener
+from squarecloud.listeners.request_listener import RequestListenerManager
+
+CALLS = 50_000
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+class Car(BaseModel):
+    year: int
+
+
+def no_arguments() -> None:
+    pass
+
+
+async def with_response(response: Response, extra) -> None:
+    pass
+
+
+async def with_model(extra: Person) -> None:
+    pass
+
+
+async def with_union(extra: Person | Car | dict) -> None:
+    pass
+
+
+async def per_call(callback, extra) -> float:
+    endpoint = Endpoint.app_status()
+    manager = RequestListenerManager()
+    manager.include_listener(Listener(endpoint, callback))
+    response = Response(
+        {'status': 'success', 'response': {}}, Router(endpoint, app_id='app')
+    )
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await manager.notify(endpoint, response, extra)
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main() -> None:
+    logger = logging.getLogger('squarecloud')
+    handlers = logger.handlers
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    cases = {
+        'no arguments, sync': (no_arguments, None),
+        'response and extra': (with_response, {'a': 1}),
+        'extra: Person': (with_model, {'name': 'a', 'age': 1}),
+        'extra: Person | Car | dict': (with_union, {'year': 1969}),
+    }
+    rows = [('listener', 'WARNING', 'INFO')]
+    for name, (callback, extra) in cases.items():
+        times = []
+        for level in (logging.WARNING, logging.INFO):
+            logger.setLevel(level)
+            times.append(f'{await per_call(callback, extra):.2f} us')
+        rows.append((name, *times))
+    logger.handlers = handlers
+    report(f'listener notify overhead, {CALLS} calls', rows)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Build time and peak memory of the data models with each backend: 10k
+AppData and a full DomainAnalytics (10x5000 rows), from the decoded dicts
+and from the raw JSON. The backend is chosen at import, so each one runs
+in its own interpreter.
+
+    python -m benchmarks.bench_models
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks import measure, mib, report
+from benchmarks.bench_json import analytics_payload, user_payload
+
+BACKENDS = ('pydantic', 'slots')
+
+
+def run() -> list[tuple[str, ...]]:
+    from squarecloud._internal.constants import MODEL_BACKEND
+    from squarecloud.data import AppData, DomainAnalytics
+
+    apps = user_payload(10_000)['response']['applications']
+    apps_raw = [json.dumps(app).encode() for app in apps]
+    analytics = analytics_payload()['response']
+    analytics_raw = json.dumps(analytics).encode()
+    cases = {
+        '10k AppData from dicts': lambda: [AppData(**app) for app in apps],
+        '10k AppData from JSON': lambda: [
+            AppData.from_json(raw) for raw in apps_raw
+        ],
+        'DomainAnalytics from dict': lambda: DomainAnalytics(**analytics),
+        'DomainAnalytics from JSON': lambda: DomainAnalytics.from_json(
+            analytics_raw
+        ),
+    }
+    rows = []
+    for name, build in cases.items():
+        elapsed, peak = measure(build, repeat=3)
+        rows.append(
+            (MODEL_BACKEND, name, f'{elapsed * 1000:.1f} ms', mib(peak))
+        )
+    return rows
+
+
+def main() -> None:
+    if '--child' in sys.argv:
+        print(json.dumps(run()))
+        return
+    rows = [('backend', 'case', 'build', 'peak memory')]
+    for backend in BACKENDS:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_models', '--child'],
+            env={**os.environ, 'SQUARECLOUD_MODELS': backend},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        rows.extend(map(tuple, json.loads(output)))
+    report('data models', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Decode time and peak memory of the read_app_file response body, the
+former list of ints against the incremental byte array decoder, on 1, 10
+and 20 MB files. The raw body is allocated before tracing in both cases.
+
+    python -m benchmarks.bench_read_file
+"""
+
+import json
+import os
+
+from benchmarks import measure, mib, report
+from squarecloud._internal import codec
+
+SIZES = (2**20, 10 * 2**20, 20 * 2**20)
+READ_SIZE = 2**16
+
+
+def list_of_ints(raw: bytes) -> bytes:
+    return bytes(codec.json_loads(raw)['response']['data'])
+
+
+def incremental(raw: bytes) -> bytes:
+    decoder = codec.ByteArrayDecoder()
+    view = memoryview(raw)
+    for offset in range(0, len(raw), READ_SIZE):
+        decoder.feed(bytes(view[offset : offset + READ_SIZE]))
+    return decoder.close()['response']['data']
+
+
+def main() -> None:
+    for size in SIZES:
+        content = os.urandom(size)
+        raw = json.dumps(
+            {
+                'status': 'success',
+                'response': {'type': 'Buffer', 'data': list(content)},
+            }
+        ).encode()
+        rows = [('decoder', 'decode', 'peak memory', 'peak / file size')]
+        for name, decode in (
+            (f'list of ints ({codec.CODEC_NAME})', list_of_ints),
+            ('byte array decoder', incremental),
+        ):
+            assert decode(raw) == content
+            elapsed, peak = measure(
+                lambda decode=decode, raw=raw: decode(raw), repeat=3
+            )
+            rows.append(
+                (
+                    name,
+                    f'{elapsed * 1000:.0f} ms',
+                    mib(peak),
+                    f'{peak / size:.1f}x',
+                )
+            )
+        report(f'read_app_file, {mib(size)} file', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Requests/sec of one-session-per-request (the old behaviour) against the
+pooled HTTPClient session, using a local stand-in server.
+
+    python -m benchmarks.bench_session
+"""
+
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from benchmarks import local_api, report
+from squarecloud.http import HTTPClient
+from squarecloud.http.endpoints import Endpoint, Router
+
+REQUESTS = 2000
+CONCURRENCY = 50
+
+STATUS = {
+    'status': 'success',
+    'response': {
+        'cpu': '1%',
+        'ram': '20MB',
+        'status': 'running',
+        'running': True,
+        'storage': '1MB',
+        'network': {'total': '0KB', 'now': '0KB'},
+        'uptime': 1,
+    },
+}
+
+
+async def status(_request: web.Request) -> web.Response:
+    return web.json_response(STATUS)
+
+
+async def run(call) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def bounded() -> None:
+        async with semaphore:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    application = web.Application()
+    application.router.add_get('/v2/apps/{app_id}/status', status)
+    async with local_api(application):
+
+        async def session_per_request() -> None:
+            route = Router(Endpoint.app_status(), app_id='app')
+            async with (
+                aiohttp.ClientSession() as session,
+                session.get(route.url) as resp,
+            ):
+                await resp.json()
+
+        http = HTTPClient('key')
+
+        async def pooled() -> None:
+            await http.fetch_app_status('app')
+
+        before = await run(session_per_request)
+        after = await run(pooled)
+        await http.close()
+
+    report(
+        f'{REQUESTS} APP_STATUS requests, concurrency {CONCURRENCY}',
+        [
+            ('mode', 'req/s'),
+            ('session per request', f'{before:.0f}'),
+            ('pooled session', f'{after:.0f}'),
+        ],
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
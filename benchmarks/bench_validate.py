@@ -0,0 +1,88 @@
+"""
+Per-call overhead of the argument validation modes: an Application-like
+method delegating to a Client-like method, both decorated with validate,
+against the undecorated methods. The methods do nothing else, so the
+times are the cost of the decorators alone.
+
+    python -m benchmarks.bench_validate
+"""
+
+import asyncio
+import time
+from functools import partial
+
+from benchmarks import report
+from squarecloud._internal.decorators import validate
+
+CALLS = 100_000
+
+
+class Client:
+    def __init__(self, validation: str) -> None:
+        self.validation = validation
+
+    @validate
+    async def app_files_list(
+        self, app_id: str, path: str, **_kwargs
+    ) -> list[str]:
+        return []
+
+
+class Application:
+    def __init__(self, client: Client) -> None:
+        self.client = client
+        self.id = 'app'
+
+    @property
+    def validation(self) -> str:
+        return self.client.validation
+
+    @validate
+    async def files_list(self, path: str) -> list[str]:
+        return await self.client.app_files_list(
+            self.id, path, avoid_listener=True
+        )
+
+
+class Plain:
+    async def app_files_list(
+        self, app_id: str, path: str, **_kwargs
+    ) -> list[str]:
+        return []
+
+    async def files_list(self, path: str) -> list[str]:
+        return await self.app_files_list('app', path, avoid_listener=True)
+
+
+async def per_call(call) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await call('/')
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main() -> None:
+    plain = Plain()
+    rows = [
+        ('mode', 'Client call', 'Application call'),
+        (
+            'undecorated',
+            f'{await per_call(partial(plain.app_files_list, "app")):.2f} us',
+            f'{await per_call(plain.files_list):.2f} us',
+        ),
+    ]
+    for mode in ('full', 'boundary', 'off'):
+        app = Application(Client(mode))
+        client_call = partial(app.client.app_files_list, 'app')
+        rows.append(
+            (
+                mode,
+                f'{await per_call(client_call):.2f} us',
+                f'{await per_call(app.files_list):.2f} us',
+            )
+        )
+    report(f'validation overhead, {CALLS} calls', rows)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
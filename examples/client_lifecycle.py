@@ -0,0 +1,15 @@
+import asyncio
+
+import squarecloud as square
+
+
+async def example() -> None:
+    connection = square.ConnectionConfig(pool_size=50, keepalive_timeout=60)
+    async with square.Client('API_KEY', connection=connection) as client:
+        # every request reuses the same pooled session
+        for app in await client.all_apps():
+            print(await app.status())
+    # the in-flight requests were drained and the session closed
+
+
+asyncio.run(example())
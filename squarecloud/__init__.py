@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from . import errors, utils
+from .analytics import AnalyticsColumns, ColumnarAnalytics
+from .analytics_store import AnalyticsStore
 from .app import Application
+from .bulk import BulkItem, BulkOperation, BulkResult
 from .client import Client
 from .data import (
     AppData,
@@ -19,21 +22,46 @@ from .data import (
     UserData,
 )
 from .file import File
+from .file_index import RemoteFileIndex
+from .http.cache import FileContentCache, ResponseCache
 from .http.endpoints import Endpoint
-from .http.http_client import Response
+from .http.http_client import ConnectionConfig, Response
+from .http.ratelimit import RateLimit
+from .http.retry import RetryPolicy
+from .http.transfer import TransferProgress
+from .log_history import LogHistory
+from .monitor import Monitor, StatusEvent
+from .sync import SyncResult
 
 __all__ = [
     'Application',
     'Client',
     'File',
+    'RemoteFileIndex',
+    'LogHistory',
+    'Monitor',
+    'BulkItem',
+    'BulkOperation',
+    'BulkResult',
+    'StatusEvent',
     'Endpoint',
     'Response',
+    'ConnectionConfig',
+    'RateLimit',
+    'RetryPolicy',
+    'ResponseCache',
+    'FileContentCache',
+    'TransferProgress',
+    'SyncResult',
     'AppData',
     'Snapshot',
     'SnapshotInfo',
     'DeployData',
     'DNSRecord',
     'DomainAnalytics',
+    'ColumnarAnalytics',
+    'AnalyticsColumns',
+    'AnalyticsStore',
     'FileInfo',
     'LogsData',
     'PlanData',
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import zipfile
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from .ignore import walk
+
+if TYPE_CHECKING:
+    from ..utils import ConfigFile
+
+CHUNK_SIZE = 2**16
+CONFIG_FILE_NAME = 'squarecloud.app'
+CONFIG_FILE_NAMES = frozenset({'squarecloud.app', 'squarecloud.config'})
+# the ZipInfo attribute read by ZipFile.open, public since Python 3.13
+_COMPRESS_LEVEL = (
+    'compress_level'
+    if hasattr(zipfile.ZipInfo, 'compress_level')
+    else '_compresslevel'
+)
+
+
+class _Sink:
+    """
+    Non-seekable stream that collects what zipfile writes until it is
+    drained, so the archive never exists as a whole in memory or on disk.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+class DirectoryArchive:
+    """
+    Zip archive of a source tree produced on the fly, in a single pass over
+    the tree, with the configuration file injected at its root.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        config: ConfigFile,
+        ignore: Iterable[str] = (),
+        compresslevel: int | None = None,
+    ) -> None:
+        """
+        :param path: The source tree root
+        :param config: The configuration file added as `squarecloud.app`
+        :param ignore: Extra gitignore-style patterns, added to the ones of
+        the `.gitignore` files in the tree
+        :param compresslevel: The deflate compression level
+        :return: None
+        """
+        self.path: str = os.fspath(path)
+        if not os.path.isdir(self.path):
+            raise NotADirectoryError(self.path)
+        self.config = config
+        self.ignore: tuple[str, ...] = tuple(ignore)
+        self.compresslevel = compresslevel
+
+    def files(self) -> Iterator[tuple[str, str]]:
+        """
+        Walks the source tree skipping the ignored paths and the config
+        files at its root.
+
+        :return: An iterator of (absolute path, archive name) pairs
+        :rtype: Iterator[tuple[str, str]]
+        """
+        for path, name in walk(self.path, self.ignore):
+            if name not in CONFIG_FILE_NAMES:
+                yield path, name
+
+    def chunks(self) -> Iterator[bytes]:
+        """
+        Builds the archive, yielding it in chunks as it is written
+
+        :return: An iterator of the archive bytes
+        :rtype: Iterator[bytes]
+        """
+        sink = _Sink()
+        with zipfile.ZipFile(
+            sink,
+            'w',
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=self.compresslevel,
+        ) as archive:
+            archive.writestr(CONFIG_FILE_NAME, self.config.content())
+            for path, name in self.files():
+                info = zipfile.ZipInfo.from_file(path, name)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                setattr(info, _COMPRESS_LEVEL, self.compresslevel)
+                with open(path, 'rb') as source, archive.open(
+                    info, 'w'
+                ) as target:
+                    while block := source.read(CHUNK_SIZE):
+                        target.write(block)
+                        if sink.size >= CHUNK_SIZE:
+                            yield sink.drain()
+                if sink.size >= CHUNK_SIZE:
+                    yield sink.drain()
+        if data := sink.drain():
+            yield data
@@ -0,0 +1,164 @@
+import json
+import re
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from .constants import USING_MSGSPEC, USING_ORJSON
+
+JSONLoads = Callable[[bytes], Any]
+JSONDumps = Callable[[Any], bytes | str]
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(',', ':'))
+
+
+# the fastest codec installed is used by default, decoding straight from
+# the response bytes
+if USING_MSGSPEC:
+    import msgspec
+
+    json_loads: JSONLoads = msgspec.json.decode
+    json_dumps: JSONDumps = msgspec.json.encode
+    CODEC_NAME = 'msgspec'
+elif USING_ORJSON:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+    CODEC_NAME = 'orjson'
+else:
+    json_loads = json.loads
+    json_dumps = _stdlib_dumps
+    CODEC_NAME = 'json'
+
+
+# Buffer values are sent by the API as JSON arrays of the byte values, these
+# helpers encode a buffer into that format in bounded chunks instead of
+# building a list with one Python int per byte
+BYTE_ARRAY_CHUNK_SIZE = 2**16
+_BYTE_TEXT = [str(value).encode() for value in range(256)]
+_TEN_OR_MORE = bytes(range(10, 256))
+_HUNDRED_OR_MORE = bytes(range(100, 256))
+
+
+def _encode_bytes(chunk: bytes) -> bytes:
+    if CODEC_NAME == 'json':
+        return b','.join(map(_BYTE_TEXT.__getitem__, chunk))
+    encoded = json_dumps(list(chunk))
+    return (encoded if isinstance(encoded, bytes) else encoded.encode())[
+        1:-1
+    ]
+
+
+def byte_array_chunks(
+    data: bytes | bytearray | memoryview,
+    chunk_size: int = BYTE_ARRAY_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yields the JSON array text of a buffer, `[1,2,3]`, in chunks"""
+    view = memoryview(data).cast('B')
+    yield b'['
+    for offset in range(0, len(view), chunk_size):
+        text = _encode_bytes(view[offset : offset + chunk_size])
+        yield b',' + text if offset else text
+    yield b']'
+
+
+def byte_array_size(
+    data: bytes | bytearray | memoryview,
+    chunk_size: int = BYTE_ARRAY_CHUNK_SIZE,
+) -> int:
+    """Returns the length of the JSON array text of a buffer"""
+    view = memoryview(data).cast('B')
+    size = len(view)
+    digits = size
+    for offset in range(0, size, chunk_size):
+        chunk = bytes(view[offset : offset + chunk_size])
+        # each byte has one digit, plus one from 10 and another from 100
+        digits += len(chunk) - len(chunk.translate(None, _TEN_OR_MORE))
+        digits += len(chunk) - len(chunk.translate(None, _HUNDRED_OR_MORE))
+    return digits + max(size - 1, 0) + 2
+
+
+_BYTE_VALUES = {text: value for value, text in enumerate(_BYTE_TEXT)}
+_ARRAY_START = re.compile(rb'"data"\s*:\s*\[')
+_WHITESPACE = b' \t\r\n'
+
+
+def _decode_bytes(text: bytes, loads: JSONLoads) -> bytes:
+    if loads is json.loads:
+        # the stdlib decoder is slower than a lookup of each byte value
+        if not (text := text.translate(None, _WHITESPACE)):
+            return b''
+        return bytes(map(_BYTE_VALUES.__getitem__, text.split(b',')))
+    return bytes(loads(b'[' + text + b']'))
+
+
+def _set_buffer(obj: Any, value: bytes) -> bool:
+    if isinstance(obj, dict):
+        for key, item in obj.items():
+            if key == 'data' and item is None:
+                obj[key] = value
+                return True
+            if _set_buffer(item, value):
+                return True
+    elif isinstance(obj, list):
+        return any(_set_buffer(item, value) for item in obj)
+    return False
+
+
+class ByteArrayDecoder:
+    """
+    Incremental decoder of a JSON body holding a buffer as a `data` array
+    of byte values. The array is converted into bytes as the body arrives,
+    one chunk at a time, and the rest of the body is decoded at the end.
+    """
+
+    def __init__(self, loads: JSONLoads = json_loads) -> None:
+        self._loads = loads
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._pending = b''
+        self._buffer = bytearray()
+        self._in_array = False
+        self._done = False
+
+    def feed(self, chunk: bytes) -> None:
+        if self._done:
+            self._tail += chunk
+            return
+        if not self._in_array:
+            self._head += chunk
+            if (match := _ARRAY_START.search(self._head)) is None:
+                return
+            chunk = bytes(self._head[match.end() :])
+            del self._head[match.end() - 1 :]
+            self._in_array = True
+        text = self._pending + chunk
+        if (end := text.find(b']')) != -1:
+            self._buffer += _decode_bytes(text[:end], self._loads)
+            self._pending = b''
+            self._in_array = False
+            self._done = True
+            self._tail += text[end + 1 :]
+            return
+        # a number may continue in the next chunk
+        cut = text.rfind(b',')
+        if cut != -1:
+            self._buffer += _decode_bytes(text[:cut], self._loads)
+        self._pending = text[cut + 1 :]
+
+    def close(self) -> Any:
+        """
+        Returns the decoded body, with the buffer as bytes
+
+        :raises ValueError: Raised when the body is not valid JSON
+        """
+        if self._in_array:
+            raise ValueError('unterminated byte array')
+        if not self._done:
+            return self._loads(bytes(self._head))
+        data = self._loads(bytes(self._head + b'null' + self._tail))
+        buffer, self._buffer = bytes(self._buffer), bytearray()
+        _set_buffer(data, buffer)
+        return data
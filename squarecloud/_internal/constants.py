@@ -1,3 +1,21 @@
+import os
 from importlib.util import find_spec
 
 USING_PYDANTIC = bool(find_spec('pydantic'))
+USING_ORJSON = bool(find_spec('orjson'))
+USING_MSGSPEC = bool(find_spec('msgspec'))
+USING_NUMPY = bool(find_spec('numpy'))
+
+# the data models are pydantic dataclasses when pydantic is installed,
+# unless SQUARECLOUD_MODELS=slots selects the lighter slotted dataclasses
+MODEL_BACKEND = (
+    'pydantic'
+    if USING_PYDANTIC and os.getenv('SQUARECLOUD_MODELS', 'pydantic') != 'slots'
+    else 'slots'
+)
+
+# argument validation of the decorated methods, see decorators.validate:
+# full, boundary or off, a Client can choose its own mode
+VALIDATION = os.getenv('SQUARECLOUD_VALIDATE', 'full')
+if VALIDATION not in ('full', 'boundary', 'off'):
+    VALIDATION = 'full'
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import posixpath
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from ..errors import NotFoundError
+
+Listing = list[dict[str, Any]]
+ListDirectory = Callable[[str], Awaitable[Listing]]
+Descend = Callable[[str, dict[str, Any]], bool]
+
+
+async def crawl(
+    list_directory: ListDirectory,
+    root: str,
+    max_concurrency: int = 8,
+    descend: Descend | None = None,
+) -> AsyncIterator[tuple[str, Listing]]:
+    """
+    Lists a remote tree breadth-first with a pool of workers, yielding each
+    listing as soon as it arrives. A listing is always yielded before the
+    listings of its subdirectories.
+
+    :param list_directory: Returns the raw entries of a directory
+    :param root: The directory to crawl
+    :param max_concurrency: Maximum concurrent listings, at least one
+    :param descend: Called with the path and the raw entry of each
+    subdirectory, the subdirectory is only listed when it returns True
+    :return: An async iterator of (directory, raw entries) pairs
+    :rtype: AsyncIterator[tuple[str, Listing]]
+
+    :raises NotFoundError: Raised when `root` does not exist
+    """
+    directories: asyncio.Queue[str] = asyncio.Queue()
+    listings: asyncio.Queue[tuple[str, Listing] | Exception] = asyncio.Queue()
+    # directories queued whose listing was not yielded yet
+    outstanding = 1
+    directories.put_nowait(root)
+
+    async def worker() -> None:
+        nonlocal outstanding
+        while True:
+            directory = await directories.get()
+            try:
+                entries = await list_directory(directory)
+            except NotFoundError as exc:
+                # a subdirectory may be removed during the crawl
+                listings.put_nowait(
+                    exc if directory == root else (directory, [])
+                )
+                continue
+            except Exception as exc:  # noqa: BLE001
+                listings.put_nowait(exc)
+                continue
+            listings.put_nowait((directory, entries))
+            for entry in entries:
+                if entry.get('type') != 'directory':
+                    continue
+                path = posixpath.join(directory, entry['name'])
+                if descend is None or descend(path, entry):
+                    outstanding += 1
+                    directories.put_nowait(path)
+
+    workers = [
+        asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))
+    ]
+    try:
+        while outstanding:
+            listing = await listings.get()
+            outstanding -= 1
+            if isinstance(listing, Exception):
+                raise listing
+            yield listing
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
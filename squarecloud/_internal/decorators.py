@@ -1,16 +1,76 @@
-from typing import Any, Callable, TypeVar
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import Any, Callable, Literal, TypeVar
 
-from .constants import USING_PYDANTIC
+from .constants import USING_PYDANTIC, VALIDATION
 
 if USING_PYDANTIC:
     from pydantic import ConfigDict, validate_call
 
 F = TypeVar('F', bound=Callable[..., Any])
+ValidationMode = Literal['full', 'boundary', 'off']
+
+# set while a call validated in the `boundary` mode runs, the calls it makes
+# to other decorated methods receive arguments already validated
+_validated: ContextVar[bool] = ContextVar(
+    'squarecloud_validated', default=False
+)
 
 
 def validate(func: F) -> Callable[..., Any] | F:
-    if USING_PYDANTIC:
-        return validate_call(config=ConfigDict(arbitrary_types_allowed=True))(
-            func
+    """
+    Validates the arguments of a function with pydantic, according to the
+    `validation` attribute of the object it is called on, or to the
+    SQUARECLOUD_VALIDATE environment variable: `full` validates every call,
+    `boundary` only the outermost decorated call, so an Application method
+    does not validate again the arguments it passes to the Client, and
+    `off` none.
+
+    :param func: The function
+    :return: The decorated function
+    """
+    if not USING_PYDANTIC:
+        return func
+    validated = validate_call(config=ConfigDict(arbitrary_types_allowed=True))(
+        func
+    )
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # the mode of the object the method is called on, e.g. a Client
+            mode = (
+                getattr(args[0], 'validation', VALIDATION)
+                if args
+                else VALIDATION
+            )
+            if mode == 'full':
+                return await validated(*args, **kwargs)
+            if mode == 'off' or _validated.get():
+                return await func(*args, **kwargs)
+            token = _validated.set(True)
+            try:
+                return await validated(*args, **kwargs)
+            finally:
+                _validated.reset(token)
+
+        return wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        mode = (
+            getattr(args[0], 'validation', VALIDATION) if args else VALIDATION
         )
-    return func
+        if mode == 'full':
+            return validated(*args, **kwargs)
+        if mode == 'off' or _validated.get():
+            return func(*args, **kwargs)
+        token = _validated.set(True)
+        try:
+            return validated(*args, **kwargs)
+        finally:
+            _validated.reset(token)
+
+    return wrapper
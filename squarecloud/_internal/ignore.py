@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+IGNORE_FILE_NAME = '.gitignore'
+ALWAYS_IGNORED = ('.git/',)
+
+
+def translate(pattern: str) -> str:
+    """Translates a gitignore glob into a regular expression"""
+    parts: list[str] = []
+    index, size = 0, len(pattern)
+    while index < size:
+        char = pattern[index]
+        if pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+            continue
+        if pattern.startswith('**', index):
+            parts.append('.*')
+            index += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '\\' and index + 1 < size:
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        elif char == '[' and (end := pattern.find(']', index + 2)) != -1:
+            group = pattern[index + 1 : end].replace('\\', '\\\\')
+            if group[0] in '!^':
+                group = '^' + group[1:]
+            parts.append(f'[{group}]')
+            index = end
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    regex: re.Pattern[str]
+    base: str
+    negated: bool
+    directory_only: bool
+
+    @classmethod
+    def parse(cls, line: str, base: str = '') -> IgnoreRule | None:
+        line = line.rstrip('\n')
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+        negated = line.startswith('!')
+        if negated or line.startswith('\\'):
+            line = line[1:]
+        directory_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+        # patterns with a slash other than a trailing one are relative to
+        # the directory of the ignore file, the others match at any depth
+        anchored = '/' in line
+        body = translate(line.lstrip('/'))
+        prefix = '' if anchored else '(?:.*/)?'
+        return cls(
+            regex=re.compile(f'{prefix}{body}'),
+            base=base,
+            negated=negated,
+            directory_only=directory_only,
+        )
+
+    def match(self, path: str, is_dir: bool) -> bool:
+        if self.directory_only and not is_dir:
+            return False
+        if self.base:
+            if not path.startswith(self.base + '/'):
+                return False
+            path = path[len(self.base) + 1 :]
+        return self.regex.fullmatch(path) is not None
+
+
+class IgnoreRules:
+    """
+    Matcher for `.gitignore`-style patterns. Paths are relative to the
+    source tree root and use forward slashes. As in git, the last matching
+    pattern wins and negated patterns (`!pattern`) re-include a path.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self.rules: list[IgnoreRule] = []
+        self.extend(patterns)
+
+    def extend(self, patterns: Iterable[str], base: str = '') -> None:
+        """
+        Adds patterns relative to the `base` directory
+
+        :param patterns: The gitignore-style patterns
+        :param base: The directory of the ignore file the patterns come from
+        :return: None
+        """
+        for line in patterns:
+            if (rule := IgnoreRule.parse(line, base)) is not None:
+                self.rules.append(rule)
+
+    def load(self, path: str, base: str = '') -> None:
+        """
+        Adds the patterns of an ignore file if it exists
+
+        :param path: The ignore file path
+        :param base: The directory of the ignore file relative to the root
+        :return: None
+        """
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8', errors='replace') as file:
+                self.extend(file, base)
+
+    def ignored(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Returns whether a path is ignored
+
+        :param path: The path relative to the root
+        :param is_dir: Whether the path is a directory
+        :return: True if the path is ignored
+        :rtype: bool
+        """
+        ignored = False
+        for rule in self.rules:
+            if rule.negated == ignored and rule.match(path, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+
+def walk(root: str, patterns: Iterable[str] = ()) -> Iterator[tuple[str, str]]:
+    """
+    Walks a source tree in a stable order, skipping `.git/`, the paths
+    matched by the `.gitignore` files of the tree and the extra patterns.
+    The ignored directories are not descended into.
+
+    :param root: The source tree root
+    :param patterns: Extra gitignore-style patterns
+    :return: An iterator of (absolute path, relative posix path) pairs
+    :rtype: Iterator[tuple[str, str]]
+    """
+    rules = IgnoreRules((*ALWAYS_IGNORED, *patterns))
+    for directory, dirs, files in os.walk(root):
+        base = os.path.relpath(directory, root).replace(os.sep, '/')
+        base = '' if base == '.' else base
+        rules.load(os.path.join(directory, IGNORE_FILE_NAME), base)
+        prefix = f'{base}/' if base else ''
+        dirs[:] = sorted(
+            name for name in dirs
+            if not rules.ignored(prefix + name, is_dir=True)
+        )
+        for name in sorted(files):
+            if not rules.ignored(prefix + name):
+                yield os.path.join(directory, name), prefix + name
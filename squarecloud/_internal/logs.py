@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+_MODULUS = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def _prefix_hashes(hashes: Sequence[int]) -> list[int]:
+    prefix = [0] * (len(hashes) + 1)
+    value = 0
+    for position, item in enumerate(hashes, 1):
+        value = (value * _BASE + item) % _MODULUS
+        prefix[position] = value
+    return prefix
+
+
+def overlap(previous: Sequence[str], current: Sequence[str]) -> int:
+    """
+    Returns the length of the longest suffix of `previous` that is also a
+    prefix of `current`, i.e. how many lines of the current log window were
+    already in the previous one.
+
+    The candidates are compared by rolling hashes of the line hashes, from
+    the longest one, and only a matching candidate is compared line by line,
+    so a window is processed in linear time.
+
+    :param previous: The lines of the previous window
+    :param current: The lines of the current window
+    :return: The number of overlapping lines
+    :rtype: int
+    """
+    longest = min(len(previous), len(current))
+    if not longest:
+        return 0
+    tail = previous[len(previous) - longest :]
+    suffix = _prefix_hashes([hash(line) % _MODULUS for line in tail])
+    prefix = _prefix_hashes(
+        [hash(line) % _MODULUS for line in current[:longest]]
+    )
+    powers = [1] * (longest + 1)
+    for position in range(1, longest + 1):
+        powers[position] = powers[position - 1] * _BASE % _MODULUS
+    for size in range(longest, 0, -1):
+        start = longest - size
+        value = (suffix[longest] - suffix[start] * powers[size]) % _MODULUS
+        if value == prefix[size] and tail[start:] == current[:size]:
+            return size
+    return 0
+
+
+class LogTail:
+    """
+    Turns successive log windows, each one the whole recent log of an
+    application, into the lines appended between them.
+
+    A last line without a line break may still be written, so it is only
+    returned once it is complete or the next window shows it unchanged.
+    """
+
+    def __init__(self) -> None:
+        self._window: str = ''
+        self._lines: list[str] = []
+        self._pending: str | None = None
+        self._pending_returned: bool = False
+
+    def update(self, window: str) -> list[str]:
+        """
+        Returns the lines of `window` that were not in the previous window,
+        without their line breaks
+
+        :param window: The current log window
+        :return: The new lines
+        :rtype: list[str]
+        """
+        if window == self._window and (
+            self._pending is None or self._pending_returned
+        ):
+            return []
+        lines = window.splitlines(keepends=True)
+        pending = None
+        if lines and not lines[-1].endswith(('\n', '\r')):
+            pending = lines.pop()
+
+        if self._window and window.startswith(self._window):
+            # nothing was dropped from the start of the window
+            new = lines[len(self._lines) :]
+        else:
+            new = lines[overlap(self._lines, lines) :]
+        if (
+            new
+            and self._pending_returned
+            and new[0].rstrip('\r\n') == self._pending
+        ):
+            # the pending line was completed after being returned
+            new = new[1:]
+
+        returned = False
+        if pending is not None and pending == self._pending:
+            if not self._pending_returned:
+                new.append(pending)
+            returned = True
+        self._window = window
+        self._lines = lines
+        self._pending = pending
+        self._pending_returned = returned
+        return [line.rstrip('\r\n') for line in new]
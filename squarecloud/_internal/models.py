@@ -0,0 +1,156 @@
+"""
+The `slots` model backend: frozen dataclasses with __slots__, converting
+only the fields that need it instead of validating every field.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import sys
+import types
+import typing
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from .codec import json_loads
+from .constants import USING_MSGSPEC
+
+if USING_MSGSPEC:
+    import msgspec
+
+
+def _conversion(annotation: Any, value: str, names: dict[str, Any]) -> str:
+    """
+    Returns the expression converting `value` to a field type, `value`
+    itself if it is stored as it is. The objects used by the expression are
+    added to `names`.
+    """
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        arguments = [
+            argument
+            for argument in typing.get_args(annotation)
+            if argument is not type(None)
+        ]
+        if len(arguments) == 1:
+            return _conversion(arguments[0], value, names)
+        return value
+    if origin is list:
+        (argument,) = typing.get_args(annotation) or (Any,)
+        item = _conversion(argument, '_item', names)
+        if item == '_item':
+            return value
+        return (
+            f'[{item} for _item in {value}] '
+            f'if {value}.__class__ is list else {value}'
+        )
+    if annotation is datetime:
+        names['_datetime'] = datetime.fromisoformat
+        return f'_datetime({value}) if {value}.__class__ is str else {value}'
+    if annotation is float:
+        return f'float({value}) if {value}.__class__ is int else {value}'
+    if isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+        name = f'_model_{len(names)}'
+        names[name] = annotation
+        return f'{name}(**{value}) if {value}.__class__ is dict else {value}'
+    return value
+
+
+def _namespace(cls: type) -> dict[str, Any]:
+    """The names visible to the annotations of a class, its own nested
+    classes and the ones of its enclosing classes included"""
+    namespace = dict(vars(sys.modules[cls.__module__]))
+    scope: Any = sys.modules[cls.__module__]
+    for part in cls.__qualname__.split('.'):
+        if (scope := getattr(scope, part, None)) is None:
+            break
+        namespace.update(
+            {
+                name: value
+                for name, value in vars(scope).items()
+                if isinstance(value, type)
+            }
+        )
+    return namespace
+
+
+def _build_init(cls: type) -> Callable[..., None]:
+    """
+    Generates the constructor of a model, like dataclasses does, setting
+    each field converted and swallowing the unknown keyword arguments.
+    Inlining the conversions keeps it about twice as fast as wrapping the
+    dataclass constructor with a function per field.
+    """
+    hints = typing.get_type_hints(cls, localns=_namespace(cls))
+    names: dict[str, Any] = {'_set': object.__setattr__}
+    parameters = []
+    body = []
+    for field in dataclasses.fields(cls):
+        if field.default is not dataclasses.MISSING:
+            names[f'_default_{field.name}'] = field.default
+            parameters.append(f'{field.name}=_default_{field.name}')
+        elif field.default_factory is not dataclasses.MISSING:
+            names['_missing'] = dataclasses.MISSING
+            names[f'_factory_{field.name}'] = field.default_factory
+            parameters.append(f'{field.name}=_missing')
+            body.append(
+                f'    if {field.name} is _missing: '
+                f'{field.name} = _factory_{field.name}()'
+            )
+        else:
+            parameters.append(field.name)
+        value = _conversion(hints[field.name], field.name, names)
+        body.append(f'    _set(self, {field.name!r}, {value})')
+    source = (
+        f'def __init__(self, {", ".join(parameters)}, **_unknown):\n'
+        + '\n'.join(body or ['    pass'])
+    )
+    namespace: dict[str, Any] = {}
+    exec(source, names, namespace)  # noqa: S102
+    init = namespace['__init__']
+    init.__qualname__ = f'{cls.__qualname__}.__init__'
+    return init
+
+
+def slots_dataclass(cls: type) -> type:
+    """
+    Turns a class into a frozen slotted dataclass whose constructor ignores
+    unknown keyword arguments and converts the ISO datetimes, the nested
+    models and the integers given to float fields, like the pydantic
+    backend does, without validating the other fields.
+
+    :param cls: The model class
+    :return: The dataclass
+    :rtype: type
+    """
+    cls = dataclasses.dataclass(frozen=True, slots=True)(cls)
+
+    def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+        # generated on the first construction, once every model is defined
+        init = _build_init(cls)
+        cls.__init__ = init
+        init(self, *args, **kwargs)
+
+    cls.__init__ = __init__
+    return cls
+
+
+@functools.cache
+def _decoder(cls: type) -> msgspec.json.Decoder:
+    return msgspec.json.Decoder(cls)
+
+
+def decode(cls: type, data: bytes | str) -> Any:
+    """
+    Decodes a model from a JSON object. With msgspec installed the model is
+    built straight from the JSON bytes, otherwise from the decoded dict.
+
+    :param cls: The model class
+    :param data: The JSON object
+    :return: The model
+    """
+    if USING_MSGSPEC:
+        return _decoder(cls).decode(data)
+    return cls(**json_loads(data))
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, Literal
+
+from ._internal.constants import USING_NUMPY
+from .data import DomainAnalytics
+
+if USING_NUMPY:
+    import numpy as np
+
+Metric = Literal['visits', 'requests', 'bytes']
+Period = Literal['hour', 'day', 'month']
+
+METRICS: tuple[Metric, ...] = ('visits', 'requests', 'bytes')
+BREAKDOWNS: dict[str, type] = {
+    'visits': DomainAnalytics.Visits,
+    'countries': DomainAnalytics.Countries,
+    'devices': DomainAnalytics.Devices,
+    'os': DomainAnalytics.Os,
+    'browsers': DomainAnalytics.Browsers,
+    'protocols': DomainAnalytics.Protocols,
+    'methods': DomainAnalytics.Methods,
+    'paths': DomainAnalytics.Paths,
+    'referers': DomainAnalytics.Referers,
+    'providers': DomainAnalytics.Providers,
+}
+# length of the ISO date prefix identifying each period
+_PERIODS: dict[str, int] = {'hour': 13, 'day': 10, 'month': 7}
+
+
+def _encode(values: list[str]) -> tuple[array, list[str]]:
+    """Dictionary-encodes strings into codes and their distinct values"""
+    codes: dict[str, int] = {}
+    encoded = array(
+        'I', [codes.setdefault(value, len(codes)) for value in values]
+    )
+    return encoded, list(codes)
+
+
+def _group_sum(codes: array, values: array, groups: int) -> list[int]:
+    """Sums `values` by their group code"""
+    if USING_NUMPY:
+        totals = np.zeros(groups, dtype=np.int64)
+        np.add.at(
+            totals,
+            np.frombuffer(codes, dtype=np.uint32),
+            np.frombuffer(values, dtype=np.int64),
+        )
+        return totals.tolist()
+    totals = [0] * groups
+    for code, value in zip(codes, values):
+        totals[code] += value
+    return totals
+
+
+class AnalyticsColumns:
+    """
+    One breakdown of the domain analytics stored as columns: the metrics
+    as int64 arrays, the dates and the types dictionary-encoded. The
+    aggregations work on the arrays, with NumPy when it is installed,
+    without creating an object per row.
+    """
+
+    __slots__ = (
+        '_dates',
+        '_model',
+        '_types',
+        'bytes',
+        'date_codes',
+        'requests',
+        'type_codes',
+        'visits',
+    )
+
+    def __init__(self, rows: list[dict[str, Any]], model: type) -> None:
+        """
+        :param rows: The rows of the breakdown, as returned by the API
+        :param model: The DomainAnalytics class of a row
+        :return: None
+        """
+        self._model = model
+        self.visits = array('q', [row.get('visits', 0) for row in rows])
+        self.requests = array('q', [row.get('requests', 0) for row in rows])
+        self.bytes = array('q', [row.get('bytes', 0) for row in rows])
+        self.date_codes, self._dates = _encode([row['date'] for row in rows])
+        self.type_codes, self._types = _encode(
+            [row.get('type', '') for row in rows]
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        model: type,
+        metrics: tuple[array, array, array],
+        dates: tuple[array, list[str]],
+        types: tuple[array, list[str]],
+    ) -> AnalyticsColumns:
+        """
+        Builds the columns from arrays already encoded, without rows
+
+        :param model: The DomainAnalytics class of a row
+        :param metrics: The visits, requests and bytes int64 arrays
+        :param dates: The date codes and the distinct dates
+        :param types: The type codes and the distinct types
+        :return: The columns
+        :rtype: AnalyticsColumns
+        """
+        columns = cls.__new__(cls)
+        columns._model = model
+        columns.visits, columns.requests, columns.bytes = metrics
+        columns.date_codes, columns._dates = dates
+        columns.type_codes, columns._types = types
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.visits)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Creates the row objects on demand"""
+        with_type = 'type' in self._model.__dataclass_fields__
+        for position in range(len(self)):
+            row = {
+                'visits': self.visits[position],
+                'requests': self.requests[position],
+                'bytes': self.bytes[position],
+                'date': self._dates[self.date_codes[position]],
+            }
+            if with_type:
+                row['type'] = self._types[self.type_codes[position]]
+            yield self._model(**row)
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}({self._model.__name__}, '
+            f'rows={len(self)})'
+        )
+
+    @property
+    def types(self) -> list[str]:
+        """
+        Returns the distinct types of the breakdown, e.g. the paths
+
+        :return: The types
+        :rtype: list[str]
+        """
+        return list(self._types)
+
+    def column(self, name: str) -> array | list[str]:
+        """
+        Returns a whole column
+
+        :param name: visits, requests, bytes, date or type
+        :return: The metric array or the list of strings
+        :rtype: array | list[str]
+        """
+        if name == 'date':
+            return [self._dates[code] for code in self.date_codes]
+        if name == 'type':
+            return [self._types[code] for code in self.type_codes]
+        if name not in METRICS:
+            raise ValueError(f'unknown column {name!r}')
+        return getattr(self, name)
+
+    def totals(self, by: Metric = 'visits') -> dict[str, int]:
+        """
+        Returns the total of a metric by type
+
+        :param by: The metric
+        :return: The totals by type
+        :rtype: dict[str, int]
+        """
+        sums = _group_sum(self.type_codes, getattr(self, by), len(self._types))
+        return dict(zip(self._types, sums))
+
+    def top(self, n: int = 10, by: Metric = 'visits') -> list[tuple[str, int]]:
+        """
+        Returns the types with the largest total of a metric
+
+        :param n: How many types are returned
+        :param by: The metric
+        :return: (type, total) pairs from the largest
+        :rtype: list[tuple[str, int]]
+        """
+        totals = self.totals(by)
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+
+    def share(self, by: Metric = 'visits') -> dict[str, float]:
+        """
+        Returns the fraction of a metric each type accounts for
+
+        :param by: The metric
+        :return: The fractions by type, summing to 1
+        :rtype: dict[str, float]
+        """
+        totals = self.totals(by)
+        if not (overall := sum(totals.values())):
+            return dict.fromkeys(totals, 0.0)
+        return {key: total / overall for key, total in totals.items()}
+
+    def resample(
+        self, by: Metric = 'visits', period: Period = 'day'
+    ) -> list[tuple[datetime, int]]:
+        """
+        Returns the total of a metric per hour, day or month
+
+        :param by: The metric
+        :param period: The period
+        :return: (period start, total) pairs in chronological order
+        :rtype: list[tuple[datetime, int]]
+        """
+        size = _PERIODS[period]
+        # the periods of the distinct dates, then the dates by period
+        keys: dict[str, int] = {}
+        mapping = [
+            keys.setdefault(date[:size], len(keys)) for date in self._dates
+        ]
+        if USING_NUMPY:
+            codes = array(
+                'I',
+                np.asarray(mapping, dtype=np.uint32)[
+                    np.frombuffer(self.date_codes, dtype=np.uint32)
+                ].tobytes(),
+            )
+        else:
+            codes = array('I', [mapping[code] for code in self.date_codes])
+        sums = _group_sum(codes, getattr(self, by), len(keys))
+        suffix = '-01' if period == 'month' else ''
+        return sorted(
+            (datetime.fromisoformat(key + suffix), total)
+            for key, total in zip(keys, sums)
+        )
+
+
+class ColumnarAnalytics:
+    """
+    The domain analytics of an application kept as the raw response until
+    a breakdown is accessed, which is then converted to AnalyticsColumns
+    once.
+    """
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """
+        :param data: The DOMAIN_ANALYTICS response
+        :return: None
+        """
+        self._data: dict[str, Any] = data
+        self._columns: dict[str, AnalyticsColumns] = {}
+
+    def __getattr__(self, name: str) -> AnalyticsColumns:
+        if name not in BREAKDOWNS:
+            raise AttributeError(name)
+        if (columns := self._columns.get(name)) is None:
+            columns = self._columns[name] = AnalyticsColumns(
+                self._data.get(name) or [], BREAKDOWNS[name]
+            )
+        return columns
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}('
+            f'converted={sorted(self._columns)})'
+        )
+
+    def top_paths(
+        self, n: int = 10, by: Metric = 'bytes'
+    ) -> list[tuple[str, int]]:
+        """
+        Returns the paths with the largest total of a metric
+
+        :param n: How many paths are returned
+        :param by: The metric
+        :return: (path, total) pairs from the largest
+        :rtype: list[tuple[str, int]]
+        """
+        return self.paths.top(n, by)
+
+    def per_day(self, by: Metric = 'visits') -> list[tuple[datetime, int]]:
+        """
+        Returns the daily total of a metric
+
+        :param by: The metric
+        :return: (day, total) pairs in chronological order
+        :rtype: list[tuple[datetime, int]]
+        """
+        return self.visits.resample(by, 'day')
+
+    def country_share(self, by: Metric = 'visits') -> dict[str, float]:
+        """
+        Returns the fraction of a metric each country accounts for
+
+        :param by: The metric
+        :return: The fractions by country
+        :rtype: dict[str, float]
+        """
+        return self.countries.share(by)
+
+    def to_model(self) -> DomainAnalytics:
+        """
+        Builds the DomainAnalytics object with one object per row
+
+        :return: A DomainAnalytics object
+        :rtype: DomainAnalytics
+        """
+        return DomainAnalytics(**self._data)
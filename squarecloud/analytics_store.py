@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import os
+import re
+import struct
+from array import array
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ._internal.constants import USING_NUMPY
+from .analytics import (
+    BREAKDOWNS,
+    AnalyticsColumns,
+    ColumnarAnalytics,
+    Metric,
+    Period,
+)
+from .bulk import BulkResult
+from .data import DomainAnalytics
+
+if USING_NUMPY:
+    import numpy as np
+
+if TYPE_CHECKING:
+    from .client import Client
+
+# magic, rows and size of the JSON list of the types added by the segment
+_SEGMENT = struct.Struct('<4sII')
+_MAGIC = b'SQA1'
+_APP_ID = re.compile(r'[\w-]+')
+
+
+@functools.lru_cache(maxsize=4096)
+def _epoch(value: str | datetime) -> int:
+    """The seconds since the epoch of a row date, UTC when naive"""
+    moment = (
+        value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    )
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return int(moment.timestamp())
+
+
+def _bound(value: datetime | float | None) -> int | None:
+    if isinstance(value, datetime):
+        return _epoch(value)
+    return None if value is None else int(value)
+
+
+def _iso(epoch: int) -> str:
+    moment = datetime.fromtimestamp(epoch, UTC)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _rows(
+    analytics: DomainAnalytics | ColumnarAnalytics | dict[str, Any],
+    name: str,
+) -> list[Any]:
+    if isinstance(analytics, ColumnarAnalytics):
+        analytics = analytics._data
+    if isinstance(analytics, dict):
+        return analytics.get(name) or []
+    return getattr(analytics, name) or []
+
+
+def _field(row: Any, name: str, default: Any = 0) -> Any:
+    if isinstance(row, dict):
+        return row.get(name, default)
+    return getattr(row, name, default)
+
+
+class _Series:
+    """
+    The rows of one breakdown of one application, deduplicated by date and
+    type, in memory as columns and on disk as appended segments
+    """
+
+    __slots__ = (
+        '_index',
+        '_type_index',
+        'bytes',
+        'dates',
+        'disk_rows',
+        'first',
+        'last',
+        'path',
+        'requests',
+        'segments',
+        'type_codes',
+        'types',
+        'visits',
+    )
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.dates: array = array('q')
+        self.type_codes: array = array('I')
+        self.visits: array = array('q')
+        self.requests: array = array('q')
+        self.bytes: array = array('q')
+        self.types: list[str] = []
+        self._type_index: dict[str, int] = {}
+        self._index: dict[tuple[int, int], int] = {}
+        self.first: int | None = None
+        self.last: int | None = None
+        self.segments: int = 0
+        self.disk_rows: int = 0
+        if path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _type(self, kind: str, added: list[str] | None = None) -> int:
+        if (code := self._type_index.get(kind)) is None:
+            code = self._type_index[kind] = len(self.types)
+            self.types.append(kind)
+            if added is not None:
+                added.append(kind)
+        return code
+
+    def _apply(
+        self, date: int, code: int, visits: int, requests: int, nbytes: int
+    ) -> bool:
+        """Inserts or replaces a row, returns whether anything changed"""
+        position = self._index.get((date, code))
+        if position is None:
+            self._index[date, code] = len(self.dates)
+            self.dates.append(date)
+            self.type_codes.append(code)
+            self.visits.append(visits)
+            self.requests.append(requests)
+            self.bytes.append(nbytes)
+            self.first = date if self.first is None else min(self.first, date)
+            self.last = date if self.last is None else max(self.last, date)
+            return True
+        if (
+            self.visits[position] == visits
+            and self.requests[position] == requests
+            and self.bytes[position] == nbytes
+        ):
+            return False
+        self.visits[position] = visits
+        self.requests[position] = requests
+        self.bytes[position] = nbytes
+        return True
+
+    def _load(self) -> None:
+        data = self.path.read_bytes()
+        offset = 0
+        while offset + _SEGMENT.size <= len(data):
+            magic, rows, size = _SEGMENT.unpack_from(data, offset)
+            end = offset + _SEGMENT.size + size + rows * 36
+            if magic != _MAGIC or end > len(data):
+                break
+            position = offset + _SEGMENT.size
+            for kind in json.loads(data[position : position + size]):
+                self._type(kind)
+            position += size
+            columns = []
+            for typecode in ('q', 'I', 'q', 'q', 'q'):
+                column = array(typecode)
+                width = column.itemsize * rows
+                column.frombytes(data[position : position + width])
+                columns.append(column)
+                position += width
+            for row in zip(*columns):
+                self._apply(*row)
+            self.segments += 1
+            self.disk_rows += rows
+            offset = end
+        if offset < len(data):
+            # a segment cut short by an interrupted write
+            with open(self.path, 'r+b') as file:
+                file.truncate(offset)
+
+    @staticmethod
+    def _segment(columns: list[array], added: list[str]) -> bytes:
+        types = json.dumps(added).encode()
+        return b''.join(
+            [
+                _SEGMENT.pack(_MAGIC, len(columns[0]), len(types)),
+                types,
+                *(column.tobytes() for column in columns),
+            ]
+        )
+
+    def merge(self, rows: Iterable[Any]) -> int:
+        """Adds the new and changed rows, returns how many"""
+        added: list[str] = []
+        columns = [array(typecode) for typecode in ('q', 'I', 'q', 'q', 'q')]
+        for row in rows:
+            values = (
+                _epoch(_field(row, 'date')),
+                self._type(_field(row, 'type', '') or '', added),
+                _field(row, 'visits'),
+                _field(row, 'requests'),
+                _field(row, 'bytes'),
+            )
+            if self._apply(*values):
+                for column, value in zip(columns, values):
+                    column.append(value)
+        if not (changed := len(columns[0])):
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as file:
+            file.write(self._segment(columns, added))
+        self.segments += 1
+        self.disk_rows += changed
+        return changed
+
+    def compact(self) -> None:
+        """Rewrites the file as a single segment without replaced rows"""
+        if self.segments <= 1 and self.disk_rows == len(self):
+            return
+        columns = [
+            self.dates,
+            self.type_codes,
+            self.visits,
+            self.requests,
+            self.bytes,
+        ]
+        temporary = self.path.with_suffix('.tmp')
+        temporary.write_bytes(self._segment(columns, self.types))
+        os.replace(temporary, self.path)
+        self.segments = 1
+        self.disk_rows = len(self)
+
+    def select(self, start: int | None, end: int | None) -> array | None:
+        """
+        The positions of the rows between `start` and `end`, None when
+        every row is selected
+        """
+        if self.first is None or (
+            (start is None or self.first >= start)
+            and (end is None or self.last <= end)
+        ):
+            return None
+        if (start is not None and self.last < start) or (
+            end is not None and self.first > end
+        ):
+            return array('I')
+        low = start if start is not None else self.first
+        high = end if end is not None else self.last
+        if USING_NUMPY:
+            dates = np.frombuffer(self.dates, dtype=np.int64)
+            selected = np.flatnonzero((dates >= low) & (dates <= high))
+            return array('I', selected.astype(np.uint32).tobytes())
+        return array(
+            'I',
+            [
+                position
+                for position, date in enumerate(self.dates)
+                if low <= date <= high
+            ],
+        )
+
+
+class AnalyticsStore:
+    """
+    Local store of the domain analytics of many applications, which grows
+    with each response merged into it.
+
+    Each breakdown of each application is kept in `<path>/<app_id>/
+    <breakdown>.bin` as columns appended in segments: only the rows whose
+    date and type were not stored yet, or whose values changed, are
+    written, so the overlapping buckets downloaded again cost nothing. A
+    file is rewritten as one segment by compact(), or automatically when
+    the replaced rows outnumber the live ones.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """
+        :param path: The directory of the store, created when missing
+        :return: None
+        """
+        self.path: Path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._series: dict[tuple[str, str], _Series] = {}
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({str(self.path)!r})'
+
+    def _get(self, app_id: str, breakdown: str) -> _Series:
+        if not _APP_ID.fullmatch(app_id):
+            raise ValueError(f'invalid application id {app_id!r}')
+        if breakdown not in BREAKDOWNS:
+            raise ValueError(f'unknown breakdown {breakdown!r}')
+        key = (app_id, breakdown)
+        if (series := self._series.get(key)) is None:
+            series = self._series[key] = _Series(
+                self.path / app_id / f'{breakdown}.bin'
+            )
+        return series
+
+    def apps(self) -> list[str]:
+        """
+        Returns the ids of the applications with stored analytics
+
+        :return: The application ids
+        :rtype: list[str]
+        """
+        return sorted(
+            entry.name for entry in self.path.iterdir() if entry.is_dir()
+        )
+
+    def merge(
+        self,
+        app_id: str,
+        analytics: DomainAnalytics | ColumnarAnalytics | dict[str, Any],
+    ) -> int:
+        """
+        Merges a DOMAIN_ANALYTICS response of an application into the store
+
+        :param app_id: The application id
+        :param analytics: The analytics, as a model, a ColumnarAnalytics or
+        the response dict
+        :return: How many rows were added or changed
+        :rtype: int
+        """
+        changed = 0
+        for breakdown in BREAKDOWNS:
+            series = self._get(app_id, breakdown)
+            changed += series.merge(_rows(analytics, breakdown))
+            if series.disk_rows > 2 * len(series):
+                series.compact()
+        return changed
+
+    def compact(self) -> None:
+        """
+        Rewrites every file of the store as a single segment
+
+        :return: None
+        """
+        for app_id in self.apps():
+            for breakdown in BREAKDOWNS:
+                self._get(app_id, breakdown).compact()
+
+    def query(
+        self,
+        breakdown: str = 'visits',
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        app_ids: Iterable[str] | None = None,
+    ) -> AnalyticsColumns:
+        """
+        Returns the rows of a breakdown dated between `start` and `end`
+        across the applications, as columns that can be aggregated with
+        totals, top, share and resample. The naive datetimes are UTC.
+
+        :param breakdown: The breakdown, e.g. visits, paths or countries
+        :param start: The earliest date
+        :param end: The latest date
+        :param app_ids: The applications, all the stored ones by default
+        :return: The rows of every application together
+        :rtype: AnalyticsColumns
+        """
+        if breakdown not in BREAKDOWNS:
+            raise ValueError(f'unknown breakdown {breakdown!r}')
+        low, high = _bound(start), _bound(end)
+        metrics = (array('q'), array('q'), array('q'))
+        date_codes, type_codes = array('I'), array('I')
+        dates: dict[int, int] = {}
+        types: dict[str, int] = {}
+        for app_id in self.apps() if app_ids is None else app_ids:
+            series = self._get(app_id, breakdown)
+            selected = series.select(low, high)
+            if selected is None:
+                app_dates = series.dates
+                app_types = series.type_codes
+                for target, column in zip(
+                    metrics, (series.visits, series.requests, series.bytes)
+                ):
+                    target.extend(column)
+            else:
+                app_dates = [series.dates[i] for i in selected]
+                app_types = [series.type_codes[i] for i in selected]
+                for target, column in zip(
+                    metrics, (series.visits, series.requests, series.bytes)
+                ):
+                    target.extend(column[i] for i in selected)
+            date_codes.extend(
+                dates.setdefault(date, len(dates)) for date in app_dates
+            )
+            # the types of the application to the ones of the result
+            mapping: list[int | None] = [None] * len(series.types)
+            for code in app_types:
+                if (target := mapping[code]) is None:
+                    target = mapping[code] = types.setdefault(
+                        series.types[code], len(types)
+                    )
+                type_codes.append(target)
+        return AnalyticsColumns.from_arrays(
+            BREAKDOWNS[breakdown],
+            metrics,
+            (date_codes, [_iso(date) for date in dates]),
+            (type_codes, list(types)),
+        )
+
+    def per_app(
+        self,
+        by: Metric = 'visits',
+        breakdown: str = 'visits',
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+    ) -> dict[str, int]:
+        """
+        Returns the total of a metric of each application
+
+        :param by: The metric
+        :param breakdown: The breakdown summed
+        :param start: The earliest date
+        :param end: The latest date
+        :return: The totals by application id
+        :rtype: dict[str, int]
+        """
+        low, high = _bound(start), _bound(end)
+        totals = {}
+        for app_id in self.apps():
+            series = self._get(app_id, breakdown)
+            column = getattr(series, by)
+            if (selected := series.select(low, high)) is None:
+                totals[app_id] = sum(column)
+            else:
+                totals[app_id] = sum(column[i] for i in selected)
+        return totals
+
+    def rollup(
+        self,
+        by: Metric = 'visits',
+        period: Period = 'day',
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        app_ids: Iterable[str] | None = None,
+        breakdown: str = 'visits',
+    ) -> list[tuple[datetime, int]]:
+        """
+        Returns the total of a metric per hour, day or month across the
+        applications
+
+        :param by: The metric
+        :param period: The period
+        :param start: The earliest date
+        :param end: The latest date
+        :param app_ids: The applications, all the stored ones by default
+        :param breakdown: The breakdown summed
+        :return: (period start, total) pairs in chronological order
+        :rtype: list[tuple[datetime, int]]
+        """
+        return self.query(breakdown, start, end, app_ids).resample(by, period)
+
+    async def fetch(
+        self,
+        client: Client,
+        app_ids: Iterable[str] | None = None,
+        concurrency: int = 8,
+    ) -> BulkResult:
+        """
+        Downloads the analytics of many applications concurrently and
+        merges them into the store. The concurrency is capped by the budget
+        left in the client rate limit, which paces the requests.
+
+        :param client: The client making the requests
+        :param app_ids: The applications, all the ones of the account by
+        default
+        :param concurrency: Maximum requests in flight
+        :return: The rows added or changed by application id, and the
+        failures
+        :rtype: BulkResult
+        """
+        if app_ids is None:
+            app_ids = [app.id for app in await client.all_apps()]
+        if remaining := client.rate_limit.remaining:
+            concurrency = min(concurrency, remaining)
+
+        async def operation(app_id: str) -> int:
+            analytics = await client.domain_analytics(app_id, columnar=True)
+            # the segments are written to disk off the event loop
+            return await asyncio.to_thread(self.merge, app_id, analytics)
+
+        return await client.bulk(operation, app_ids, concurrency)
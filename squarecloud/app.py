@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import posixpath
+from collections.abc import AsyncIterator, Iterable
 from datetime import datetime
 from functools import wraps
 from io import BytesIO
@@ -9,7 +13,10 @@ from typing_extensions import deprecated
 
 from squarecloud import errors
 
+from ._internal.crawl import crawl
 from ._internal.decorators import validate
+from ._internal.ignore import walk
+from ._internal.logs import LogTail
 from .data import (
     AppData,
     DeployData,
@@ -22,12 +29,17 @@ from .data import (
     StatusData,
 )
 from .file import File
+from .file_index import RemoteFileIndex
 from .http import Endpoint, HTTPClient, Response
+from .http.transfer import ProgressCallback
 from .listeners import Listener, ListenerConfig
 from .listeners.capture_listener import CaptureListenerManager
+from .log_history import LogHistory
+from .sync import SyncResult, is_outdated
 
 # avoid circular imports
 if TYPE_CHECKING:
+    from .analytics import ColumnarAnalytics
     from .client import Client
 
 T = TypeVar('T')
@@ -43,7 +55,8 @@ class AppCache:
         '_logs',
         '_backup',
         '_app_data',
-        '_snapshot'
+        '_snapshot',
+        'log_history',
     )
 
     def __init__(self) -> None:
@@ -60,6 +73,7 @@ class AppCache:
         self._backup: Snapshot | None = None
         self._snapshot: Snapshot | None = None
         self._app_data: AppData | None = None
+        self.log_history: LogHistory | None = None
 
     @property
     def status(self) -> StatusData:
@@ -148,6 +162,8 @@ class AppCache:
                 self._status = arg
             elif isinstance(arg, LogsData):
                 self._logs = arg
+                if self.log_history is not None:
+                    self.log_history.add(arg.logs or '')
             elif isinstance(arg, Snapshot):
                 self._backup = arg
                 self._snapshot = arg
@@ -265,6 +281,17 @@ class Application(CaptureListenerManager):
         """
         return self._client
 
+    @property
+    def validation(self) -> str:
+        """
+        Returns how the method arguments are validated, the mode of the
+        client
+
+        :return: full, boundary or off
+        :rtype: str
+        """
+        return self._client.validation
+
     @property
     def id(self) -> str:
         """
@@ -478,6 +505,82 @@ class Application(CaptureListenerManager):
         logs: LogsData = await self.client.get_logs(self.id)
         return logs
 
+    def enable_log_history(
+        self, history: LogHistory | None = None, **options: Any
+    ) -> LogHistory:
+        """
+        The enable_log_history method makes the application keep the lines
+        returned by each `logs()` call in a compressed history, without the
+        lines already returned by the previous call.
+
+        :param self: Refer to the class instance
+        :param history: The LogHistory to use, one is created with
+         `options` when None
+        :param options: The LogHistory arguments, e.g. max_bytes or path
+        :return: The LogHistory of the application
+        :rtype: LogHistory
+        """
+        if history is None:
+            history = LogHistory(**options)
+        self.cache.log_history = history
+        return history
+
+    @property
+    def log_history(self) -> LogHistory | None:
+        """
+        The log_history property returns the log history of the
+        application, None if it was not enabled with enable_log_history.
+
+        :return: A LogHistory object or None
+        :rtype: LogHistory | None
+        """
+        return self.cache.log_history
+
+    async def tail_logs(
+        self,
+        interval: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        include_existing: bool = True,
+    ) -> AsyncIterator[str]:
+        """
+        The tail_logs method polls the application's logs and yields only
+        the lines appended since the previous poll, without their line
+        breaks.
+
+        Each poll returns the whole recent log window, the new lines are
+        found by matching the start of the window with the end of the
+        previous one. The interval is halved after a poll with new lines
+        and grows by half after a poll without them.
+
+        :param self: Refer to the class instance
+        :param interval: Seconds between the first polls
+        :param min_interval: Minimum seconds between two polls
+        :param max_interval: Maximum seconds between two polls
+        :param include_existing: Whether the lines already in the window
+         on the first poll are yielded
+        :return: An async iterator of log lines
+        :rtype: AsyncIterator[str]
+        """
+        tail = LogTail()
+        interval = min(max(interval, min_interval), max_interval)
+        first = True
+        while True:
+            logs: LogsData = await self.client.get_logs(
+                self.id, avoid_listener=True
+            )
+            lines = tail.update(logs.logs or '')
+            if first and not include_existing:
+                lines = []
+            first = False
+            for line in lines:
+                yield line
+            if lines:
+                interval = max(interval / 2, min_interval)
+            else:
+                interval = min(interval * 1.5, max_interval)
+            await asyncio.sleep(interval)
+
     @_update_cache
     @_notify_listener(Endpoint.app_status())
     async def status(self, *_args, **_kwargs) -> StatusData:
@@ -571,18 +674,29 @@ class Application(CaptureListenerManager):
         return response
 
     @validate
-    async def commit(self, file: File) -> Response:
+    async def commit(
+        self,
+        file: File,
+        progress: ProgressCallback | None = None,
+        max_bandwidth: float | None = None,
+    ) -> Response:
         """
         The commit function is used to commit the application.
 
 
         :param self: Refer to the class instance
         :param file: File: The squarecloud.File to be committed
+        :param progress: Called with a TransferProgress as the file is sent
+        :param max_bandwidth: Maximum upload rate in bytes per second
         :return: A Response object
         :rtype: Response
         """
         response: Response = await self.client.commit(
-            self.id, file=file, avoid_listener=True
+            self.id,
+            file=file,
+            progress=progress,
+            max_bandwidth=max_bandwidth,
+            avoid_listener=True,
         )
         return response
 
@@ -605,17 +719,21 @@ class Application(CaptureListenerManager):
         return response
 
     @validate
-    async def read_file(self, path: str) -> BytesIO:
+    async def read_file(
+        self, path: str, info: FileInfo | None = None
+    ) -> BytesIO:
         """
         The read_file function reads the contents of a file from an app.
 
         :param self: Refer to the class instance
         :param path: str: Specify the path of the file to be read
+        :param info: FileInfo: The current information of the file, spares
+         the listing that validates the client file_cache
         :return: A BytesIO object
         :rtype: BytesIO
         """
         response: BytesIO = await self.client.read_app_file(
-            self.id, path, avoid_listener=True
+            self.id, path, info, avoid_listener=True
         )
         return response
 
@@ -653,6 +771,162 @@ class Application(CaptureListenerManager):
         )
         return response
 
+    async def walk(
+        self, path: str = '/', max_concurrency: int = 8
+    ) -> AsyncIterator[FileInfo]:
+        """
+        The walk function crawls the application files under a directory
+        breadth-first. Up to `max_concurrency` directories are listed at the
+        same time and the entries of each listing are yielded as soon as it
+        arrives, directories included.
+
+        :param self: Refer to the class instance
+        :param path: The directory to walk
+        :param max_concurrency: Maximum concurrent listings
+        :return: An async iterator of FileInfo objects
+        :rtype: AsyncIterator[FileInfo]
+
+        :raises NotFoundError: Raised when `path` does not exist
+        """
+        async for directory, entries in crawl(
+            self._list_directory, '/' + path.strip('/'), max_concurrency
+        ):
+            for data in entries:
+                yield FileInfo(
+                    **data,
+                    app_id=self.id,
+                    path=posixpath.join(directory, data['name']),
+                )
+
+    async def _list_directory(self, path: str) -> list[dict[str, Any]]:
+        """
+        Returns the raw entries of an application directory
+
+        :param path: The directory path
+        :return: The entries as returned by the API
+        :rtype: list[dict[str, Any]]
+        """
+        response: Response = await self._http.fetch_app_files_list(
+            self.id, path
+        )
+        return response.response or []
+
+    async def file_index(
+        self, path: str = '/', max_concurrency: int = 8
+    ) -> RemoteFileIndex:
+        """
+        The file_index function crawls the application files and returns a
+        compact local index of them, queryable without requests.
+
+        :param self: Refer to the class instance
+        :param path: The indexed directory
+        :param max_concurrency: Maximum concurrent listings
+        :return: A RemoteFileIndex object
+        :rtype: RemoteFileIndex
+        """
+        return await RemoteFileIndex.build(self, path, max_concurrency)
+
+    async def _remote_files(
+        self, path: str, concurrency: int
+    ) -> dict[str, FileInfo]:
+        """
+        Lists the files under a remote directory
+
+        :param path: The remote directory
+        :param concurrency: Maximum concurrent listings
+        :return: The files by path relative to `path`, empty when the
+        directory does not exist
+        :rtype: dict[str, FileInfo]
+        """
+        files: dict[str, FileInfo] = {}
+        try:
+            async for entry in self.walk(path, concurrency):
+                if entry.type == 'file':
+                    files[posixpath.relpath(entry.path, path)] = entry
+        except errors.NotFoundError:
+            return {}
+        return files
+
+    async def sync_directory(
+        self,
+        local_path: str | os.PathLike[str],
+        remote_path: str = '/',
+        concurrency: int = 4,
+        delete: bool = False,
+        ignore: Iterable[str] = (),
+        dry_run: bool = False,
+    ) -> SyncResult:
+        """
+        The sync_directory function mirrors a local directory into the
+        application, like rsync: only the files whose size differs or that
+        were modified locally after the remote copy are uploaded. The
+        requests run concurrently, paced by the client rate limit.
+
+        :param self: Refer to the class instance
+        :param local_path: The local directory
+        :param remote_path: The application directory to sync into
+        :param concurrency: Maximum concurrent requests
+        :param delete: Whether to delete the remote files that do not exist
+        locally
+        :param ignore: Extra gitignore-style patterns, added to the ones of
+        the `.gitignore` files of the local tree
+        :param dry_run: Only compute what would change
+        :return: A SyncResult object
+        :rtype: SyncResult
+        """
+        remote_root = '/' + remote_path.strip('/')
+        remote = await self._remote_files(remote_root, concurrency)
+        local = {
+            relative: path
+            for path, relative in walk(os.fspath(local_path), ignore)
+        }
+        result = SyncResult()
+        uploads: list[str] = []
+        for relative, path in local.items():
+            if is_outdated(os.stat(path), remote.get(relative)):
+                uploads.append(relative)
+            else:
+                result.unchanged.append(relative)
+        orphans = sorted(remote.keys() - local.keys()) if delete else []
+        if dry_run:
+            result.uploaded, result.deleted = uploads, orphans
+            return result
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(relative: str) -> None:
+            async with semaphore:
+                file: File | None = None
+                try:
+                    file = File(local[relative])
+                    await self.create_file(
+                        file,
+                        posixpath.join(remote_root, relative).lstrip('/'),
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    result.errors[relative] = exc
+                else:
+                    result.uploaded.append(relative)
+                finally:
+                    if file is not None:
+                        file.bytes.close()
+
+        async def remove(relative: str) -> None:
+            async with semaphore:
+                try:
+                    await self.delete_file(
+                        posixpath.join(remote_root, relative)
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    result.errors[relative] = exc
+                else:
+                    result.deleted.append(relative)
+
+        await asyncio.gather(*map(upload, uploads), *map(remove, orphans))
+        result.uploaded.sort()
+        result.deleted.sort()
+        return result
+
     async def last_deploys(self) -> list[list[DeployData]]:
         """
         The last_deploys function returns a list of the last deploys for this
@@ -685,17 +959,23 @@ class Application(CaptureListenerManager):
         )
         return webhook
 
-    async def domain_analytics(self) -> DomainAnalytics:
+    async def domain_analytics(
+        self, columnar: bool = False
+    ) -> DomainAnalytics | ColumnarAnalytics:
         """
         Retrieve analytics data for the application's domain.
 
         :param self: Refer to the instance of the class.
+        :param columnar: Return a ColumnarAnalytics, converted to columns
+         lazily and aggregated without an object per row
         :returns: An instance of :class:`DomainAnalytics` containing analytics data for the domain.
-        :rtype: DomainAnalytics
+        :rtype: DomainAnalytics | ColumnarAnalytics
         :raises Exception: If the analytics data could not be retrieved.
         """
-        analytics: DomainAnalytics = await self.client.domain_analytics(
-            self.id, avoid_listener=True
+        analytics: DomainAnalytics | ColumnarAnalytics = (
+            await self.client.domain_analytics(
+                self.id, columnar, avoid_listener=True
+            )
         )
         return analytics
 
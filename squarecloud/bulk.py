@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .errors import SquareException
+
+BulkCallable = Callable[[str], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class BulkItem:
+    """
+    The outcome of a bulk operation on one application
+
+    :ivar app_id: The application id
+    :ivar result: What the operation returned, None if it failed
+    :ivar error: The exception raised by the operation, None if it succeeded
+    """
+
+    app_id: str
+    result: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns whether the operation succeeded
+
+        :return: True if no exception was raised
+        :rtype: bool
+        """
+        return self.error is None
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk operation
+
+    :ivar succeeded: The results by application id
+    :ivar failed: The exceptions by application id
+    """
+
+    succeeded: dict[str, Any] = field(default_factory=dict)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns whether the operation succeeded on every application
+
+        :return: True if there are no failures
+        :rtype: bool
+        """
+        return not self.failed
+
+
+class BulkOperation:
+    """
+    An operation run on many applications by a pool of workers, the
+    requests still being paced by the client rate limit. A failure does not
+    stop the other applications.
+
+    Iterate it with `async for` to receive each BulkItem as soon as it
+    completes, or await it to get the BulkResult. It runs only once.
+    """
+
+    def __init__(
+        self,
+        operation: BulkCallable,
+        app_ids: list[str],
+        concurrency: int = 8,
+    ) -> None:
+        """
+        :param operation: Called with each application id
+        :param app_ids: The application ids
+        :param concurrency: Maximum applications handled at the same time
+        :return: None
+        """
+        self.operation: BulkCallable = operation
+        self.app_ids: list[str] = list(dict.fromkeys(app_ids))
+        self.concurrency: int = max(1, concurrency)
+        self._started: bool = False
+
+    def __len__(self) -> int:
+        return len(self.app_ids)
+
+    async def __aiter__(self) -> AsyncIterator[BulkItem]:
+        if self._started:
+            raise SquareException('a bulk operation can only run once')
+        self._started = True
+        pending: asyncio.Queue[str] = asyncio.Queue()
+        for app_id in self.app_ids:
+            pending.put_nowait(app_id)
+        done: asyncio.Queue[BulkItem] = asyncio.Queue()
+
+        async def worker() -> None:
+            while not pending.empty():
+                app_id = pending.get_nowait()
+                try:
+                    result = await self.operation(app_id)
+                except Exception as exc:  # noqa: BLE001
+                    done.put_nowait(BulkItem(app_id, error=exc))
+                else:
+                    done.put_nowait(BulkItem(app_id, result=result))
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.concurrency, len(self.app_ids)))
+        ]
+        try:
+            for _ in self.app_ids:
+                yield await done.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _collect(self) -> BulkResult:
+        result = BulkResult()
+        async for item in self:
+            if item.ok:
+                result.succeeded[item.app_id] = item.result
+            else:
+                result.failed[item.app_id] = item.error
+        return result
+
+    def __await__(self) -> Generator[Any, None, BulkResult]:
+        return self._collect().__await__()
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import posixpath
+from collections.abc import Iterable
 from functools import wraps
 from io import BytesIO
-from typing import Any, Callable, Literal, ParamSpec, TypeVar
+from typing import Any, Callable, Literal, ParamSpec, Self, TypeVar
 
 from typing_extensions import deprecated
 
-from ._internal.decorators import validate
+from ._internal.codec import JSONDumps, JSONLoads
+from ._internal.constants import VALIDATION
+from ._internal.decorators import ValidationMode, validate
+from .analytics import ColumnarAnalytics
 from .app import Application
+from .bulk import BulkCallable, BulkOperation
 from .data import (
     AppData,
     DeployData,
@@ -24,17 +30,43 @@ from .data import (
     UploadData,
     UserData,
 )
-from .errors import ApplicationNotFound, InvalidFile, SquareException
+from .errors import (
+    ApplicationNotFound,
+    InvalidFile,
+    NotFoundError,
+    SquareException,
+)
 from .file import File
-from .http import HTTPClient, Response
+from .http import ConnectionConfig, HTTPClient, HTTPStats, Response
+from .http.cache import FileContentCache, ResponseCache
 from .http.endpoints import Endpoint
+from .http.ratelimit import RateLimit
+from .http.retry import RetryPolicy
+from .http.transfer import ProgressCallback
 from .listeners import Listener, ListenerConfig
 from .listeners.request_listener import RequestListenerManager
 from .logger import logger
+from .monitor import Monitor
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
+APP_DATA_FIELDS = frozenset(AppData.__dataclass_fields__)
+
+
+def _app_data(payload: dict[str, Any]) -> AppData:
+    """Builds an AppData from the APP_DATA response, whose language may
+    be named `language` and be an object with a name"""
+    data = dict(payload)
+    if "lang" not in data and "language" in data:
+        language = data["language"]
+        data["lang"] = (
+            language.get("name") if isinstance(language, dict) else language
+        )
+    return AppData(
+        **{key: value for key, value in data.items() if key in APP_DATA_FIELDS}
+    )
+
 
 class Client(RequestListenerManager):
     """A client for interacting with the SquareCloud API."""
@@ -49,6 +81,15 @@ class Client(RequestListenerManager):
             "ERROR",
             "CRITICAL",
         ] = "INFO",
+        connection: ConnectionConfig | None = None,
+        rate_limit: RateLimit | None = None,
+        retry_policies: dict[str, RetryPolicy | None] | None = None,
+        response_cache: ResponseCache | None = None,
+        file_cache: FileContentCache | None = None,
+        json_loads: JSONLoads | None = None,
+        json_dumps: JSONDumps | None = None,
+        index_apps: bool = False,
+        validation: ValidationMode | None = None,
     ) -> None:
         """
         The __init__ function is called when the class is instantiated.
@@ -60,6 +101,29 @@ class Client(RequestListenerManager):
         :param api_key: str: Your API key, get in:
          https://squarecloud.app/dashboard/me
         :param debug: bool: Set the logging level to debug
+        :param connection: ConnectionConfig: The connection pool settings
+         used by the underlying HTTP session
+        :param rate_limit: RateLimit: The token bucket used to pace the
+         requests, its budget is learned from the API headers by default
+        :param retry_policies: dict[str, RetryPolicy | None]: Retry policies
+         by endpoint name. GET endpoints are retried by default, the other
+         ones only when a policy is set for them
+        :param response_cache: ResponseCache: An optional TTL cache of the
+         API responses, invalidated by the requests that change them
+        :param file_cache: FileContentCache: An optional cache of the file
+         contents read with read_app_file, validated with a listing of the
+         file directory instead of downloading the file again
+        :param json_loads: Callable: Decodes the response bodies from bytes,
+         orjson or msgspec is used by default when installed
+        :param json_dumps: Callable: Encodes the request bodies into bytes or
+         str, orjson or msgspec is used by default when installed
+        :param index_apps: bool: Keep an index of the applications by id,
+         built from a single user request and shared by app and all_apps
+        :param validation: str: How the method arguments are validated:
+         "full" on every call, "boundary" only on the outermost call, so
+         the Application methods do not validate again what they pass to
+         the client, or "off". Defaults to the SQUARECLOUD_VALIDATE
+         environment variable, then "full"
         :return: None
         """
         self.log_level = log_level
@@ -67,12 +131,48 @@ class Client(RequestListenerManager):
 
         if not isinstance(self._api_key, str):
             raise TypeError("api_key must be str")
-
-        self._http = HTTPClient(api_key=api_key)
+        if validation not in (None, "full", "boundary", "off"):
+            raise ValueError(
+                f"invalid validation {validation!r}, use one of "
+                "'full', 'boundary' or 'off'"
+            )
+        self.validation: ValidationMode = validation or VALIDATION
+
+        self._http = HTTPClient(
+            api_key=api_key,
+            connection=connection,
+            rate_limit=rate_limit,
+            retry_policies=retry_policies,
+            cache=response_cache,
+            json_loads=json_loads,
+            json_dumps=json_dumps,
+        )
+        self.file_cache: FileContentCache | None = file_cache
+        self.index_apps: bool = index_apps
+        self._app_index: dict[str, AppData] | None = None
         self.logger = logger
         logger.setLevel(log_level)
         super().__init__()
 
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self, timeout: float | None = None) -> None:
+        """
+        The aclose method waits for the in-flight requests to finish and
+        closes the HTTP session and its connection pool.
+
+        :param timeout: Maximum seconds to wait for the in-flight requests,
+            None waits indefinitely
+        :return: None
+        :raises asyncio.TimeoutError: Raised when the in-flight requests do
+                not finish before the timeout
+        """
+        await self._http.close(timeout=timeout)
+
     @property
     def api_key(self) -> str:
         """
@@ -83,6 +183,42 @@ class Client(RequestListenerManager):
         """
         return self._api_key
 
+    @property
+    def rate_limit(self) -> RateLimit:
+        """
+        Returns the current rate-limit budget of the client.
+
+        :return: The RateLimit token bucket
+        :rtype: RateLimit
+        """
+        return self._http.rate_limit
+
+    @property
+    def stats(self) -> HTTPStats:
+        """
+        Returns the request counters of the client, such as how many calls
+        were coalesced into an identical in-flight request.
+
+        :return: The HTTPStats counters
+        :rtype: HTTPStats
+        """
+        return self._http.stats
+
+    def set_retry_policy(
+        self, endpoint: Endpoint, policy: RetryPolicy | None
+    ) -> None:
+        """
+        The set_retry_policy method sets how the requests to an endpoint
+        are retried on transient failures (5xx responses, connection errors
+        and timeouts).
+
+        :param endpoint: Endpoint: The endpoint
+        :param policy: RetryPolicy: The retry policy, None disables the
+            retries
+        :return: None
+        """
+        self._http.set_retry_policy(endpoint, policy)
+
     def on_request(self, endpoint: Endpoint, **kwargs) -> Callable:
         """
         The on_request function is a decorator that allows you to register a
@@ -139,10 +275,19 @@ class Client(RequestListenerManager):
             ) -> R:
                 # result: Any
                 response: Response
+                requests = self._http.stats.requests
                 result = await func(self, *args, **kwargs)
                 response = self._http.last_response
                 if kwargs.get("avoid_listener", False):
                     return result
+                # served without a request, e.g. from the application index,
+                # the last response is left by an earlier call
+                if self._http.stats.requests == requests:
+                    return result
+                # served from a cache, the last response is of another
+                # endpoint, e.g. the listing made to validate the cache
+                if response is None or response.route.endpoint != endpoint:
+                    return result
                 await self.notify(
                     endpoint=endpoint,
                     response=response,
@@ -344,16 +489,29 @@ class Client(RequestListenerManager):
         :raises TooManyRequestsError: Raised when the request status
                 code is 429
         """
-        return await self._http.delete_application(app_id)
+        response: Response = await self._http.delete_application(app_id)
+        if self._app_index is not None:
+            self._app_index.pop(app_id, None)
+        return response
 
     @validate
     @_notify_listener(Endpoint.commit())
-    async def commit(self, app_id: str, file: File, **_kwargs) -> Response:
+    async def commit(
+        self,
+        app_id: str,
+        file: File,
+        progress: ProgressCallback | None = None,
+        max_bandwidth: float | None = None,
+        **_kwargs,
+    ) -> Response:
         """
-        The commit method is used to commit an application.
+        The commit method is used to commit an application. The file is
+        streamed in chunks and never read whole into memory.
 
         :param app_id: Specify the application by id
         :param file: File: Specify the File object to be committed
+        :param progress: Called with a TransferProgress as the file is sent
+        :param max_bandwidth: Maximum upload rate in bytes per second
         :param _kwargs: Keyword arguments
         :return: A Response object
         :rtype: Response
@@ -365,14 +523,42 @@ class Client(RequestListenerManager):
         :raises TooManyRequestsError: Raised when the request status
                 code is 429
         """
-        return await self._http.commit(app_id, file)
+        return await self._http.commit(app_id, file, progress, max_bandwidth)
+
+    async def refresh_app_index(self) -> dict[str, AppData]:
+        """
+        The refresh_app_index method rebuilds the index of the applications
+        by id with a single user request.
+
+        :return: The AppData of each application by id
+        :rtype: dict[str, AppData]
+
+        :raises BadRequestError: Raised when the request status code is 400
+        :raises AuthenticationFailure: Raised when the request status
+                code is 401
+        :raises TooManyRequestsError: Raised when the request status
+                code is 429
+        """
+        response: Response = await self._http.fetch_user_info()
+        self._app_index = {
+            data["id"]: AppData(**data)
+            for data in response.response["applications"]
+        }
+        return self._app_index
 
     @validate
-    @_notify_listener(Endpoint.user())
+    @_notify_listener(Endpoint.app_data())
     async def app(self, app_id: str, **_kwargs) -> Application:
         """
         The app method returns an Application object.
 
+        With index_apps, the application is taken from the index, built on
+        the first call. Otherwise, or when the application is not indexed,
+        only the data of that application is requested.
+
+        The listeners of Endpoint.app_data(), not Endpoint.user() as before,
+        are only notified when APP_DATA is requested, not on index hits.
+
         :param app_id: Specify the application by id
         :param _kwargs: Keyword arguments
         :return: An Application object
@@ -386,19 +572,23 @@ class Client(RequestListenerManager):
         :raises TooManyRequestsError: Raised when the request status
                 code is 429
         """
-        response: Response = await self._http.fetch_user_info()
-        payload = response.response
-        app_data = list(
-            filter(
-                lambda application: application["id"] == app_id,
-                payload["applications"],
-            )
-        )
-        if not app_data:
+        if self.index_apps:
+            if self._app_index is None:
+                await self.refresh_app_index()
+            if (data := self._app_index.get(app_id)) is not None:
+                return Application(
+                    client=self, http=self._http, **data.to_dict()
+                )
+        try:
+            response: Response = await self._http.get_app_data(app_id)
+        except NotFoundError as exc:
+            raise ApplicationNotFound(app_id=app_id) from exc
+        if not response.response:
             raise ApplicationNotFound(app_id=app_id)
-        app_data = app_data.pop()
-        app_data = AppData(**app_data).to_dict()
-        return Application(client=self, http=self._http, **app_data)
+        data = _app_data(response.response)
+        if self._app_index is not None:
+            self._app_index[app_id] = data
+        return Application(client=self, http=self._http, **data.to_dict())
 
     # @_notify_listener(Endpoint.user())
     async def all_apps(self, **_kwargs) -> list[Application]:
@@ -416,22 +606,35 @@ class Client(RequestListenerManager):
         :raises TooManyRequestsError: Raised when the request status
                 code is 429
         """
-        response: Response = await self._http.fetch_user_info()
-        payload = response.response
-        apps_data: list = payload["applications"]
-        apps: list[Application] = []
-        for data in apps_data:
-            data = AppData(**data).to_dict()
-            apps.append(Application(client=self, http=self._http, **data))
-        return apps
+        if self.index_apps:
+            # a new request anyway, the index may miss recent applications
+            apps_data = (await self.refresh_app_index()).values()
+        else:
+            response: Response = await self._http.fetch_user_info()
+            apps_data = (
+                AppData(**data) for data in response.response["applications"]
+            )
+        return [
+            Application(client=self, http=self._http, **data.to_dict())
+            for data in apps_data
+        ]
 
     @validate
     @_notify_listener(Endpoint.upload())
-    async def upload_app(self, file: File, **_kwargs) -> UploadData:
+    async def upload_app(
+        self,
+        file: File,
+        progress: ProgressCallback | None = None,
+        max_bandwidth: float | None = None,
+        **_kwargs,
+    ) -> UploadData:
         """
-        The upload_app method uploads an application to the server.
+        The upload_app method uploads an application to the server. The file
+        is streamed in chunks and never read whole into memory.
 
         :param file: Upload a file
+        :param progress: Called with a TransferProgress as the file is sent
+        :param max_bandwidth: Maximum upload rate in bytes per second
         :param _kwargs: Keyword arguments
         :return: An UploadData object
         :rtype: UploadData
@@ -476,7 +679,9 @@ class Client(RequestListenerManager):
             file.filename.split(".")[-1] != "zip"
         ):
             raise InvalidFile("the file must be a .zip file")
-        response: Response = await self._http.upload(file)
+        response: Response = await self._http.upload(
+            file, progress, max_bandwidth
+        )
         payload: dict[str, Any] = response.response
         return UploadData(**payload)
 
@@ -507,21 +712,35 @@ class Client(RequestListenerManager):
         if not response.response:
             return []
         return [
-            FileInfo(**data, app_id=app_id, path=path + f"{data.get('name')}")
+            FileInfo(
+                **data,
+                app_id=app_id,
+                path=posixpath.join(path, data.get("name")),
+            )
             for data in response.response
         ]
 
     @validate
     @_notify_listener(Endpoint.files_read())
     async def read_app_file(
-        self, app_id: str, path: str, **_kwargs
+        self,
+        app_id: str,
+        path: str,
+        info: FileInfo | None = None,
+        **_kwargs,
     ) -> BytesIO | None:
         """
         The read_app_file method reads a file from the specified path and
         returns a BytesIO representation.
 
+        When the client has a file_cache, the file directory is listed to
+        check whether the cached content is still current, unless `info` is
+        given.
+
         :param app_id: Specify the application by id
         :param path: str: Specify the path of the file to be read
+        :param info: FileInfo: The current information of the file, e.g.
+         from app_files_list, spares the listing done to validate the cache
         :param _kwargs: Keyword arguments
         :return: A BytesIO representation of the file
         :rtype: BytesIO | None
@@ -533,9 +752,37 @@ class Client(RequestListenerManager):
         :raises TooManyRequestsError: Raised when the request status
                 code is 429
         """
+        cache = self.file_cache
+        if cache is not None and info is None:
+            info = await self._file_info(app_id, path)
+        if (
+            cache is not None
+            and info is not None
+            and (content := await cache.get(app_id, info)) is not None
+        ):
+            return BytesIO(content)
         response: Response = await self._http.read_app_file(app_id, path)
-        if response.response:
-            return BytesIO(bytes(response.response.get("data")))
+        if not response.response:
+            return None
+        data = response.response.get("data")
+        # the byte array is already decoded into bytes while it arrives
+        content = data if isinstance(data, bytes) else bytes(data)
+        if cache is not None and info is not None:
+            await cache.store(app_id, info, content)
+        return BytesIO(content)
+
+    async def _file_info(self, app_id: str, path: str) -> FileInfo | None:
+        """Lists the directory of a file and returns its entry"""
+        directory, name = posixpath.split("/" + path.strip("/"))
+        try:
+            response = await self._http.fetch_app_files_list(
+                app_id, directory
+            )
+        except NotFoundError:
+            return None
+        for data in response.response or ():
+            if data.get("name") == name:
+                return FileInfo(**data, app_id=app_id, path=path)
         return None
 
     @validate
@@ -565,9 +812,12 @@ class Client(RequestListenerManager):
             raise SquareException(
                 "the file must be an string or a squarecloud.File object"
             )
-        file_bytes = list(file.bytes.read())
+        if file.bytes is None:
+            raise SquareException(
+                "directory archives can only be uploaded or committed"
+            )
         response: Response = await self._http.create_app_file(
-            app_id, file_bytes, path=path
+            app_id, file.bytes.read(), path=path
         )
         file.bytes.close()
 
@@ -680,15 +930,18 @@ class Client(RequestListenerManager):
     @validate
     @_notify_listener(Endpoint.domain_analytics())
     async def domain_analytics(
-        self, app_id: str, **_kwargs
-    ) -> DomainAnalytics:
+        self, app_id: str, columnar: bool = False, **_kwargs
+    ) -> DomainAnalytics | ColumnarAnalytics:
         """
         The domain_analytics method return a DomainAnalytics object
 
         :param app_id: Specify the application by id
+        :param columnar: Return a ColumnarAnalytics instead, which converts
+         each breakdown to columns when it is accessed and aggregates them
+         without creating an object per row
         :param _kwargs: Keyword arguments
-        :return: A DomainAnalytics object
-        :rtype: DomainAnalytics
+        :return: A DomainAnalytics or a ColumnarAnalytics object
+        :rtype: DomainAnalytics | ColumnarAnalytics
 
         :raises NotFoundError: Raised when the request status code is 404
         :raises BadRequestError: Raised when the request status code is 400
@@ -700,6 +953,8 @@ class Client(RequestListenerManager):
         response: Response = await self._http.domain_analytics(
             app_id=app_id,
         )
+        if columnar:
+            return ColumnarAnalytics(response.response)
         return DomainAnalytics(**response.response)
 
     @validate
@@ -755,6 +1010,117 @@ class Client(RequestListenerManager):
                 all_status.append(ResumedStatus(**status))
         return all_status
 
+    def bulk(
+        self,
+        operation: Literal["start", "stop", "restart"] | BulkCallable,
+        app_ids: Iterable[str],
+        concurrency: int = 8,
+    ) -> BulkOperation:
+        """
+        The bulk method runs an operation on many applications concurrently.
+        A failure does not stop the other applications.
+
+        Iterate the returned BulkOperation with `async for` to receive the
+        BulkItem of each application as it completes, or await it to get
+        a BulkResult with the successes and the failures.
+
+        :param operation: "start", "stop", "restart" or an async callable
+         receiving an application id
+        :param app_ids: The application ids
+        :param concurrency: Maximum applications handled at the same time,
+         the requests are still paced by the client rate limit
+        :return: A BulkOperation object
+        :rtype: BulkOperation
+
+        :raises SquareException: Raised when the operation is unknown
+        """
+        if isinstance(operation, str):
+            operations: dict[str, BulkCallable] = {
+                "start": self.start_app,
+                "stop": self.stop_app,
+                "restart": self.restart_app,
+            }
+            if operation not in operations:
+                raise SquareException(
+                    f"invalid bulk operation {operation!r}, use one of "
+                    f"{list(operations)}"
+                )
+            operation = operations[operation]
+        return BulkOperation(operation, list(app_ids), concurrency)
+
+    def bulk_start(
+        self, app_ids: Iterable[str], concurrency: int = 8
+    ) -> BulkOperation:
+        """
+        The bulk_start method starts many applications concurrently, see
+        bulk.
+
+        :param app_ids: The application ids
+        :param concurrency: Maximum applications started at the same time
+        :return: A BulkOperation object
+        :rtype: BulkOperation
+        """
+        return self.bulk("start", app_ids, concurrency)
+
+    def bulk_stop(
+        self, app_ids: Iterable[str], concurrency: int = 8
+    ) -> BulkOperation:
+        """
+        The bulk_stop method stops many applications concurrently, see bulk.
+
+        :param app_ids: The application ids
+        :param concurrency: Maximum applications stopped at the same time
+        :return: A BulkOperation object
+        :rtype: BulkOperation
+        """
+        return self.bulk("stop", app_ids, concurrency)
+
+    def bulk_restart(
+        self, app_ids: Iterable[str], concurrency: int = 8
+    ) -> BulkOperation:
+        """
+        The bulk_restart method restarts many applications concurrently, see
+        bulk.
+
+        :param app_ids: The application ids
+        :param concurrency: Maximum applications restarted at the same time
+        :return: A BulkOperation object
+        :rtype: BulkOperation
+        """
+        return self.bulk("restart", app_ids, concurrency)
+
+    def monitor(
+        self,
+        interval: float = 10.0,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        ram_threshold: float | None = None,
+        cpu_threshold: float | None = None,
+    ) -> Monitor:
+        """
+        The monitor method returns a Monitor watching the status of all the
+        applications with one request per poll. Iterate it with `async for`
+        to receive the StatusEvent objects, or run `Monitor.run(queue)` in a
+        task to put them into an asyncio.Queue.
+
+        :param interval: Seconds between the first polls
+        :param min_interval: Minimum seconds between two polls
+        :param max_interval: Maximum seconds between two polls, reached
+         while nothing changes
+        :param ram_threshold: Megabytes of RAM whose crossing emits an event
+        :param cpu_threshold: CPU percentage whose crossing emits an event
+        :return: A Monitor object
+        :rtype: Monitor
+        """
+        return Monitor(
+            self,
+            interval=interval,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            ram_threshold=ram_threshold,
+            cpu_threshold=cpu_threshold,
+        )
+
     @validate
     @_notify_listener(Endpoint.move_file())
     async def move_app_file(
@@ -3,26 +3,58 @@ from __future__ import annotations
 import os
 import zipfile
 from datetime import datetime
-from typing import Any, Literal
+from typing import Any, Literal, Self
 
-from ._internal.constants import USING_PYDANTIC
+from ._internal import codec
+from ._internal.constants import MODEL_BACKEND
+from ._internal.models import decode
 from .http import HTTPClient
+from .http.transfer import DEFAULT_CHUNK_SIZE, ProgressCallback
 
-if USING_PYDANTIC:
+if MODEL_BACKEND == 'pydantic':
     from pydantic.dataclasses import dataclass
+
+    model = dataclass(frozen=True)
 else:
-    from dataclasses import dataclass
+    from ._internal.models import slots_dataclass as model
 
 
 class DataClasMeta(type):
     def __new__(cls, name: str, bases: tuple, dct: dict[str, Any]) -> type:
         new_class = super().__new__(cls, name, bases, dct)
-        return dataclass(frozen=True)(new_class)
+        if '__dataclass_fields__' in dct:
+            # the class recreated by dataclass to add its __slots__
+            return new_class
+        return model(new_class)
 
 
 class BaseDataClass(metaclass=DataClasMeta):
     def to_dict(self) -> dict[str, str | dict[str, Any]]:
-        return self.__dict__.copy()
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """
+        Builds the model from a response payload, ignoring the unknown keys
+
+        :param data: The payload
+        :return: The model
+        """
+        fields = cls.__dataclass_fields__
+        return cls(**{key: data[key] for key in data if key in fields})
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> Self:
+        """
+        Builds the model from a JSON object. With the slots backend and
+        msgspec installed, it is decoded straight into the model.
+
+        :param data: The JSON object
+        :return: The model
+        """
+        if MODEL_BACKEND == 'slots':
+            return decode(cls, data)
+        return cls(**codec.json_loads(data))
 
 
 class PlanData(BaseDataClass):
@@ -228,11 +260,39 @@ class Snapshot:
     def to_dict(self) -> dict[str, str]:
         return {'url': self.url, 'key': self.key}
 
-    async def download(self, path: str = './') -> zipfile.ZipFile:
+    async def download(
+        self,
+        path: str = './',
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = 4,
+        progress: ProgressCallback | None = None,
+        resume: bool = True,
+    ) -> zipfile.ZipFile:
+        """
+        Streams the snapshot to `path` without holding it in memory. Large
+        snapshots are downloaded in parallel byte ranges and an interrupted
+        download is resumed from the chunks already on disk.
+
+        :param path: The directory where the snapshot is saved
+        :param chunk_size: Size in bytes of each ranged request
+        :param concurrency: How many ranged requests run at the same time
+        :param progress: Called with a TransferProgress as the bytes arrive
+        :param resume: Whether to resume a previous partial download
+        :return: The downloaded zip file
+        :rtype: zipfile.ZipFile
+        """
         file_name = os.path.basename(self.url.split('?')[0])
-        content = await HTTPClient.fetch_snapshot_content(self.url)
-        with zipfile.ZipFile(f'{path}/{file_name}', 'w') as zip_file:
-            zip_file.writestr(f'{path}/{file_name}', content)
+        dest = os.path.join(path, file_name)
+        await HTTPClient.download_snapshot(
+            self.url,
+            dest,
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+            progress=progress,
+            resume=resume,
+        )
+        with zipfile.ZipFile(dest) as zip_file:
             return zip_file
 
 
@@ -236,3 +236,11 @@ class InvalidListener(SquareException):
     def __init__(self, listener: Callable, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.listener = listener
+
+
+class ClientClosed(SquareException):
+    """raised when a request is made while the client is closing"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.message = 'The client is closing, retry once it is closed'
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import io
 import os
-from typing import Any
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
 
 from squarecloud import errors
 
+from ._internal.archive import DirectoryArchive
+
+if TYPE_CHECKING:
+    from .utils import ConfigFile
+
 
 class File:
     """
@@ -13,9 +19,11 @@ class File:
 
     You can use a file already opened or pass the file path.
     NOTE: To pass binary data, consider usage of `io.BytesIO`.
+    To deploy a source tree without zipping it first, see
+    `File.from_directory`.
     """
 
-    __slots__ = ('bytes', 'filename')
+    __slots__ = ('archive', 'bytes', 'filename', 'path')
 
     def __init__(
         self,
@@ -40,13 +48,16 @@ class File:
                 raise ValueError(
                     f'File buffer {fp!r} must be seekable and readable'
                 )
-            self.bytes: io.BufferedIOBase = fp
+            self.bytes: io.BufferedIOBase | None = fp
+            self.path: str | None = None
         else:
             # Verificar se fp é bytes (dados binários) e criar um io.BytesIO
             if isinstance(fp, bytes):
                 self.bytes = io.BytesIO(fp)
+                self.path = None
             else:
                 self.bytes = open(fp, 'rb')
+                self.path = os.fspath(fp)
 
         if filename is None:
             if isinstance(fp, str):
@@ -58,3 +69,37 @@ class File:
             raise errors.SquareException('You need provide a filename')
 
         self.filename: str | None = filename
+        self.archive: DirectoryArchive | None = None
+
+    @classmethod
+    def from_directory(
+        cls,
+        path: str | os.PathLike[str],
+        config: ConfigFile,
+        ignore: Iterable[str] = (),
+        filename: str | None = None,
+    ) -> File:
+        """
+        Creates a File whose zip archive is built from a source tree while
+        it is uploaded, without temporary files. The config file is added as
+        `squarecloud.app`, replacing the one in the tree if any, and the
+        paths matched by the `.gitignore` files of the tree, the `ignore`
+        patterns or under `.git/` are left out.
+
+        :param path: The source tree root
+        :param config: The configuration file of the application
+        :param ignore: Extra gitignore-style patterns to leave out
+        :param filename: The archive name, defaults to the directory name
+        :return: A File object
+        :rtype: File
+        """
+        archive = DirectoryArchive(path, config, ignore)
+        if filename is None:
+            name = os.path.basename(os.path.abspath(archive.path))
+            filename = f'{name}.zip'
+        file = cls.__new__(cls)
+        file.bytes = None
+        file.path = None
+        file.filename = filename
+        file.archive = archive
+        return file
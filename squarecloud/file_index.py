@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import heapq
+import math
+import posixpath
+import re
+from array import array
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+from ._internal.crawl import crawl
+from ._internal.ignore import translate
+from .data import FileInfo
+
+if TYPE_CHECKING:
+    from .app import Application
+
+FILE, DIRECTORY = 0, 1
+_GLOB_CHARS = re.compile(r'[*?\[\\]')
+
+
+class _Directory:
+    """
+    The entries of one directory, stored column by column with the names
+    as ids of interned path segments.
+    """
+
+    __slots__ = ('children', 'kinds', 'modified', 'names', 'sizes')
+
+    def __init__(self) -> None:
+        self.names: array[int] = array('I')
+        self.kinds: bytearray = bytearray()
+        self.sizes: array[int] = array('q')
+        # NaN when the API does not inform the modification time
+        self.modified: array[float] = array('d')
+        self.children: dict[int, _Directory] = {}
+
+
+def _normalize(path: str) -> str:
+    return '/' + path.strip('/')
+
+
+class RemoteFileIndex:
+    """
+    Local index of the files of an application built from the FILES_LIST
+    responses. The entries are kept in compact arrays with interned path
+    segments instead of one FileInfo per entry, and the queries are
+    answered without requests.
+    """
+
+    def __init__(self, app: Application, path: str = '/') -> None:
+        """
+        :param app: The indexed application
+        :param path: The indexed directory
+        :return: None
+        """
+        self.app = app
+        self.path: str = _normalize(path)
+        self._segments: list[str] = []
+        self._segment_ids: dict[str, int] = {}
+        self._root: _Directory = _Directory()
+        self._files: int = 0
+
+    @classmethod
+    async def build(
+        cls, app: Application, path: str = '/', max_concurrency: int = 8
+    ) -> RemoteFileIndex:
+        """
+        Crawls the application files and returns their index
+
+        :param app: The indexed application
+        :param path: The indexed directory
+        :param max_concurrency: Maximum concurrent listings
+        :return: A RemoteFileIndex object
+        :rtype: RemoteFileIndex
+        """
+        index = cls(app, path)
+        await index.refresh(max_concurrency=max_concurrency, full=True)
+        return index
+
+    def __len__(self) -> int:
+        return self._files
+
+    def __contains__(self, path: str) -> bool:
+        return self._locate(path) is not None
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}(app_id={self.app.id!r}, '
+            f'path={self.path!r}, files={self._files})'
+        )
+
+    def _intern(self, name: str) -> int:
+        if (segment := self._segment_ids.get(name)) is None:
+            segment = self._segment_ids[name] = len(self._segments)
+            self._segments.append(name)
+        return segment
+
+    def _parts(self, path: str) -> list[str] | None:
+        path = _normalize(path)
+        if path == self.path:
+            return []
+        prefix = self.path.rstrip('/') + '/'
+        if not path.startswith(prefix):
+            return None
+        return path[len(prefix) :].split('/')
+
+    def _directory(
+        self, path: str, root: _Directory | None = None
+    ) -> _Directory | None:
+        if (parts := self._parts(path)) is None:
+            return None
+        directory = self._root if root is None else root
+        for part in parts:
+            segment = self._segment_ids.get(part)
+            if (directory := directory.children.get(segment)) is None:
+                return None
+        return directory
+
+    def _locate(self, path: str) -> tuple[_Directory, int] | None:
+        """Returns the directory holding an entry and the entry position"""
+        path = _normalize(path)
+        parent = self._directory(posixpath.dirname(path))
+        segment = self._segment_ids.get(posixpath.basename(path))
+        if parent is None or segment is None:
+            return None
+        try:
+            return parent, parent.names.index(segment)
+        except ValueError:
+            return None
+
+    def _walk(
+        self, directory: _Directory, path: str
+    ) -> Iterator[tuple[str, _Directory, int]]:
+        stack = [(directory, path)]
+        while stack:
+            directory, path = stack.pop()
+            for position, segment in enumerate(directory.names):
+                name = posixpath.join(path, self._segments[segment])
+                if directory.kinds[position] == FILE:
+                    yield name, directory, position
+                elif (child := directory.children.get(segment)) is not None:
+                    stack.append((child, name))
+
+    def _info(
+        self, path: str, directory: _Directory, position: int
+    ) -> FileInfo:
+        modified = directory.modified[position]
+        return FileInfo(
+            app_id=self.app.id,
+            type='file' if directory.kinds[position] == FILE else 'directory',
+            name=posixpath.basename(path),
+            path=path,
+            size=directory.sizes[position],
+            lastModified=None if math.isnan(modified) else modified,
+        )
+
+    def _listing(
+        self, entries: list[dict[str, Any]], previous: _Directory | None
+    ) -> _Directory:
+        directory = _Directory()
+        for entry in entries:
+            segment = self._intern(entry['name'])
+            kind = DIRECTORY if entry.get('type') == 'directory' else FILE
+            modified = entry.get('lastModified')
+            directory.names.append(segment)
+            directory.kinds.append(kind)
+            directory.sizes.append(int(entry.get('size') or 0))
+            directory.modified.append(
+                math.nan if modified is None else float(modified)
+            )
+            if kind == DIRECTORY:
+                # kept until the subdirectory is listed again, if ever
+                kept = previous.children.get(segment) if previous else None
+                directory.children[segment] = kept or _Directory()
+        return directory
+
+    def _unchanged(self, root: _Directory, path: str, entry: dict) -> bool:
+        """Whether a subdirectory has the modification time it was indexed
+        with, in which case its entries are kept without listing it"""
+        if (modified := entry.get('lastModified')) is None:
+            return False
+        parent = self._directory(posixpath.dirname(path), root)
+        segment = self._segment_ids.get(entry['name'])
+        if parent is None or segment not in parent.children:
+            return False
+        position = parent.names.index(segment)
+        return parent.modified[position] == float(modified)
+
+    async def refresh(
+        self,
+        paths: list[str] | None = None,
+        max_concurrency: int = 8,
+        full: bool = False,
+    ) -> None:
+        """
+        Updates the index. Only the subdirectories whose modification time
+        changed are listed again, plus the ones under `paths` (use it for
+        directories changed in place, whose modification time may not
+        change) or all of them when `full` is True.
+
+        :param paths: Directories to list again with their subdirectories
+        :param max_concurrency: Maximum concurrent listings
+        :param full: Whether to list the whole tree again
+        :return: None
+        """
+        forced = [_normalize(path).rstrip('/') + '/' for path in paths or ()]
+        previous = self._root
+
+        def descend(path: str, entry: dict[str, Any]) -> bool:
+            if full:
+                return True
+            path += '/'
+            if any(path.startswith(p) or p.startswith(path) for p in forced):
+                return True
+            return not self._unchanged(previous, path[:-1], entry)
+
+        # the new tree replaces the current one once complete, the queries
+        # made during a refresh use the current one
+        root = _Directory()
+        async for directory, entries in crawl(
+            self.app._list_directory, self.path, max_concurrency, descend
+        ):
+            listing = self._listing(
+                entries, self._directory(directory, previous)
+            )
+            if not (parts := self._parts(directory)):
+                root = listing
+                continue
+            parent = self._directory(posixpath.dirname(directory), root)
+            parent.children[self._segment_ids[parts[-1]]] = listing
+        self._root = root
+        self._files = self._count(root)
+
+    @staticmethod
+    def _count(directory: _Directory) -> int:
+        count = 0
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            count += directory.kinds.count(FILE)
+            stack.extend(directory.children.values())
+        return count
+
+    def get(self, path: str) -> FileInfo | None:
+        """
+        Returns the information of an entry
+
+        :param path: The entry path
+        :return: A FileInfo object or None if it is not indexed
+        :rtype: FileInfo | None
+        """
+        if (located := self._locate(path)) is None:
+            return None
+        return self._info(_normalize(path), *located)
+
+    def files(self, path: str | None = None) -> Iterator[FileInfo]:
+        """
+        Iterates the files under a directory, creating their FileInfo on
+        demand
+
+        :param path: The directory, the indexed one by default
+        :return: An iterator of FileInfo objects
+        :rtype: Iterator[FileInfo]
+        """
+        path = self.path if path is None else path
+        if (directory := self._directory(path)) is None:
+            return
+        for name, parent, position in self._walk(directory, _normalize(path)):
+            yield self._info(name, parent, position)
+
+    def prefix(self, prefix: str) -> list[str]:
+        """
+        Returns the paths of the files starting with a prefix
+
+        :param prefix: The path prefix, e.g. `/src/api` or `/src/`
+        :return: The file paths
+        :rtype: list[str]
+        """
+        prefix = '/' + prefix.lstrip('/')
+        base = prefix if prefix.endswith('/') else posixpath.dirname(prefix)
+        base = _normalize(base)
+        if (directory := self._directory(base)) is None:
+            return []
+        return sorted(
+            name
+            for name, _, _ in self._walk(directory, base)
+            if name.startswith(prefix)
+        )
+
+    def glob(self, pattern: str) -> list[str]:
+        """
+        Returns the paths of the files matching a glob pattern relative to
+        the indexed directory. `*` does not cross directories, `**` does.
+
+        :param pattern: The pattern, e.g. `src/**/*.py` or `**/*.js`
+        :return: The file paths
+        :rtype: list[str]
+        """
+        parts = pattern.strip('/').split('/')
+        literal: list[str] = []
+        for part in parts[:-1]:
+            if _GLOB_CHARS.search(part):
+                break
+            literal.append(part)
+        base = posixpath.join(self.path, *literal)
+        if (directory := self._directory(base)) is None:
+            return []
+        regex = re.compile(translate(pattern.strip('/')))
+        skip = len(self.path.rstrip('/')) + 1
+        return sorted(
+            name
+            for name, _, _ in self._walk(directory, base)
+            if regex.fullmatch(name[skip:])
+        )
+
+    def largest(
+        self, n: int = 10, path: str | None = None
+    ) -> list[tuple[str, int]]:
+        """
+        Returns the largest files under a directory
+
+        :param n: How many files are returned
+        :param path: The directory, the indexed one by default
+        :return: (path, size) pairs from the largest file
+        :rtype: list[tuple[str, int]]
+        """
+        path = self.path if path is None else path
+        if (directory := self._directory(path)) is None:
+            return []
+        return heapq.nlargest(
+            n,
+            (
+                (name, parent.sizes[position])
+                for name, parent, position in self._walk(
+                    directory, _normalize(path)
+                )
+            ),
+            key=lambda item: item[1],
+        )
+
+    def total_size(self, path: str | None = None) -> int:
+        """
+        Returns the total size of the files under a directory
+
+        :param path: The directory, the indexed one by default
+        :return: The size in bytes
+        :rtype: int
+        """
+        path = self.path if path is None else path
+        if (directory := self._directory(path)) is None:
+            return 0
+        total = 0
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            total += sum(
+                size
+                for size, kind in zip(directory.sizes, directory.kinds)
+                if kind == FILE
+            )
+            stack.extend(directory.children.values())
+        return total
@@ -1,4 +1,19 @@
+from .cache import FileContentCache, ResponseCache
 from .endpoints import Endpoint
-from .http_client import HTTPClient, Response
+from .http_client import ConnectionConfig, HTTPClient, HTTPStats, Response
+from .ratelimit import RateLimit
+from .retry import RetryPolicy
+from .transfer import TransferProgress
 
-__all__ = ['HTTPClient', 'Response', 'Endpoint']
+__all__ = [
+    'HTTPClient',
+    'Response',
+    'Endpoint',
+    'ConnectionConfig',
+    'HTTPStats',
+    'RateLimit',
+    'RetryPolicy',
+    'ResponseCache',
+    'FileContentCache',
+    'TransferProgress',
+]
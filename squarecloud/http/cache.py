@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import posixpath
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..data import FileInfo
+    from .endpoints import Router
+    from .http_client import Response
+
+APP_STATE = ('APP_STATUS', 'APP_DATA', 'ALL_APPS_STATUS')
+APP_FILES = ('FILES_LIST', 'FILES_READ')
+
+# read endpoints whose cached responses are affected by each mutation
+INVALIDATIONS: dict[str, tuple[str, ...]] = {
+    'START': APP_STATE,
+    'STOP': APP_STATE,
+    'RESTART': APP_STATE,
+    'COMMIT': (*APP_STATE, *APP_FILES, 'LAST_DEPLOYS'),
+    'DELETE_APP': ('USER', *APP_STATE, *APP_FILES),
+    'UPLOAD_APP': ('USER', 'ALL_APPS_STATUS'),
+    'SNAPSHOT': ('ALL_SNAPSHOTS',),
+    'FILES_CREATE': APP_FILES,
+    'FILES_DELETE': APP_FILES,
+    'MOVE_FILE': APP_FILES,
+    'CUSTOM_DOMAIN': ('USER', 'APP_DATA', 'DNSRECORDS'),
+    'GITHUB_INTEGRATION': ('CURRENT_INTEGRATION',),
+    'ENVS_PUT': ('ENVS_GET',),
+    'ENVS_POST': ('ENVS_GET',),
+    'ENVS_DELETE': ('ENVS_GET',),
+}
+
+# the mutations that only affect the files of the paths in their body
+PATH_SCOPED = frozenset({'FILES_CREATE', 'FILES_DELETE', 'MOVE_FILE'})
+
+DEFAULT_TTLS: dict[str, float] = {
+    'USER': 5.0,
+    'APP_DATA': 5.0,
+    'APP_STATUS': 5.0,
+    'ALL_APPS_STATUS': 5.0,
+    'FILES_LIST': 10.0,
+    'DNSRECORDS': 60.0,
+    'ENVS_GET': 30.0,
+}
+
+
+def _normalize(path: str) -> str:
+    return '/' + path.strip('/')
+
+
+@dataclass
+class CacheEntry:
+    expires_at: float
+    status_code: int
+    response: Response
+    endpoint: str
+    app_id: str | None
+    path: str | None
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of the API responses.
+
+    Each endpoint has its own TTL (endpoints without a TTL are not cached),
+    404 responses are cached for `negative_ttl` seconds and the mutations
+    invalidate the cached reads of the application they change. A response
+    requested before an invalidation is not stored, so a read in flight
+    during a mutation never caches the previous state.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        max_entries: int = 1024,
+        negative_ttl: float = 5.0,
+    ) -> None:
+        """
+        :param ttls: Seconds each endpoint (by name) stays cached, defaults
+        to DEFAULT_TTLS
+        :param max_entries: Maximum cached responses, the least recently
+        used ones are evicted
+        :param negative_ttl: Seconds a 404 response stays cached
+        :return: None
+        """
+        self.ttls: dict[str, float] = dict(
+            DEFAULT_TTLS if ttls is None else ttls
+        )
+        self.max_entries: int = max_entries
+        self.negative_ttl: float = negative_ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        # incremented by each invalidation, see store
+        self.generation: int = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cacheable(self, route: Router) -> bool:
+        """
+        Returns whether the responses of a route are cached
+
+        :param route: The route
+        :return: True if the route endpoint has a TTL
+        :rtype: bool
+        """
+        return route.endpoint.name in self.ttls
+
+    def get(self, route: Router) -> CacheEntry | None:
+        """
+        Returns the cached response of a route if it has not expired
+
+        :param route: The route
+        :return: The CacheEntry or None
+        :rtype: CacheEntry | None
+        """
+        entry = self._entries.get(route.url)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                del self._entries[route.url]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(route.url)
+        self.hits += 1
+        return entry
+
+    def store(
+        self,
+        route: Router,
+        status_code: int,
+        response: Response,
+        generation: int | None = None,
+    ) -> None:
+        """
+        Caches a successful or a 404 response of a cacheable route
+
+        :param route: The route
+        :param status_code: The response status code
+        :param response: The Response object
+        :param generation: The generation read when the request was sent,
+        the response is dropped if an invalidation happened since
+        :return: None
+        """
+        if not self.cacheable(route):
+            return
+        if generation is not None and generation != self.generation:
+            return
+        if status_code == 404:
+            ttl = self.negative_ttl
+        elif status_code == 200:
+            ttl = self.ttls[route.endpoint.name]
+        else:
+            return
+        path = route.params.get('path')
+        self._entries[route.url] = CacheEntry(
+            expires_at=time.monotonic() + ttl,
+            status_code=status_code,
+            response=response,
+            endpoint=route.endpoint.name,
+            app_id=route.params.get('app_id'),
+            path=_normalize(path) if path is not None else None,
+        )
+        self._entries.move_to_end(route.url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(
+        self,
+        endpoints: tuple[str, ...],
+        app_id: str | None = None,
+        paths: list[str] | None = None,
+    ) -> None:
+        """
+        Removes the cached responses of the given endpoints
+
+        :param endpoints: The endpoint names
+        :param app_id: Only remove the responses of this application
+        :param paths: Only remove the file listings of the parent directories
+        and the contents of these paths
+        :return: None
+        """
+        self.generation += 1
+        targets: set[str] | None = None
+        if paths is not None:
+            targets = set()
+            for path in map(_normalize, paths):
+                targets.update((path, posixpath.dirname(path)))
+        for key, entry in list(self._entries.items()):
+            if entry.endpoint not in endpoints:
+                continue
+            if app_id is not None and entry.app_id not in (None, app_id):
+                continue
+            if targets is not None and entry.path not in targets:
+                continue
+            del self._entries[key]
+
+    def invalidate_route(
+        self, route: Router, body: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Removes the cached reads affected by a mutation request
+
+        :param route: The mutation route
+        :param body: The JSON body of the request
+        :return: None
+        """
+        if not (endpoints := INVALIDATIONS.get(route.endpoint.name)):
+            return
+        paths: list[str] | None = None
+        if route.endpoint.name in PATH_SCOPED and body:
+            paths = [
+                body[key] for key in ('path', 'to') if isinstance(
+                    body.get(key), str
+                )
+            ]
+        self.invalidate(endpoints, route.params.get('app_id'), paths)
+
+    def clear(self) -> None:
+        """
+        Removes all the cached responses
+
+        :return: None
+        """
+        self.generation += 1
+        self._entries.clear()
+
+
+@dataclass
+class _CachedFile:
+    size: int
+    modified: float
+    content: bytes
+
+
+class FileContentCache:
+    """
+    LRU cache of the application file contents, in memory and optionally on
+    disk.
+
+    A content is stored under the size and modification time reported by
+    the file listing, so a read is validated with a listing of its
+    directory and a changed file is never served from the cache. Files
+    without a modification time are not cached.
+    """
+
+    SUFFIX = '.bin'
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 2**20,
+        directory: str | os.PathLike[str] | None = None,
+        max_disk_bytes: int = 1024 * 2**20,
+    ) -> None:
+        """
+        :param max_bytes: Maximum bytes kept in memory, the least recently
+        used contents are evicted
+        :param directory: Where the contents are also written, they are
+        kept between runs. None disables the disk tier
+        :param max_disk_bytes: Maximum bytes kept in `directory`
+        :return: None
+        """
+        self.max_bytes: int = max_bytes
+        self.max_disk_bytes: int = max_disk_bytes
+        self.directory: Path | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self._memory: OrderedDict[tuple[str, str], _CachedFile] = (
+            OrderedDict()
+        )
+        self._memory_bytes: int = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes: int = 0
+        # last use time given to a disk entry, strictly increasing
+        self._clock: int = 0
+        if directory is not None:
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load_disk()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        Returns the bytes kept in memory
+
+        :return: The size in bytes
+        :rtype: int
+        """
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        """
+        Returns the bytes kept on disk
+
+        :return: The size in bytes
+        :rtype: int
+        """
+        return self._disk_bytes
+
+    @staticmethod
+    def _version(info: FileInfo) -> tuple[int, float] | None:
+        if info.type != 'file' or info.lastModified is None:
+            return None
+        return info.size, float(info.lastModified)
+
+    @staticmethod
+    def _digest(app_id: str, path: str, size: int, modified: float) -> str:
+        key = f'{app_id}\0{_normalize(path)}\0{size}\0{modified!r}'
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _load_disk(self) -> None:
+        # the files are touched when read, so their mtimes give the order
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, entry.name, stat.st_size))
+        for self._clock, name, size in sorted(entries):
+            self._disk[name[: -len(self.SUFFIX)]] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _disk_path(self, digest: str) -> Path:
+        return self.directory / f'{digest}{self.SUFFIX}'
+
+    def _read_disk(self, digest: str) -> bytes | None:
+        path = self._disk_path(digest)
+        try:
+            content = path.read_bytes()
+            self._touch(path)
+        except FileNotFoundError:
+            return None
+        return content
+
+    def _write_disk(self, digest: str, content: bytes) -> None:
+        path = self._disk_path(digest)
+        partial = path.with_suffix('.part')
+        partial.write_bytes(content)
+        os.replace(partial, path)
+        self._touch(path)
+
+    def _touch(self, path: Path) -> None:
+        # the filesystem clock may be too coarse to order the uses
+        self._clock = max(time.time_ns(), self._clock + 1)
+        os.utime(path, ns=(self._clock, self._clock))
+
+    def _remember(self, key: tuple[str, str], entry: _CachedFile) -> None:
+        if (previous := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(previous.content)
+        if len(entry.content) > self.max_bytes:
+            return
+        self._memory[key] = entry
+        self._memory_bytes += len(entry.content)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.content)
+
+    def _evict_disk(self) -> list[str]:
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes:
+            digest, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(digest)
+        return evicted
+
+    def _unlink(self, digests: list[str]) -> None:
+        for digest in digests:
+            self._disk_path(digest).unlink(missing_ok=True)
+
+    async def get(self, app_id: str, info: FileInfo) -> bytes | None:
+        """
+        Returns the cached content of a file if it did not change since it
+        was cached
+
+        :param app_id: The application id
+        :param info: The current information of the file, from a listing
+        :return: The content or None
+        :rtype: bytes | None
+        """
+        if (version := self._version(info)) is None:
+            self.misses += 1
+            return None
+        key = (app_id, _normalize(info.path))
+        entry = self._memory.get(key)
+        if entry is not None and (entry.size, entry.modified) == version:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry.content
+        digest = self._digest(app_id, info.path, *version)
+        if self.directory is not None and digest in self._disk:
+            content = await asyncio.to_thread(self._read_disk, digest)
+            if content is not None:
+                self._disk.move_to_end(digest)
+                self._remember(key, _CachedFile(*version, content))
+                self.hits += 1
+                return content
+            self._disk_bytes -= self._disk.pop(digest)
+        self.misses += 1
+        return None
+
+    async def store(self, app_id: str, info: FileInfo, content: bytes) -> None:
+        """
+        Caches the content of a file under its size and modification time
+
+        :param app_id: The application id
+        :param info: The information of the file when it was read
+        :param content: The file content
+        :return: None
+        """
+        if (version := self._version(info)) is None:
+            return
+        self._remember(
+            (app_id, _normalize(info.path)), _CachedFile(*version, content)
+        )
+        if self.directory is None or len(content) > self.max_disk_bytes:
+            return
+        digest = self._digest(app_id, info.path, *version)
+        if digest in self._disk:
+            self._disk.move_to_end(digest)
+            return
+        await asyncio.to_thread(self._write_disk, digest, content)
+        self._disk[digest] = len(content)
+        self._disk_bytes += len(content)
+        if evicted := self._evict_disk():
+            await asyncio.to_thread(self._unlink, evicted)
+
+    def invalidate(self, app_id: str, path: str | None = None) -> None:
+        """
+        Removes the contents of an application kept in memory. The changed
+        files are never served anyway, this only frees their memory.
+
+        :param app_id: The application id
+        :param path: Only remove the content of this path
+        :return: None
+        """
+        for key in list(self._memory):
+            if key[0] != app_id:
+                continue
+            if path is not None and key[1] != _normalize(path):
+                continue
+            self._memory_bytes -= len(self._memory.pop(key).content)
+
+    def clear(self) -> None:
+        """
+        Removes all the cached contents, in memory and on disk
+
+        :return: None
+        """
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.directory is not None:
+            self._unlink(list(self._disk))
+        self._disk.clear()
+        self._disk_bytes = 0
@@ -334,12 +334,14 @@ class Router:
 
         :param self: Represent the instance of the class
         :param endpoint: Endpoint: Define the endpoint
-        :param **params: Pass in the parameters for the url
+        :param **params: Pass in the parameters for the url, kept in the
+        params attribute
         :return: None
         """
         self.endpoint: Endpoint = endpoint
         self.method: str = endpoint.method
         self.path: str = endpoint.path
+        self.params: dict[str, str | int] = params
         url: str = self.BASE_V2 + self.path.format(**params)
         if params:
             url.format(params)
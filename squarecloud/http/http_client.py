@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Literal
 
 import aiohttp
+from typing_extensions import deprecated
 
 from squarecloud.file import File
 
+from .._internal import codec
+from .._internal.codec import JSONDumps, JSONLoads
 from ..errors import (
     AuthenticationFailure,
     BadMemory,
     BadRequestError,
+    ClientClosed,
     FewMemory,
     InvalidAccessToken,
     InvalidDisplayName,
@@ -31,7 +41,19 @@ from ..errors import (
     TooManyRequests,
 )
 from ..logger import logger
+from . import transfer
+from .cache import ResponseCache
 from .endpoints import Endpoint, Router
+from .ratelimit import RateLimit
+from .retry import (
+    DEFAULT_RETRY_POLICY,
+    IDEMPOTENT_METHODS,
+    RETRYABLE_EXCEPTIONS,
+    RetryPolicy,
+)
+
+# the endpoints whose response holds a file as an array of byte values
+BYTE_ARRAY_ENDPOINTS = frozenset({'FILES_READ'})
 
 
 class Response:
@@ -56,6 +78,7 @@ class Response:
         self.code: int | None = data.get('code')
         self.message: str | None = data.get('message')
         self.response: dict[str, Any] | list[Any] = data.get('response', {})
+        self.retries: int = 0
 
     def __repr__(self) -> str:
         """
@@ -100,11 +123,58 @@ def _get_error(code: str) -> type[RequestError] | None:
     return errors.get(code, None)
 
 
+@dataclass
+class HTTPStats:
+    """
+    Counters of the requests made by an HTTPClient
+
+    :ivar requests: Requests made through HTTPClient.request
+    :ivar sent: Round trips sent to the API, including retries
+    :ivar coalesced: Requests that shared the response of an identical
+    in-flight request instead of being sent
+    """
+
+    requests: int = 0
+    sent: int = 0
+    coalesced: int = 0
+
+
+@dataclass(frozen=True)
+class ConnectionConfig:
+    """
+    Connection pool settings used by the HTTPClient session
+
+    :ivar pool_size: Maximum number of simultaneous connections
+    (0 means unlimited)
+    :ivar limit_per_host: Maximum number of simultaneous connections to the
+    same host (0 means unlimited)
+    :ivar keepalive_timeout: Seconds an idle connection is kept open
+    :ivar dns_cache_ttl: Seconds a resolved DNS entry is cached
+    (None caches forever)
+    :ivar timeout: Total timeout in seconds of a single request
+    (None disables it)
+    """
+
+    pool_size: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int | None = 300
+    timeout: float | None = 300.0
+
 
 class HTTPClient:
     """A client that handles requests and responses"""
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        connection: ConnectionConfig | None = None,
+        rate_limit: RateLimit | None = None,
+        retry_policies: dict[str, RetryPolicy | None] | None = None,
+        cache: ResponseCache | None = None,
+        json_loads: JSONLoads | None = None,
+        json_dumps: JSONDumps | None = None,
+    ) -> None:
         """
         The __init__ function is called when the class is instantiated.
         It sets up the class with all of its attributes and other things it
@@ -113,15 +183,144 @@ class HTTPClient:
         :param self: Represent the instance of the class
         :param api_key: str: Store the api key that is passed in when the
         class is instantiated
+        :param connection: ConnectionConfig: The connection pool settings
+        :param rate_limit: RateLimit: The token bucket used to pace the
+        requests
+        :param retry_policies: dict[str, RetryPolicy | None]: Retry policies
+        by endpoint name, overriding the defaults
+        :param cache: ResponseCache: An optional cache of the responses
+        :param json_loads: Decodes the response bodies (bytes), defaults to
+        orjson or msgspec when installed
+        :param json_dumps: Encodes the request bodies into bytes or str,
+        defaults to orjson or msgspec when installed
         :return: None
         """
         self.api_key = api_key
-        self.__session = aiohttp.ClientSession
+        self.connection: ConnectionConfig = connection or ConnectionConfig()
+        self.rate_limit: RateLimit = rate_limit or RateLimit()
+        self.retry_policies: dict[str, RetryPolicy | None] = dict(
+            retry_policies or {}
+        )
+        self.cache: ResponseCache | None = cache
+        self.json_loads: JSONLoads = json_loads or codec.json_loads
+        self.json_dumps: JSONDumps = json_dumps or codec.json_dumps
+        self.__session: aiohttp.ClientSession | None = None
+        # the loop the session was opened on, each asyncio.run has its own
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # set while close drains, the requests made meanwhile are refused
+        self._closing: bool = False
         self._last_response: Response | None = None
+        self._in_flight: int = 0
+        self._idle: asyncio.Event = asyncio.Event()
+        self._idle.set()
+        self._pending: dict[tuple[str, str], asyncio.Task[Response]] = {}
+        self.stats: HTTPStats = HTTPStats()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Returns whether the underlying session is closed (or was never
+        opened)
+
+        :return: True if there is no open session
+        :rtype: bool
+        """
+        return self.__session is None or self.__session.closed
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Returns the number of requests currently being made
+
+        :return: The amount of in-flight requests
+        :rtype: int
+        """
+        return self._in_flight
+
+    def _detach_session(self) -> None:
+        """
+        Drops a session opened on another event loop. Its loop may be
+        closed already, so the connections are left to it instead of being
+        closed from here.
+
+        :return: None
+        """
+        session, self.__session = self.__session, None
+        if session is not None and not session.closed:
+            session.detach()
+        self._idle = asyncio.Event()
+        if not self._in_flight:
+            self._idle.set()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the long-lived session, opening it (and its connection pool)
+        the first time it is needed, and again when the client is used from
+        another event loop, e.g. a new asyncio.run.
+
+        :return: An aiohttp.ClientSession
+        :rtype: aiohttp.ClientSession
+
+        :raises ClientClosed: Raised when the client is closing
+        """
+        loop = asyncio.get_running_loop()
+        if self.__session is not None and self._loop is not loop:
+            self._detach_session()
+        if self.__session is None or self.__session.closed:
+            if self._closing:
+                raise ClientClosed()
+            self._loop = loop
+            config = self.connection
+            connector = aiohttp.TCPConnector(
+                limit=config.pool_size,
+                limit_per_host=config.limit_per_host,
+                keepalive_timeout=config.keepalive_timeout,
+                ttl_dns_cache=config.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Authorization': self.api_key,
+                    'User-Agent': 'squarecloud-sdk-py/3.8.1',
+                },
+                timeout=aiohttp.ClientTimeout(total=config.timeout),
+            )
+        return self.__session
+
+    async def close(self, timeout: float | None = None) -> None:
+        """
+        Waits for the in-flight requests to finish and closes the session.
+        The requests made while closing raise ClientClosed, the in-flight
+        ones keep the session until they finish. A request made once the
+        client is closed opens a new session.
+
+        :param timeout: Maximum seconds to wait for the in-flight requests,
+        None waits indefinitely
+        :return: None
+        :raises asyncio.TimeoutError: Raised when the in-flight requests do
+                not finish before the timeout
+        """
+        if self.__session is None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            self._detach_session()
+            return
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            session, self.__session = self.__session, None
+            if not session.closed:
+                await session.close()
+        finally:
+            self._closing = False
 
     async def request(self, route: Router, **kwargs: Any) -> Response:
         """
         Sends a request to the Square API and returns the response.
+        Identical idempotent requests made while one is in flight share its
+        response instead of being sent again, and the responses of the
+        cached endpoints are served from the cache until they expire.
 
         :param route: the route to send a request
         :param kwargs: Keyword arguments
@@ -133,7 +332,7 @@ class HTTPClient:
         :raises AuthenticationFailure: Raised when the request status
                 code is 401
         :raises TooManyRequestsError: Raised when the request status
-                code is 429
+                code is 429 more times than the rate limit allows to retry
         :raises FewMemory: Raised when user memory reached the maximum
                 amount of memory
         :raises BadMemory: Raised when the memory in configuration file is
@@ -160,81 +359,379 @@ class HTTPClient:
         :raises InvalidAccessToken: Raised when a GitHub access token
                 provided is invalid
         :raises InvalidDomain: Raised when a domain provided is invalid
+        :raises ClientClosed: Raised when the client is closing
+        """
+        if self._closing:
+            raise ClientClosed()
+        self.stats.requests += 1
+        if kwargs or route.method not in IDEMPOTENT_METHODS:
+            body = kwargs.get('json')
+            try:
+                return await self._request(route, **kwargs)
+            finally:
+                if self.cache is not None:
+                    self.cache.invalidate_route(route, body)
+
+        if (
+            self.cache is not None
+            and self.cache.cacheable(route)
+            and (entry := self.cache.get(route)) is not None
+        ):
+            self._last_response = entry.response
+            self._raise_for_status(
+                route, entry.status_code, entry.response, {}
+            )
+            return entry.response
+
+        key = (route.method, route.url)
+        if (task := self._pending.get(key)) is not None:
+            self.stats.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._request(route))
+            self._pending[key] = task
+            task.add_done_callback(lambda t: self._forget_pending(key, t))
+        return await asyncio.shield(task)
+
+    def _forget_pending(
+        self, key: tuple[str, str], task: asyncio.Task[Response]
+    ) -> None:
+        """
+        Removes a finished request from the in-flight requests shared
+        between identical calls.
+
+        :param key: The method and url of the request
+        :param task: The finished task
+        :return: None
+        """
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            # mark the exception as retrieved when every caller gave up
+            task.exception()
+
+    async def _request(self, route: Router, **kwargs: Any) -> Response:
+        """
+        Sends a request, waiting for the rate limit budget and retrying it
+        according to the endpoint retry policy.
+
+        :param route: the route to send a request
+        :param kwargs: Keyword arguments
+        :return: A Response object
+        :rtype: Response
         """
-        headers = {
-            'Authorization': self.api_key,
-            'User-Agent': 'squarecloud-sdk-py/3.8.1',
-        }
         extra_error_kwargs: dict[str, Any] = {}
 
         if kwargs.get('custom_domain'):
             extra_error_kwargs['domain'] = kwargs.pop('custom_domain')
 
+        file: File | None = None
+        upload_options: dict[str, Any] = {}
         if route.endpoint in (Endpoint.commit(), Endpoint.upload()):
-            file: File = kwargs.pop('file')
-            form = aiohttp.FormData()
-            form.add_field('file', file.bytes, filename=file.filename)
-            kwargs['data'] = form
-        async with self.__session(headers=headers) as session:
-            async with session.request(
-                url=route.url, method=route.method, **kwargs
-            ) as resp:
-                status_code = resp.status
-                data: dict[str, Any] = await resp.json()
-                response = Response(data=data, route=route)
-                self._last_response = response
-
-                code: str | None = data.get('code')
-                error: type[RequestError] = RequestError
-                log_msg = '{status} request to route: {route}'
-                log_msg = log_msg.format(
-                    status=data.get('status'),
-                    route=route.url,
-                )
-
-                if code:
-                    log_msg += f' with code: {code}'
-                log_level: int
-
-                match status_code:
-                    case 200:
-                        log_level = logging.DEBUG
-                    case 404:
-                        if code is None:
-                            log_level = logging.DEBUG
-                        else:
-                            log_level = logging.ERROR
-                            error = NotFoundError
-                    case 400:
-                        log_level = logging.ERROR
-                        error = BadRequestError
-                    case 401:
-                        log_level = logging.ERROR
-                        error = AuthenticationFailure
-                    case 429:
-                        log_level = logging.ERROR
-                        error = TooManyRequests
-                    case _:
-                        log_level = logging.ERROR
-                        error = RequestError
-                if code:
-                    if _ := _get_error(code):
-                        log_level = logging.ERROR
-                        error = _
-                        logger.log(log_level, log_msg, extra={'type': 'http'})
-                    raise error(
-                        **extra_error_kwargs,
-                        route=route.endpoint.name,
-                        status_code=status_code,
-                        code=code,
+            file = kwargs.pop('file')
+            upload_options['progress'] = kwargs.pop('progress', None)
+            upload_options['max_bandwidth'] = kwargs.pop(
+                'max_bandwidth', None
+            )
+        if 'json' in kwargs:
+            kwargs['data'] = transfer.encode_json_body(
+                kwargs.pop('json'), self.json_dumps
+            )
+            kwargs['headers'] = {'Content-Type': 'application/json'}
+        policy = self.get_retry_policy(route.endpoint)
+        started_at = time.monotonic()
+        retries = rate_limited = 0
+        delay = 0.0
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            while True:
+                await self.rate_limit.acquire()
+                if file is not None:
+                    form = aiohttp.FormData()
+                    form.add_field(
+                        'file',
+                        transfer.FilePayload(file, **upload_options),
+                        filename=file.filename,
+                    )
+                    kwargs['data'] = form
+                try:
+                    response = await self._send(
+                        route, extra_error_kwargs, **kwargs
                     )
-                return response
+                    response.retries = retries
+                    return response
+                except TooManyRequests:
+                    rate_limited += 1
+                    if rate_limited > self.rate_limit.max_retries:
+                        raise
+                    logger.warning(
+                        'rate limited on route: %s, retrying in %.2fs',
+                        route.url,
+                        self.rate_limit.reset_after,
+                        extra={'type': 'http'},
+                    )
+                except (RequestError, *RETRYABLE_EXCEPTIONS) as exc:
+                    if not self._should_retry(exc, policy, retries):
+                        raise
+                    delay = policy.next_delay(delay)
+                    elapsed = time.monotonic() - started_at
+                    if policy.deadline and elapsed + delay > policy.deadline:
+                        raise
+                    retries += 1
+                    logger.warning(
+                        'transient failure on route: %s (%r), '
+                        'retry %d/%d in %.2fs',
+                        route.url,
+                        exc,
+                        retries,
+                        policy.max_retries,
+                        delay,
+                        extra={'type': 'http'},
+                    )
+                    await asyncio.sleep(delay)
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    @staticmethod
+    def _should_retry(
+        exc: BaseException, policy: RetryPolicy | None, retries: int
+    ) -> bool:
+        """
+        Returns whether a failed request can be retried by the policy
+
+        :param exc: The raised exception
+        :param policy: The retry policy of the endpoint
+        :param retries: How many retries were made
+        :return: True if the request should be retried
+        :rtype: bool
+        """
+        if policy is None or retries >= policy.max_retries:
+            return False
+        if isinstance(exc, RequestError):
+            return exc.status in policy.statuses
+        return True
+
+    def get_retry_policy(self, endpoint: Endpoint) -> RetryPolicy | None:
+        """
+        Returns the retry policy of an endpoint. Idempotent endpoints use
+        the default policy unless another one is set, the others are only
+        retried when a policy is set for them.
+
+        :param endpoint: The endpoint
+        :return: A RetryPolicy or None if the endpoint is not retried
+        :rtype: RetryPolicy | None
+        """
+        if endpoint.name in self.retry_policies:
+            return self.retry_policies[endpoint.name]
+        if endpoint.method in IDEMPOTENT_METHODS:
+            return DEFAULT_RETRY_POLICY
+        return None
+
+    def set_retry_policy(
+        self, endpoint: Endpoint, policy: RetryPolicy | None
+    ) -> None:
+        """
+        Sets the retry policy of an endpoint
+
+        :param endpoint: The endpoint
+        :param policy: The RetryPolicy, None disables the retries
+        :return: None
+        """
+        self.retry_policies[endpoint.name] = policy
+
+    async def _send(
+        self,
+        route: Router,
+        extra_error_kwargs: dict[str, Any],
+        **kwargs: Any,
+    ) -> Response:
+        """
+        Sends the request through the pooled session and maps the API
+        error codes into exceptions.
+
+        :param route: the route to send a request
+        :param extra_error_kwargs: Extra keyword arguments for the raised
+        errors
+        :param kwargs: Keyword arguments passed to aiohttp
+        :return: A Response object
+        :rtype: Response
+        """
+        session = self._get_session()
+        generation = self.cache.generation if self.cache is not None else 0
+        self.stats.sent += 1
+        async with session.request(
+            url=route.url, method=route.method, **kwargs
+        ) as resp:
+            status_code = resp.status
+            self.rate_limit.update(resp.headers, status_code)
+            try:
+                data: dict[str, Any] = await self._read_json(route, resp)
+            except ValueError:
+                data = {}
+            if not isinstance(data, dict) or 'status' not in data:
+                data = {
+                    'status': 'success' if status_code < 400 else 'error',
+                    'response': data or {},
+                }
+            response = Response(data=data, route=route)
+        self._last_response = response
+        try:
+            self._raise_for_status(
+                route, status_code, response, extra_error_kwargs
+            )
+        except RequestError:
+            # the missing resources are cached, the other errors are not
+            if self.cache is not None and status_code == 404:
+                self.cache.store(route, status_code, response, generation)
+            raise
+        if self.cache is not None:
+            self.cache.store(route, status_code, response, generation)
+        return response
+
+    async def _read_json(
+        self, route: Router, resp: aiohttp.ClientResponse
+    ) -> Any:
+        """
+        Reads and decodes a response body. The buffers returned by the file
+        endpoints are decoded into bytes while the body arrives, instead of
+        into a list with one int per byte.
+
+        :param route: the requested route
+        :param resp: the aiohttp response
+        :return: The decoded body, {} when it is empty
+        :rtype: Any
+
+        :raises ValueError: Raised when the body is not valid JSON
+        """
+        if route.endpoint.name in BYTE_ARRAY_ENDPOINTS:
+            decoder = codec.ByteArrayDecoder(self.json_loads)
+            async for chunk in resp.content.iter_chunked(transfer.READ_SIZE):
+                decoder.feed(chunk)
+            return decoder.close()
+        body = await resp.read()
+        return self.json_loads(body) if body else {}
+
+    @staticmethod
+    def _raise_for_status(
+        route: Router,
+        status_code: int,
+        response: Response,
+        extra_error_kwargs: dict[str, Any],
+    ) -> None:
+        """
+        Maps the status code and the API error code of a response into an
+        exception.
+
+        :param route: the requested route
+        :param status_code: the response status code
+        :param response: the Response object
+        :param extra_error_kwargs: Extra keyword arguments for the raised
+        errors
+        :return: None
+        """
+        data = response.data
+        code: str | None = data.get('code')
+        error: type[RequestError] = RequestError
+        log_msg = '{status} request to route: {route}'
+        log_msg = log_msg.format(
+            status=data.get('status'),
+            route=route.url,
+        )
+
+        if code:
+            log_msg += f' with code: {code}'
+        log_level: int
+
+        match status_code:
+            case 200:
+                log_level = logging.DEBUG
+            case 404:
+                if code is None:
+                    log_level = logging.DEBUG
+                else:
+                    log_level = logging.ERROR
+                    error = NotFoundError
+            case 400:
+                log_level = logging.ERROR
+                error = BadRequestError
+            case 401:
+                log_level = logging.ERROR
+                error = AuthenticationFailure
+            case 429:
+                log_level = logging.ERROR
+                error = TooManyRequests
+                code = code or 'TOO_MANY_REQUESTS'
+            case 408:
+                log_level = logging.ERROR
+                code = code or 'REQUEST_TIMEOUT'
+            case _:
+                log_level = logging.ERROR
+                error = RequestError
+                if status_code >= 500:
+                    code = code or 'INTERNAL_SERVER_ERROR'
+        if code:
+            if _ := _get_error(code):
+                log_level = logging.ERROR
+                error = _
+                logger.log(log_level, log_msg, extra={'type': 'http'})
+            raise error(
+                **extra_error_kwargs,
+                route=route.endpoint.name,
+                status_code=status_code,
+                code=code,
+            )
 
     @classmethod
+    @deprecated("this method will be removed in future versions, use the 'download_snapshot' method instead")
     async def fetch_snapshot_content(cls, url: str) -> bytes:
+        """
+        Downloads a snapshot into memory, through `download_snapshot` and a
+        temporary file
+
+        :param url: The snapshot url
+        :return: The snapshot content
+        :rtype: bytes
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            dest = os.path.join(directory, 'snapshot.zip')
+            await cls.download_snapshot(url, dest, resume=False)
+            return await asyncio.to_thread(Path(dest).read_bytes)
+
+    @classmethod
+    async def download_snapshot(
+        cls,
+        url: str,
+        dest: str,
+        *,
+        chunk_size: int = transfer.DEFAULT_CHUNK_SIZE,
+        concurrency: int = 4,
+        progress: transfer.ProgressCallback | None = None,
+        resume: bool = True,
+    ) -> int:
+        """
+        Streams a snapshot to disk, see `transfer.download`
+
+        :param url: The snapshot url
+        :param dest: The destination path
+        :param chunk_size: Size in bytes of each ranged request
+        :param concurrency: How many ranged requests run at the same time
+        :param progress: Called with a TransferProgress as the bytes arrive
+        :param resume: Whether to resume a previous partial download
+        :return: The size of the snapshot
+        :rtype: int
+        """
         async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                return await response.read()
+            return await transfer.download(
+                session,
+                url,
+                dest,
+                chunk_size=chunk_size,
+                concurrency=concurrency,
+                progress=progress,
+                resume=resume,
+            )
 
     async def fetch_user_info(self) -> Response:
         """
@@ -386,12 +883,20 @@ class HTTPClient:
         response: Response = await self.request(route)
         return response
 
-    async def commit(self, app_id: str, file: File) -> Response:
+    async def commit(
+        self,
+        app_id: str,
+        file: File,
+        progress: transfer.ProgressCallback | None = None,
+        max_bandwidth: float | None = None,
+    ) -> Response:
         """
-        Commit a file to an application
+        Commit a file to an application, streaming it in chunks
 
         :param app_id: The application id
         :param file: A File object to be committed
+        :param progress: Called with a TransferProgress as the file is sent
+        :param max_bandwidth: Maximum upload rate in bytes per second
         :return: A Response object
         :rtype: Response
 
@@ -403,14 +908,23 @@ class HTTPClient:
                 code is 429
         """
         route: Router = Router(Endpoint.commit(), app_id=app_id)
-        response: Response = await self.request(route, file=file)
+        response: Response = await self.request(
+            route, file=file, progress=progress, max_bandwidth=max_bandwidth
+        )
         return response
 
-    async def upload(self, file: File) -> Response:
+    async def upload(
+        self,
+        file: File,
+        progress: transfer.ProgressCallback | None = None,
+        max_bandwidth: float | None = None,
+    ) -> Response:
         """
-        Upload a new application
+        Upload a new application, streaming the file in chunks
 
         :param file: A File object to be uploaded
+        :param progress: Called with a TransferProgress as the file is sent
+        :param max_bandwidth: Maximum upload rate in bytes per second
         :return: A Response object
         :rtype: Response
 
@@ -448,7 +962,9 @@ class HTTPClient:
         :raises InvalidDomain: Raised when a domain provided is invalid
         """
         route: Router = Router(Endpoint.upload())
-        response: Response = await self.request(route, file=file)
+        response: Response = await self.request(
+            route, file=file, progress=progress, max_bandwidth=max_bandwidth
+        )
         return response
 
     async def fetch_app_files_list(self, app_id: str, path: str) -> Response:
@@ -493,13 +1009,15 @@ class HTTPClient:
         return response
 
     async def create_app_file(
-        self, app_id: str, file: list[bytes], path: str
+        self, app_id: str, file: bytes | list[int], path: str
     ) -> Response:
         """
         The create_app_file method creates a file in the specified app.
+        A bytes-like content is encoded as the array of byte values the API
+        expects while it is sent, without building a list of ints.
 
         :param app_id: The application id
-        :param file: Specify the file to be uploaded
+        :param file: Specify the file content
         :param path: str: Specify the path of the file
         :return: A Response object
 
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+
+LIMIT_HEADERS = ('X-RateLimit-Limit', 'RateLimit-Limit')
+REMAINING_HEADERS = ('X-RateLimit-Remaining', 'RateLimit-Remaining')
+RESET_HEADERS = ('X-RateLimit-Reset', 'RateLimit-Reset')
+
+
+def _header(headers: Mapping[str, str], names: tuple[str, ...]) -> str | None:
+    for name in names:
+        if (value := headers.get(name)) is not None:
+            return value
+    return None
+
+
+def _parse_float(value: str | None) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """
+    Converts a reset header into seconds from now. The header may carry
+    the seconds left, a unix timestamp or a unix timestamp in milliseconds.
+    """
+    reset = _parse_float(value)
+    if reset is None:
+        return None
+    if reset > 1e12:
+        reset /= 1000
+    if reset > 1e9:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Converts a Retry-After header (seconds or HTTP-date) into seconds"""
+    if value is None:
+        return None
+    if (seconds := _parse_float(value)) is not None:
+        return max(seconds, 0.0)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimit:
+    """
+    Token bucket that paces the requests using the rate-limit headers
+    returned by the API.
+
+    Requests wait in order for budget instead of failing, and a request
+    that still gets a 429 response is retried after the time requested by
+    the API.
+    """
+
+    def __init__(
+        self,
+        limit: int | None = None,
+        window: float = 60.0,
+        max_retries: int = 5,
+        default_retry_after: float = 1.0,
+    ) -> None:
+        """
+        :param limit: The bucket size, learned from the API headers when
+        not provided
+        :param window: Seconds until the bucket refills when the API does
+        not send a reset header
+        :param max_retries: How many times a request answered with 429 is
+        retried before TooManyRequests is raised
+        :param default_retry_after: Seconds to wait after a 429 response
+        without Retry-After or reset headers
+        :return: None
+        """
+        self.limit: int | None = limit
+        self.window: float = window
+        self.max_retries: int = max_retries
+        self.default_retry_after: float = default_retry_after
+        self._remaining: int | None = limit
+        self._reset_at: float | None = None
+        self._blocked_until: float = 0.0
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}(limit={self.limit}, '
+            f'remaining={self.remaining}, reset_after={self.reset_after:.2f})'
+        )
+
+    @property
+    def remaining(self) -> int | None:
+        """
+        Returns how many requests can be made before the bucket is empty,
+        None while the API has not informed the limit
+
+        :return: The remaining budget
+        :rtype: int | None
+        """
+        self._refill(time.monotonic())
+        return self._remaining
+
+    @property
+    def reset_after(self) -> float:
+        """
+        Returns the seconds until the budget is restored
+
+        :return: The seconds left
+        :rtype: float
+        """
+        now = time.monotonic()
+        reset_at = max(self._reset_at or now, self._blocked_until)
+        return max(reset_at - now, 0.0)
+
+    @property
+    def blocked(self) -> bool:
+        """
+        Returns whether the requests are on hold because of a 429 response
+
+        :return: True if the requests are on hold
+        :rtype: bool
+        """
+        return self._blocked_until > time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self._reset_at is not None and now >= self._reset_at:
+            self._remaining = self.limit
+            self._reset_at = None
+
+    async def acquire(self) -> None:
+        """
+        Waits until there is budget for one more request and consumes it.
+
+        :return: None
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._blocked_until > now:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._remaining is None:
+                    return
+                if self._remaining > 0:
+                    self._remaining -= 1
+                    return
+                if self._reset_at is None:
+                    self._reset_at = now + self.window
+                await asyncio.sleep(self._reset_at - now)
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> None:
+        """
+        Updates the bucket with the rate-limit headers of a response.
+
+        :param headers: The response headers
+        :param status_code: The response status code
+        :return: None
+        """
+        now = time.monotonic()
+        limit = _parse_float(_header(headers, LIMIT_HEADERS))
+        remaining = _parse_float(_header(headers, REMAINING_HEADERS))
+        reset = _parse_reset(_header(headers, RESET_HEADERS))
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self._remaining = int(remaining)
+        if reset is not None:
+            self._reset_at = now + reset
+        if status_code != 429:
+            return
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+        if retry_after is None:
+            retry_after = reset if reset is not None else (
+                self.default_retry_after
+            )
+        self._remaining = 0 if self.limit is not None else None
+        self._blocked_until = max(self._blocked_until, now + retry_after)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+
+import aiohttp
+
+RETRYABLE_EXCEPTIONS: tuple[type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy of an endpoint, using exponential backoff with decorrelated
+    jitter.
+
+    :ivar max_retries: How many times a failed request is retried
+    :ivar base_delay: The minimum delay in seconds between two attempts
+    :ivar max_delay: The maximum delay in seconds between two attempts
+    :ivar deadline: Maximum seconds spent on a request including all the
+    retries (None disables it)
+    :ivar statuses: The response status codes that are retried
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 5.0
+    deadline: float | None = 30.0
+    statuses: frozenset[int] = field(
+        default_factory=lambda: frozenset({408, 500, 502, 503, 504})
+    )
+
+    def next_delay(self, previous: float) -> float:
+        """
+        Returns the delay before the next attempt, drawn between the base
+        delay and three times the previous delay.
+
+        :param previous: The previous delay (0 on the first retry)
+        :return: The delay in seconds
+        :rtype: float
+        """
+        upper = max(previous, self.base_delay) * 3
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+# the endpoints retried by default, the other ones only retry when a policy
+# is set for them
+IDEMPOTENT_METHODS = frozenset({'GET'})
@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import io
+import json
+import mmap
+import os
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any
+
+import aiohttp
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.payload import Payload
+
+from .._internal import codec
+from .._internal.codec import JSONDumps
+
+if TYPE_CHECKING:
+    from ..file import File
+
+READ_SIZE = 2**16
+DEFAULT_CHUNK_SIZE = 8 * 2**20
+
+
+@dataclass(frozen=True)
+class TransferProgress:
+    """
+    Progress of a download or upload
+
+    :ivar transferred: Bytes transferred so far
+    :ivar total: Total bytes to transfer, None when unknown
+    :ivar elapsed: Seconds since the transfer started
+    """
+
+    transferred: int
+    total: int | None
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns the average transfer rate
+
+        :return: The rate in bytes per second
+        :rtype: float
+        """
+        return self.transferred / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def percent(self) -> float | None:
+        """
+        Returns the percentage transferred, None when the total is unknown
+
+        :return: The percentage
+        :rtype: float | None
+        """
+        if not self.total:
+            return None
+        return self.transferred * 100 / self.total
+
+
+ProgressCallback = Callable[[TransferProgress], Any]
+
+
+class ProgressTracker:
+    """Accumulates the transferred bytes and reports them to a callback"""
+
+    def __init__(
+        self,
+        callback: ProgressCallback | None,
+        total: int | None = None,
+        transferred: int = 0,
+    ) -> None:
+        self.callback = callback
+        self.total = total
+        self.transferred = transferred
+        self._started_at = time.monotonic()
+
+    @property
+    def progress(self) -> TransferProgress:
+        return TransferProgress(
+            transferred=self.transferred,
+            total=self.total,
+            elapsed=time.monotonic() - self._started_at,
+        )
+
+    async def advance(self, size: int) -> None:
+        self.transferred += size
+        if self.callback is None:
+            return
+        result = self.callback(self.progress)
+        if inspect.isawaitable(result):
+            await result
+
+
+class _DownloadState:
+    """
+    The chunks of a ranged download already written to the partial file,
+    persisted next to it so an interrupted download can be resumed.
+    """
+
+    def __init__(self, path: str, total: int, chunk_size: int) -> None:
+        self.path = path
+        self.total = total
+        self.chunk_size = chunk_size
+        self.done: set[int] = set()
+
+    @classmethod
+    def load(cls, path: str, total: int, chunk_size: int) -> _DownloadState:
+        state = cls(path, total, chunk_size)
+        try:
+            with open(path, encoding='utf-8') as file:
+                saved = json.load(file)
+        except (OSError, ValueError):
+            return state
+        if (saved.get('total'), saved.get('chunk_size')) == (
+            total,
+            chunk_size,
+        ):
+            state.done = set(saved.get('done', ()))
+        return state
+
+    def save(self) -> None:
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'total': self.total,
+                    'chunk_size': self.chunk_size,
+                    'done': sorted(self.done),
+                },
+                file,
+            )
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _content_length(response: aiohttp.ClientResponse) -> int | None:
+    content_range = response.headers.get('Content-Range', '')
+    if response.status == 206 and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        return int(total) if total.isdigit() else None
+    return response.content_length
+
+
+async def _write_stream(
+    response: aiohttp.ClientResponse,
+    file: IO[bytes],
+    offset: int,
+    tracker: ProgressTracker,
+) -> None:
+    async for data in response.content.iter_chunked(READ_SIZE):
+        # the seek and the write happen without yielding to the event loop,
+        # so the concurrent chunks never interleave their positions
+        file.seek(offset)
+        file.write(data)
+        offset += len(data)
+        await tracker.advance(len(data))
+
+
+async def download(
+    session: aiohttp.ClientSession,
+    url: str,
+    dest: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    concurrency: int = 4,
+    progress: ProgressCallback | None = None,
+    resume: bool = True,
+) -> int:
+    """
+    Streams a file to disk without holding it in memory.
+
+    When the server supports byte ranges the file is split into chunks
+    fetched in parallel, and the chunks already written by an interrupted
+    download are skipped when `resume` is True. Otherwise the body is
+    streamed sequentially.
+
+    :param session: The session used for the requests
+    :param url: The url of the file
+    :param dest: The destination path
+    :param chunk_size: Size in bytes of each ranged request
+    :param concurrency: How many ranged requests run at the same time
+    :param progress: Called with a TransferProgress as the bytes arrive
+    :param resume: Whether to resume a previous partial download
+    :return: The size of the downloaded file
+    :rtype: int
+    """
+    part_path = f'{dest}.part'
+    async with session.get(url, headers={'Range': 'bytes=0-0'}) as probe:
+        probe.raise_for_status()
+        total = _content_length(probe)
+        ranged = probe.status == 206 and total is not None
+        if not ranged:
+            tracker = ProgressTracker(progress, total)
+            file = await asyncio.to_thread(open, part_path, 'wb')
+            try:
+                await _write_stream(probe, file, 0, tracker)
+            finally:
+                await asyncio.to_thread(file.close)
+            os.replace(part_path, dest)
+            return tracker.transferred
+
+    state = _DownloadState(f'{part_path}.json', total, chunk_size)
+    if resume and os.path.exists(part_path):
+        state = _DownloadState.load(state.path, total, chunk_size)
+    chunks = range((total + chunk_size - 1) // chunk_size)
+    done_bytes = sum(
+        min(chunk_size, total - index * chunk_size) for index in state.done
+    )
+    tracker = ProgressTracker(progress, total, done_bytes)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    file = await asyncio.to_thread(
+        open, part_path, 'r+b' if state.done else 'wb'
+    )
+
+    async def fetch(index: int) -> None:
+        start = index * chunk_size
+        end = min(start + chunk_size, total) - 1
+        headers = {'Range': f'bytes={start}-{end}'}
+        async with (
+            semaphore,
+            session.get(url, headers=headers) as response,
+        ):
+            response.raise_for_status()
+            if response.status != 206:
+                raise aiohttp.ClientPayloadError(
+                    f'range {start}-{end} was not honoured by the server'
+                )
+            await _write_stream(response, file, start, tracker)
+        # the chunk is on disk before it is recorded as done, so a resumed
+        # download never skips bytes left in a buffer
+        file.flush()
+        await asyncio.to_thread(os.fsync, file.fileno())
+        state.done.add(index)
+        state.save()
+
+    try:
+        file.truncate(total)
+        # a failed chunk cancels the other ones before the file is closed
+        async with asyncio.TaskGroup() as group:
+            for index in chunks:
+                if index not in state.done:
+                    group.create_task(fetch(index))
+    except ExceptionGroup as group:
+        # the first failure, as it was raised before the chunks ran in a
+        # task group
+        raise group.exceptions[0] from None
+    finally:
+        await asyncio.to_thread(file.close)
+    os.replace(part_path, dest)
+    state.remove()
+    return total
+
+
+class FilePayload(Payload):
+    """
+    Multipart payload that streams a File in chunks instead of reading it
+    whole. Files created from a path are read through a memory map, the
+    other ones from their buffer. The File buffer is left open, so the
+    payload can be rebuilt when the request is retried.
+    """
+
+    def __init__(
+        self,
+        file: File,
+        *,
+        progress: ProgressCallback | None = None,
+        max_bandwidth: float | None = None,
+        chunk_size: int = READ_SIZE,
+    ) -> None:
+        """
+        :param file: The File to upload
+        :param progress: Called with a TransferProgress as the bytes are sent
+        :param max_bandwidth: Maximum upload rate in bytes per second, None
+        disables the cap
+        :param chunk_size: Size in bytes of each read
+        :return: None
+        """
+        super().__init__(file.bytes, filename=file.filename)
+        self._file = file
+        self._progress = progress
+        self._max_bandwidth = max_bandwidth
+        self._chunk_size = chunk_size
+        if file.bytes is not None:
+            self._size = file.bytes.seek(0, os.SEEK_END)
+            file.bytes.seek(0)
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        if self._file.archive is not None:
+            # the archive is compressed while it is sent, off the event loop
+            chunks = self._file.archive.chunks()
+            while chunk := await asyncio.to_thread(next, chunks, b''):
+                yield chunk
+            return
+        buffer = self._file.bytes
+        if self._file.path is not None and self._size:
+            with mmap.mmap(
+                buffer.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                for offset in range(0, len(mapped), self._chunk_size):
+                    yield mapped[offset : offset + self._chunk_size]
+            return
+        buffer.seek(0)
+        if isinstance(buffer, io.BytesIO):
+            while chunk := buffer.read(self._chunk_size):
+                yield chunk
+            return
+        while chunk := await asyncio.to_thread(buffer.read, self._chunk_size):
+            yield chunk
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(
+        self, writer: AbstractStreamWriter, content_length: int | None
+    ) -> None:
+        tracker = ProgressTracker(self._progress, self._size)
+        remaining = content_length
+        async for chunk in self._chunks():
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            await writer.write(chunk)
+            await tracker.advance(len(chunk))
+            if self._max_bandwidth:
+                progress = tracker.progress
+                ahead = progress.transferred / self._max_bandwidth
+                if ahead > progress.elapsed:
+                    await asyncio.sleep(ahead - progress.elapsed)
+            if remaining == 0:
+                return
+
+    def decode(self, encoding: str = 'utf-8', errors: str = 'strict') -> str:
+        if self._file.bytes is None:
+            raise TypeError('archives built on the fly cannot be decoded')
+        self._file.bytes.seek(0)
+        return self._file.bytes.read().decode(encoding, errors)
+
+
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+class JSONBodyPayload(Payload):
+    """
+    JSON request body whose buffer values are written as arrays of byte
+    values chunk by chunk while the request is sent, so the list of ints
+    and the full JSON text are never built.
+    """
+
+    def __init__(self, body: dict[str, Any], dumps: JSONDumps) -> None:
+        """
+        :param body: The request body, with bytes-like values
+        :param dumps: The codec used for the other values
+        :return: None
+        """
+        super().__init__(body, content_type='application/json')
+        buffers = {
+            key: value for key, value in body.items()
+            if isinstance(value, BYTES_TYPES)
+        }
+        head = _as_bytes(
+            dumps({k: v for k, v in body.items() if k not in buffers})
+        )
+        self._head = head[:-1]
+        self._buffers = [
+            (_as_bytes(dumps(key)), value) for key, value in buffers.items()
+        ]
+        separators = len(self._buffers) - (len(head) <= 2)
+        self._size = (
+            len(head)
+            + separators
+            + sum(
+                len(key) + 1 + codec.byte_array_size(value)
+                for key, value in self._buffers
+            )
+        )
+
+    def _chunks(self) -> Iterator[bytes]:
+        yield self._head
+        separator = b',' if len(self._head) > 1 else b''
+        for key, value in self._buffers:
+            yield separator + key + b':'
+            yield from codec.byte_array_chunks(value)
+            separator = b','
+        yield b'}'
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(
+        self, writer: AbstractStreamWriter, content_length: int | None
+    ) -> None:
+        remaining = content_length
+        for chunk in self._chunks():
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            await writer.write(chunk)
+            if remaining == 0:
+                return
+
+    def decode(self, encoding: str = 'utf-8', errors: str = 'strict') -> str:
+        return b''.join(self._chunks()).decode(encoding, errors)
+
+
+def _as_bytes(encoded: bytes | str) -> bytes:
+    return encoded if isinstance(encoded, bytes) else encoded.encode()
+
+
+def encode_json_body(
+    body: Any, dumps: JSONDumps
+) -> bytes | str | JSONBodyPayload:
+    """
+    Encodes a JSON request body, streaming the bytes-like values of a dict
+    body as the arrays of byte values the API expects for buffers.
+
+    :param body: The request body
+    :param dumps: The JSON codec
+    :return: The encoded body or a payload that encodes it while it is sent
+    :rtype: bytes | str | JSONBodyPayload
+    """
+    if isinstance(body, dict) and any(
+        isinstance(value, BYTES_TYPES) for value in body.values()
+    ):
+        return JSONBodyPayload(body, dumps)
+    return dumps(body)
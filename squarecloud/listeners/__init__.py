@@ -1,9 +1,13 @@
+import functools
 import inspect
 import types
+import typing
 from dataclasses import dataclass
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Callable, Optional, Type, Union
 
+from typing_extensions import deprecated
+
 from .._internal.constants import USING_PYDANTIC
 
 if USING_PYDANTIC:
@@ -23,6 +27,107 @@ class ListenerConfig:
     force_raise: bool = False
 
 
+@functools.cache
+def _extra_models(annotation: Any) -> tuple[type, ...]:
+    """The pydantic models of an `extra` annotation, a union included"""
+    if not USING_PYDANTIC:
+        return ()
+    if typing.get_origin(annotation) in (Union, types.UnionType):
+        members = typing.get_args(annotation)
+    else:
+        members = (annotation,)
+    return tuple(
+        member
+        for member in members
+        if isinstance(member, type) and issubclass(member, BaseModel)
+    )
+
+
+@functools.cache
+def _extra_adapter(annotation: Any) -> Optional['pydantic.TypeAdapter']:
+    """
+    The TypeAdapter casting `extra` into the models of an annotation, the
+    members of a union tried from left to right. Shared by the listeners
+    with the same annotation.
+    """
+    if not (models := _extra_models(annotation)):
+        return None
+    if len(models) == 1:
+        return pydantic.TypeAdapter(models[0])
+    return pydantic.TypeAdapter(
+        typing.Annotated[
+            Union[models],  # noqa: UP007
+            pydantic.Field(union_mode='left_to_right'),
+        ]
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchPlan:
+    """
+    How a listener callback is called, derived once from its signature
+    when the listener is created instead of on every notification
+
+    :ivar arguments: The parameters of the callback, the managers pass the
+     ones they provide, e.g. response, before, after and extra
+    :ivar is_coroutine: Whether the callback has to be awaited
+    :ivar extra_adapter: Casts `extra` into the pydantic models of its
+     annotation, None when it is passed as it is
+    :ivar extra_models: The models, as shown in the log messages
+    """
+
+    arguments: frozenset[str]
+    is_coroutine: bool
+    extra_adapter: Any = None
+    extra_models: str = ''
+
+    @classmethod
+    def compile(
+        cls, parameters: MappingProxyType[str, inspect.Parameter], callback
+    ) -> 'DispatchPlan':
+        """
+        Builds the plan of a callback
+
+        :param parameters: The parameters of the callback signature
+        :param callback: The callback
+        :return: The plan
+        :rtype: DispatchPlan
+        """
+        adapter = None
+        names = ''
+        if (extra := parameters.get('extra')) is not None and (
+            extra.annotation is not extra.empty
+        ):
+            adapter = _extra_adapter(extra.annotation)
+            models = _extra_models(extra.annotation)
+            names = (
+                f'a "{models[0].__name__}"'
+                if len(models) == 1
+                else str([model.__name__ for model in models])
+            )
+        return cls(
+            frozenset(parameters),
+            inspect.iscoroutinefunction(callback),
+            adapter,
+            names,
+        )
+
+    def cast_extra(self, value: Any) -> tuple[bool, Any]:
+        """
+        Casts `extra` for the callback
+
+        :param value: The extra value given to notify
+        :return: Whether the cast succeeded, and the value to pass
+        :rtype: tuple[bool, Any]
+        """
+        if self.extra_adapter is None:
+            return True, value
+        try:
+            return True, self.extra_adapter.validate_python(value)
+        except pydantic.ValidationError:
+            return False, None
+
+
 class Listener:
     __slots__ = (
         '_app',
@@ -30,6 +135,7 @@ class Listener:
         '_endpoint',
         '_callback',
         '_callback_params',
+        '_plan',
         'config',
     )
 
@@ -46,6 +152,7 @@ class Listener:
         self._endpoint = endpoint
         self._callback = callback
         self._callback_params = inspect.signature(callback).parameters
+        self._plan = DispatchPlan.compile(self._callback_params, callback)
         self.config = config
 
     @property
@@ -64,6 +171,10 @@ class Listener:
     def callback_params(self) -> MappingProxyType[str, inspect.Parameter]:
         return self._callback_params
 
+    @property
+    def plan(self) -> DispatchPlan:
+        return self._plan
+
     def __repr__(self) -> None:
         return f'{self.__class__.__name__}(endpoint={self.endpoint})'
 
@@ -139,28 +250,26 @@ class ListenerManager:
         self.listeners = None
 
     @classmethod
+    @deprecated("this method will be removed in future versions, the listeners cast 'extra' themselves")
     def cast_to_pydantic_model(
         cls, model: Type['BaseModel'], values: dict[Any, Any]
-    ) -> None:
-        result: BaseModel | None | dict = values
-        if isinstance(model, types.UnionType):
-            for ty in model.__args__:
-                if ty is None:
-                    continue
-                if not issubclass(ty, BaseModel):
-                    continue
-                try:
-                    return ty(**values)
-                except pydantic.ValidationError:
-                    continue
+    ) -> Any:
+        """
+        Casts `values` into a pydantic model, or into the first model of a
+        union that accepts them, with the TypeAdapter shared by the
+        listeners
+
+        :param model: The model or the union of models
+        :param values: The values of the model
+        :return: The model, None when the values are not valid, `values`
+         itself when `model` is not a pydantic model
+        """
+        if (adapter := _extra_adapter(model)) is None:
+            return None if isinstance(model, types.UnionType) else values
+        try:
+            return adapter.validate_python(values)
+        except pydantic.ValidationError:
             return None
-        if issubclass(model, BaseModel):
-            try:
-                result = model(**values)
-            except pydantic.ValidationError as e:
-                print(e)
-                result = None
-        return result
 
 
 ListenerDataTypes = Union[
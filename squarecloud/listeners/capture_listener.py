@@ -1,15 +1,11 @@
-import inspect
 import logging
-import types
 from typing import Any, Union
 
 from .. import data, errors
-from .._internal.constants import USING_PYDANTIC
 from ..http import Endpoint
 from . import Listener, ListenerManager
 
-if USING_PYDANTIC:
-    import pydantic
+logger = logging.getLogger('squarecloud')
 
 ListenerDataTypes = Union[
     data.AppData,
@@ -19,6 +15,30 @@ ListenerDataTypes = Union[
 ]
 
 
+class _Description:
+    """
+    The listener details of the log messages, formatted only when a record
+    is emitted
+    """
+
+    __slots__ = ('extra_value', 'listener')
+
+    def __init__(self, listener: Listener, extra_value: Any) -> None:
+        self.listener = listener
+        self.extra_value = extra_value
+
+    def __str__(self) -> str:
+        listener = self.listener
+        description = (
+            f'ENDPOINT: {listener.endpoint}\n'
+            f'APP-TAG: {listener.app.name}\n'
+            f'APP-ID: {listener.app.id}'
+        )
+        if 'extra' in listener.plan.arguments:
+            description += f'\nEXTRA: {self.extra_value}'
+        return description
+
+
 class CaptureListenerManager(ListenerManager):
     """CaptureListenerManager"""
 
@@ -75,85 +95,47 @@ class CaptureListenerManager(ListenerManager):
         :return: The result of the call function
         """
 
-        def filter_annotations(annotations: list[Any]) -> Any:
-            for item in annotations:
-                if issubclass(item, pydantic.BaseModel):
-                    yield item
-
         if not (listener := self.get_listener(endpoint)):
             return None
-        logger = logging.getLogger('squarecloud')
+        plan = listener.plan
         kwargs: dict[str, Any] = {}
-        call_params = listener.callback_params
-        call_extra_param: inspect.Parameter | None = call_params.get('extra')
-        extra_annotation: Any | None = None
-
-        if 'before' in call_params.keys():
+        if 'before' in plan.arguments:
             kwargs['before'] = before
-        if 'after' in call_params.keys():
+        if 'after' in plan.arguments:
             kwargs['after'] = after
-        if 'extra' in call_params.keys():
-            kwargs['extra'] = extra_value
-        info_msg: str = (
-            f'ENDPOINT: {listener.endpoint}\n'
-            f'APP-TAG: {listener.app.name}\n'
-            f'APP-ID: {listener.app.id}'
-        )
-        if call_extra_param:
-            info_msg += f'\nEXTRA: {extra_value}'
-            extra_annotation = call_extra_param.annotation
-
-        if (
-            call_extra_param is not None
-            and extra_annotation is not None
-            and extra_annotation != call_extra_param.empty
-        ):
-            cast_result = self.cast_to_pydantic_model(
-                extra_annotation, extra_value
-            )
-            if not cast_result:
-                msg: str = (
-                    f'a "{extra_annotation.__name__}"'
-                    if not isinstance(extra_annotation, types.UnionType)
-                    else str(
-                        [
-                            x.__name__
-                            for x in filter_annotations(
-                                list(extra_annotation.__args__)
-                            )
-                        ]
-                    )
-                )
+        if 'extra' in plan.arguments:
+            cast, kwargs['extra'] = plan.cast_extra(extra_value)
+            if not cast:
                 logger.warning(
-                    'Failed on cast extra argument in '
-                    f'"{listener.callback.__name__}" into '
-                    f'{msg} pydantic model.\n'
-                    f'{info_msg}\n'
-                    f'The listener has been skipped.',
+                    'Failed on cast extra argument in "%s" into %s pydantic '
+                    'model.\n%s\nThe listener has been skipped.',
+                    listener.callback.__name__,
+                    plan.extra_models,
+                    _Description(listener, extra_value),
                     extra={'type': 'listener'},
                 )
                 return None
-            kwargs['extra'] = cast_result
-
-        is_coro: bool = inspect.iscoroutinefunction(listener.callback)
         try:
-            if is_coro:
+            if plan.is_coroutine:
                 listener_result = await listener.callback(**kwargs)
             else:
                 listener_result = listener.callback(**kwargs)
             logger.info(
-                f'listener "{listener.callback.__name__}" was invoked.\n'
-                f'{info_msg}\n'
-                f'RETURN: {listener_result}',
+                'listener "%s" was invoked.\n%s\nRETURN: %s',
+                listener.callback.__name__,
+                _Description(listener, extra_value),
+                listener_result,
                 extra={'type': 'listener'},
             )
             return listener_result
         except Exception as exc:
             logger.error(
-                f'Failed to call listener "{listener.callback.__name__}.\n'
-                f'Error: {exc.__repr__()}.\n'
-                f'APP-TAG: {listener.app.name}\n'
-                f'APP-ID: {listener.app.id}',
+                'Failed to call listener "%s.\nError: %r.\nAPP-TAG: %s\n'
+                'APP-ID: %s',
+                listener.callback.__name__,
+                exc,
+                listener.app.name,
+                listener.app.id,
                 extra={'type': 'listener'},
             )
             if listener.config.force_raise:
@@ -1,16 +1,11 @@
-import inspect
 import logging
-import types
 from typing import Any
 
-from .._internal.constants import USING_PYDANTIC
-
-if USING_PYDANTIC:
-    import pydantic
-
 from ..http import Endpoint, Response
 from . import ListenerManager
 
+logger = logging.getLogger('squarecloud')
+
 
 class RequestListenerManager(ListenerManager):
     """CaptureListenerManager"""
@@ -41,73 +36,41 @@ class RequestListenerManager(ListenerManager):
         :return: The result of the call function
         """
 
-        def filter_annotations(annotations: list[Any]) -> Any:
-            for item in annotations:
-                if issubclass(item, pydantic.BaseModel):
-                    yield item
-
         if not (listener := self.get_listener(endpoint)):
             return None
-        logger = logging.getLogger('squarecloud')
+        plan = listener.plan
         kwargs: dict[str, Any] = {}
-        call_params = listener.callback_params
-        call_extra_param: inspect.Parameter | None = call_params.get('extra')
-        annotation: Any | None = None
-
-        if 'response' in call_params.keys():
+        if 'response' in plan.arguments:
             kwargs['response'] = response
-        if 'extra' in call_params.keys():
-            kwargs['extra'] = extra_value
-
-        if call_extra_param:
-            annotation = call_extra_param.annotation
-        if (
-            call_extra_param is not None
-            and annotation is not None
-            and annotation != call_extra_param.empty
-            and USING_PYDANTIC
-        ):
-            annotation = call_extra_param.annotation
-            cast_result = self.cast_to_pydantic_model(annotation, extra_value)
-            if not cast_result:
-                msg: str = (
-                    f'a "{annotation.__name__}"'
-                    if not isinstance(annotation, types.UnionType)
-                    else str(
-                        [
-                            x.__name__
-                            for x in filter_annotations(
-                                list(annotation.__args__)
-                            )
-                        ]
-                    )
-                )
+        if 'extra' in plan.arguments:
+            cast, kwargs['extra'] = plan.cast_extra(extra_value)
+            if not cast:
                 logger.warning(
-                    'Failed on cast extra argument in '
-                    f'"{listener.callback.__name__}" into '
-                    f'{msg}.\n'
-                    f'The listener has been skipped.',
+                    'Failed on cast extra argument in "%s" into %s.\n'
+                    'The listener has been skipped.',
+                    listener.callback.__name__,
+                    plan.extra_models,
                     extra={'type': 'listener'},
                 )
                 return None
-            kwargs['extra'] = cast_result
-        is_coro: bool = inspect.iscoroutinefunction(listener.callback)
         try:
-            if is_coro:
+            if plan.is_coroutine:
                 listener_result = await listener.callback(**kwargs)
             else:
                 listener_result = listener.callback(**kwargs)
             logger.info(
-                f'listener "{listener.callback.__name__}" was invoked.\n'
-                f'Endpoint: {listener.endpoint}\n'
-                f'RETURN: {listener_result}\n',
+                'listener "%s" was invoked.\nEndpoint: %s\nRETURN: %s\n',
+                listener.callback.__name__,
+                listener.endpoint,
+                listener_result,
                 extra={'type': 'listener'},
             )
             return listener_result
         except Exception as exc:
             logger.error(
-                f'Failed to call listener "{listener.callback.__name__}.\n'
-                f'Error: {exc.__repr__()}.\n',
+                'Failed to call listener "%s.\nError: %r.\n',
+                listener.callback.__name__,
+                exc,
                 extra={'type': 'listener'},
             )
             if listener.config.force_raise:
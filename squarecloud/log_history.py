@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import mmap
+import os
+import time
+import zlib
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from ._internal.logs import LogTail
+
+
+@dataclass(slots=True)
+class _Block:
+    """Compressed lines with the time runs they were received in"""
+
+    start: float
+    end: float
+    lines: int
+    size: int
+    # run-length encoded reception times, one per poll
+    times: array = field(default_factory=lambda: array('d'))
+    counts: array = field(default_factory=lambda: array('I'))
+    # the compressed lines in memory, or their position in the history file
+    data: bytes | None = None
+    offset: int = 0
+
+
+def _timestamp(value: datetime | float | None) -> float | None:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return value
+
+
+class LogHistory:
+    """
+    Bounded history of the log lines of an application, accumulated across
+    the log windows returned by the API.
+
+    The lines of each window that were already in the previous one are
+    dropped, the new ones are buffered and compressed in blocks of about
+    `block_size` bytes. The oldest blocks are evicted when the compressed
+    blocks exceed `max_bytes`. With a `path`, the blocks are written to that
+    file and read back through a memory map, so only their index stays in
+    memory; the file is truncated when the history is created.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 4 * 2**20,
+        path: str | os.PathLike[str] | None = None,
+        block_size: int = 64 * 2**10,
+        compresslevel: int = 6,
+    ) -> None:
+        """
+        :param max_bytes: Maximum compressed bytes kept, in memory or in the
+        file
+        :param path: The file where the compressed blocks are kept, None
+        keeps them in memory
+        :param block_size: Uncompressed bytes buffered before compressing
+        them into a block
+        :param compresslevel: The zlib compression level
+        :return: None
+        """
+        self.max_bytes: int = max_bytes
+        self.block_size: int = min(block_size, max_bytes)
+        self.compresslevel: int = compresslevel
+        self.path: Path | None = Path(path) if path is not None else None
+        self._tail: LogTail = LogTail()
+        self._blocks: deque[_Block] = deque()
+        self._stored: int = 0
+        self._lines: int = 0
+        self._buffer: list[str] = []
+        self._buffer_bytes: int = 0
+        self._buffer_block: _Block | None = None
+        self._file = None
+        self._map: mmap.mmap | None = None
+        # bytes at the start of the file left by evicted blocks
+        self._dead: int = 0
+        if self.path is not None:
+            self._file = open(self.path, 'w+b')  # noqa: SIM115
+
+    def __len__(self) -> int:
+        return self._lines
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}(lines={self._lines}, '
+            f'stored_bytes={self._stored})'
+        )
+
+    @property
+    def stored_bytes(self) -> int:
+        """
+        Returns the compressed bytes kept
+
+        :return: The size in bytes
+        :rtype: int
+        """
+        return self._stored
+
+    @property
+    def buffered_bytes(self) -> int:
+        """
+        Returns the bytes of the lines not compressed yet
+
+        :return: The size in bytes
+        :rtype: int
+        """
+        return self._buffer_bytes
+
+    def add(
+        self, window: str, timestamp: datetime | float | None = None
+    ) -> int:
+        """
+        Adds the lines of a log window that were not in the previous one
+
+        :param window: The whole log window returned by the API
+        :param timestamp: When the window was received, defaults to now
+        :return: How many lines were added
+        :rtype: int
+        """
+        lines = self._tail.update(window)
+        self.extend(lines, timestamp)
+        return len(lines)
+
+    def extend(
+        self, lines: Iterable[str], timestamp: datetime | float | None = None
+    ) -> None:
+        """
+        Adds lines received at the same time
+
+        :param lines: The lines, without line breaks
+        :param timestamp: When the lines were received, defaults to now
+        :return: None
+        """
+        lines = [part for line in lines for part in line.split('\n')]
+        if not lines:
+            return
+        received = _timestamp(timestamp)
+        if received is None:
+            received = time.time()
+        if (block := self._buffer_block) is None:
+            block = self._buffer_block = _Block(received, received, 0, 0)
+        if block.times and block.times[-1] == received:
+            block.counts[-1] += len(lines)
+        else:
+            block.times.append(received)
+            block.counts.append(len(lines))
+        block.end = max(block.end, received)
+        block.lines += len(lines)
+        self._lines += len(lines)
+        self._buffer.extend(lines)
+        self._buffer_bytes += sum(map(len, lines)) + len(lines)
+        if self._buffer_bytes >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Compresses the buffered lines into a block
+
+        :return: None
+        """
+        if (block := self._buffer_block) is None:
+            return
+        data = zlib.compress(
+            '\n'.join(self._buffer).encode(), self.compresslevel
+        )
+        block.size = len(data)
+        if self._file is None:
+            block.data = data
+        else:
+            self._file.seek(0, os.SEEK_END)
+            block.offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+        self._blocks.append(block)
+        self._stored += block.size
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._buffer_block = None
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._stored > self.max_bytes and self._blocks:
+            block = self._blocks.popleft()
+            self._stored -= block.size
+            self._lines -= block.lines
+            self._dead += block.size if self._file is not None else 0
+        if self._file is not None and self._dead > self._stored:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrites the file without the bytes of the evicted blocks"""
+        self._close_map()
+        self._file.seek(self._dead)
+        live = self._file.read()
+        self._file.seek(0)
+        self._file.write(live)
+        self._file.truncate()
+        self._file.flush()
+        for block in self._blocks:
+            block.offset -= self._dead
+        self._dead = 0
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _read(self, block: _Block) -> str:
+        if block.data is not None:
+            data = block.data
+        else:
+            end = block.offset + block.size
+            if self._map is None or len(self._map) < end:
+                self._close_map()
+                self._map = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            data = self._map[block.offset : end]
+        return zlib.decompress(data).decode()
+
+    def query(
+        self,
+        start: datetime | float | None = None,
+        end: datetime | float | None = None,
+        contains: str | None = None,
+    ) -> Iterator[tuple[datetime, str]]:
+        """
+        Iterates the kept lines, from the oldest, received between `start`
+        and `end` and containing a substring. The blocks outside the time
+        range or without the substring are not split into lines.
+
+        :param start: The earliest reception time
+        :param end: The latest reception time
+        :param contains: A substring the lines must contain
+        :return: An iterator of (reception time, line) pairs
+        :rtype: Iterator[tuple[datetime, str]]
+        """
+        start, end = _timestamp(start), _timestamp(end)
+        blocks = list(self._blocks)
+        if self._buffer_block is not None:
+            blocks.append(self._buffer_block)
+        for block in blocks:
+            if start is not None and block.end < start:
+                continue
+            if end is not None and block.start > end:
+                continue
+            if block is self._buffer_block:
+                text = None
+                lines = list(self._buffer)
+            else:
+                text = self._read(block)
+                if contains is not None and contains not in text:
+                    continue
+                lines = text.split('\n')
+            position = 0
+            for received, count in zip(block.times, block.counts):
+                run = lines[position : position + count]
+                position += count
+                if start is not None and received < start:
+                    continue
+                if end is not None and received > end:
+                    continue
+                moment = datetime.fromtimestamp(received)
+                for line in run:
+                    if contains is None or contains in line:
+                        yield moment, line
+
+    def clear(self) -> None:
+        """
+        Removes all the kept lines
+
+        :return: None
+        """
+        self._blocks.clear()
+        self._stored = self._lines = self._buffer_bytes = self._dead = 0
+        self._buffer = []
+        self._buffer_block = None
+        self._tail = LogTail()
+        if self._file is not None:
+            self._close_map()
+            self._file.truncate(0)
+
+    def close(self) -> None:
+        """
+        Closes the history file, if any
+
+        :return: None
+        """
+        self._close_map()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from .data import ResumedStatus
+from .http.endpoints import Endpoint
+
+if TYPE_CHECKING:
+    from .client import Client
+
+EventKind = Literal[
+    'added',
+    'removed',
+    'started',
+    'stopped',
+    'ram_above',
+    'ram_below',
+    'cpu_above',
+    'cpu_below',
+]
+
+_NUMBER = re.compile(r'(\d+(?:\.\d+)?)\s*([KMGT]?B)?', re.IGNORECASE)
+_MEGABYTES = {'KB': 1 / 1024, 'MB': 1.0, 'GB': 1024.0, 'TB': 1024.0**2}
+
+
+def parse_megabytes(value: Any) -> float | None:
+    """
+    Parses a RAM usage like `'512MB'` or `'1.5GB'` into megabytes, a value
+    without a unit is taken as megabytes
+
+    :param value: The value informed by the API
+    :return: The megabytes or None if it can not be parsed
+    :rtype: float | None
+    """
+    if isinstance(value, int | float):
+        return float(value)
+    if not isinstance(value, str) or not (match := _NUMBER.search(value)):
+        return None
+    unit = (match.group(2) or 'MB').upper()
+    return float(match.group(1)) * _MEGABYTES[unit]
+
+
+def parse_percent(value: Any) -> float | None:
+    """
+    Parses a CPU usage like `'12.5%'`
+
+    :param value: The value informed by the API
+    :return: The percentage or None if it can not be parsed
+    :rtype: float | None
+    """
+    if isinstance(value, int | float):
+        return float(value)
+    if not isinstance(value, str) or not (match := _NUMBER.search(value)):
+        return None
+    return float(match.group(1))
+
+
+@dataclass(frozen=True)
+class StatusEvent:
+    """
+    A change of an application status between two polls
+
+    :ivar kind: What changed
+    :ivar app_id: The application id
+    :ivar previous: The status on the previous poll, None if it is new
+    :ivar current: The status on this poll, None if it was removed
+    :ivar timestamp: When the poll finished
+    """
+
+    kind: EventKind
+    app_id: str
+    previous: ResumedStatus | None
+    current: ResumedStatus | None
+    timestamp: float
+
+
+class Monitor:
+    """
+    Watches the status of all the applications with a single
+    ALL_APPS_STATUS request per poll, emitting the changes since the
+    previous poll.
+
+    The statuses are compared as returned by the API, the ResumedStatus
+    objects are only created for the applications that changed. The first
+    poll only records the statuses. The interval grows by half after a poll
+    without changes and is halved after a poll with them.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        interval: float = 10.0,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        ram_threshold: float | None = None,
+        cpu_threshold: float | None = None,
+    ) -> None:
+        """
+        :param client: The client used to poll
+        :param interval: Seconds between the first polls
+        :param min_interval: Minimum seconds between two polls
+        :param max_interval: Maximum seconds between two polls
+        :param ram_threshold: Megabytes of RAM whose crossing emits a
+        ram_above or ram_below event
+        :param cpu_threshold: CPU percentage whose crossing emits a
+        cpu_above or cpu_below event
+        :return: None
+        """
+        self.client = client
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.interval: float = min(max(interval, min_interval), max_interval)
+        self.ram_threshold: float | None = ram_threshold
+        self.cpu_threshold: float | None = cpu_threshold
+        self._statuses: dict[str, dict[str, Any]] | None = None
+
+    def _crossings(
+        self, previous: dict[str, Any], current: dict[str, Any]
+    ) -> list[EventKind]:
+        kinds: list[EventKind] = []
+        if previous.get('running') != current.get('running'):
+            kinds.append('started' if current.get('running') else 'stopped')
+        for key, threshold, parse in (
+            ('ram', self.ram_threshold, parse_megabytes),
+            ('cpu', self.cpu_threshold, parse_percent),
+        ):
+            if threshold is None or previous.get(key) == current.get(key):
+                continue
+            before, after = parse(previous.get(key)), parse(current.get(key))
+            if before is None or after is None:
+                continue
+            if before <= threshold < after:
+                kinds.append(f'{key}_above')
+            elif after <= threshold < before:
+                kinds.append(f'{key}_below')
+        return kinds
+
+    def diff(self, statuses: list[dict[str, Any]]) -> list[StatusEvent]:
+        """
+        Records the statuses of a poll and returns the changes since the
+        previous one
+
+        :param statuses: The raw ALL_APPS_STATUS response
+        :return: The events, empty on the first poll
+        :rtype: list[StatusEvent]
+        """
+        current = {status['id']: status for status in statuses}
+        previous, self._statuses = self._statuses, current
+        if previous is None:
+            return []
+        now = time.time()
+        events: list[StatusEvent] = []
+
+        def emit(
+            kind: EventKind,
+            app_id: str,
+            before: dict[str, Any] | None,
+            after: dict[str, Any] | None,
+        ) -> None:
+            events.append(
+                StatusEvent(
+                    kind=kind,
+                    app_id=app_id,
+                    previous=ResumedStatus(**before) if before else None,
+                    current=ResumedStatus(**after) if after else None,
+                    timestamp=now,
+                )
+            )
+
+        for app_id, status in current.items():
+            if (before := previous.get(app_id)) is None:
+                emit('added', app_id, None, status)
+            elif before != status:
+                for kind in self._crossings(before, status):
+                    emit(kind, app_id, before, status)
+        for app_id, status in previous.items():
+            if app_id not in current:
+                emit('removed', app_id, status, None)
+        return events
+
+    async def poll(self) -> list[StatusEvent]:
+        """
+        Requests the statuses once and returns the changes. The listener of
+        Endpoint.all_apps_status(), if any, is called with the events as
+        `extra` when there are changes.
+
+        :return: The events
+        :rtype: list[StatusEvent]
+        """
+        response = await self.client._http.all_apps_status()
+        events = self.diff(response.response or [])
+        if events:
+            await self.client.notify(
+                endpoint=Endpoint.all_apps_status(),
+                response=response,
+                extra_value=events,
+            )
+        return events
+
+    def _adapt(self, changed: bool) -> None:
+        if changed:
+            self.interval = max(self.interval / 2, self.min_interval)
+        else:
+            self.interval = min(self.interval * 1.5, self.max_interval)
+
+    async def __aiter__(self) -> AsyncIterator[StatusEvent]:
+        while True:
+            events = await self.poll()
+            for event in events:
+                yield event
+            self._adapt(bool(events))
+            await asyncio.sleep(self.interval)
+
+    async def run(self, queue: asyncio.Queue[StatusEvent]) -> None:
+        """
+        Polls until cancelled, putting the events into a queue
+
+        :param queue: The queue receiving the events
+        :return: None
+        """
+        async for event in self:
+            await queue.put(event)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+
+from .data import FileInfo
+
+
+@dataclass
+class SyncResult:
+    """
+    Outcome of a directory sync, with the paths relative to the synced
+    directories
+
+    :ivar uploaded: Files created or replaced on the application
+    :ivar deleted: Remote files removed because they are not local anymore
+    :ivar unchanged: Files left untouched
+    :ivar errors: The paths whose upload or deletion failed
+    """
+
+    uploaded: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns whether every operation succeeded
+
+        :return: True if there are no errors
+        :rtype: bool
+        """
+        return not self.errors
+
+
+def remote_timestamp(value: float) -> float:
+    """Converts a lastModified value, in seconds or milliseconds, to seconds"""
+    return value / 1000 if value > 1e11 else value
+
+
+def is_outdated(local: os.stat_result, remote: FileInfo | None) -> bool:
+    """
+    Returns whether a remote file differs from the local one, comparing the
+    sizes and whether the local file was modified after the remote one.
+
+    :param local: The local file stat
+    :param remote: The remote file information, None if it does not exist
+    :return: True if the file must be uploaded
+    :rtype: bool
+    """
+    if remote is None or remote.size != local.st_size:
+        return True
+    if remote.lastModified is None:
+        return False
+    return local.st_mtime > remote_timestamp(remote.lastModified)
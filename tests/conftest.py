@@ -5,11 +5,14 @@ from string import ascii_letters
 from typing import AsyncGenerator
 
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from dotenv import load_dotenv
 from rich.status import Status
 
 from squarecloud import Client, File, FileInfo, UploadData
 from squarecloud.app import Application
+from squarecloud.http.endpoints import Router
 from squarecloud.utils import ConfigFile
 from tests import create_zip
 
@@ -48,3 +51,20 @@ async def app(client: Client) -> AsyncGenerator[Application, None]:
 @pytest.fixture(scope='module')
 async def app_files(app: Application) -> list[FileInfo]:
     return await app.files_list(path='/')
+
+
+@pytest.fixture
+async def api_server(monkeypatch: pytest.MonkeyPatch):
+    """Starts a local stand-in for the API and routes the requests to it"""
+    servers: list[TestServer] = []
+
+    async def factory(application: web.Application) -> TestServer:
+        server = TestServer(application)
+        await server.start_server()
+        monkeypatch.setattr(Router, 'BASE_V2', str(server.make_url('/v2')))
+        servers.append(server)
+        return server
+
+    yield factory
+    for server in servers:
+        await server.close()
@@ -0,0 +1,239 @@
+from datetime import UTC, datetime
+
+import pytest
+from aiohttp import web
+
+from squarecloud import (
+    AnalyticsColumns,
+    AnalyticsStore,
+    Client,
+    ColumnarAnalytics,
+    DomainAnalytics,
+)
+
+
+def row(date: str, visits: int, nbytes: int, kind: str | None = None):
+    data = {
+        'visits': visits,
+        'requests': visits * 2,
+        'bytes': nbytes,
+        'date': date,
+    }
+    if kind is not None:
+        data['type'] = kind
+    return data
+
+
+ANALYTICS = {
+    'devices': [],
+    'os': [],
+    'browsers': [],
+    'protocols': [],
+    'methods': [],
+    'referers': [],
+    'providers': [],
+    'visits': [
+        row('2024-01-01T10:00:00.000Z', 3, 30),
+        row('2024-01-01T11:00:00.000Z', 2, 20),
+        row('2024-01-02T10:00:00.000Z', 5, 50),
+        row('2024-02-01T10:00:00.000Z', 1, 10),
+    ],
+    'countries': [
+        row('2024-01-01T10:00:00.000Z', 6, 0, 'BR'),
+        row('2024-01-01T10:00:00.000Z', 2, 0, 'US'),
+        row('2024-01-02T10:00:00.000Z', 2, 0, 'BR'),
+    ],
+    'paths': [
+        row('2024-01-01T10:00:00.000Z', 1, 100, '/'),
+        row('2024-01-01T10:00:00.000Z', 1, 700, '/big'),
+        row('2024-01-02T10:00:00.000Z', 1, 300, '/'),
+        row('2024-01-02T10:00:00.000Z', 1, 5, '/small'),
+    ],
+}
+
+
+class TestColumnarAnalytics:
+    def test_breakdowns_are_converted_lazily(self):
+        analytics = ColumnarAnalytics(ANALYTICS)
+        assert analytics._columns == {}
+        paths = analytics.paths
+        assert isinstance(paths, AnalyticsColumns)
+        assert list(analytics._columns) == ['paths']
+        assert analytics.paths is paths
+        assert len(analytics.browsers) == 0
+        with pytest.raises(AttributeError):
+            analytics.unknown  # noqa: B018
+
+    def test_top(self):
+        analytics = ColumnarAnalytics(ANALYTICS)
+        assert analytics.top_paths(2) == [('/big', 700), ('/', 400)]
+        assert analytics.paths.top(1, by='visits') == [('/', 2)]
+        assert analytics.paths.totals('requests') == {
+            '/': 4,
+            '/big': 2,
+            '/small': 2,
+        }
+
+    def test_share(self):
+        analytics = ColumnarAnalytics(ANALYTICS)
+        assert analytics.country_share() == {'BR': 0.8, 'US': 0.2}
+        assert analytics.countries.share('bytes') == {'BR': 0.0, 'US': 0.0}
+
+    def test_resample(self):
+        analytics = ColumnarAnalytics(ANALYTICS)
+        assert analytics.per_day() == [
+            (datetime(2024, 1, 1), 5),
+            (datetime(2024, 1, 2), 5),
+            (datetime(2024, 2, 1), 1),
+        ]
+        assert analytics.visits.resample('bytes', 'month') == [
+            (datetime(2024, 1, 1), 100),
+            (datetime(2024, 2, 1), 10),
+        ]
+        assert len(analytics.visits.resample('visits', 'hour')) == 4
+
+    def test_rows_and_columns(self):
+        analytics = ColumnarAnalytics(ANALYTICS)
+        paths = list(analytics.paths)
+        assert paths[1] == DomainAnalytics.Paths(**ANALYTICS['paths'][1])
+        assert analytics.paths.column('type') == ['/', '/big', '/', '/small']
+        assert list(analytics.paths.column('bytes')) == [100, 700, 300, 5]
+        assert analytics.paths.types == ['/', '/big', '/small']
+        with pytest.raises(ValueError):
+            analytics.paths.column('nope')
+
+    def test_to_model(self):
+        model = ColumnarAnalytics(ANALYTICS).to_model()
+        assert model == DomainAnalytics(**ANALYTICS)
+
+
+class TestAnalyticsStore:
+    def test_merge_deduplicates(self, tmp_path):
+        store = AnalyticsStore(tmp_path)
+        assert store.merge('app1', ANALYTICS) == 11
+        assert store.merge('app1', ANALYTICS) == 0
+        newer = {
+            'visits': [
+                row('2024-02-01T10:00:00.000Z', 4, 40),
+                row('2024-02-02T10:00:00.000Z', 1, 10),
+            ]
+        }
+        assert store.merge('app1', newer) == 2
+        visits = store.query('visits')
+        assert len(visits) == 5
+        assert sum(visits.visits) == 3 + 2 + 5 + 4 + 1
+        assert store.apps() == ['app1']
+
+    def test_persists_and_compacts(self, tmp_path):
+        store = AnalyticsStore(tmp_path)
+        store.merge('app1', ANALYTICS)
+        for visits in range(1, 4):
+            store.merge(
+                'app1', {'visits': [row('2024-02-01T10:00:00.000Z', visits, 0)]}
+            )
+        series = store._get('app1', 'visits')
+        assert series.segments == 4
+        reopened = AnalyticsStore(tmp_path)
+        assert reopened.per_app() == {'app1': 3 + 2 + 5 + 3}
+        assert reopened.query('paths').totals('bytes') == {
+            '/': 400,
+            '/big': 700,
+            '/small': 5,
+        }
+        reopened.compact()
+        assert reopened._get('app1', 'visits').segments == 1
+        assert AnalyticsStore(tmp_path).per_app() == {'app1': 13}
+
+    def test_truncated_segment_is_dropped(self, tmp_path):
+        store = AnalyticsStore(tmp_path)
+        store.merge('app1', ANALYTICS)
+        store.merge('app1', {'visits': [row('2024-03-01', 7, 0)]})
+        path = tmp_path / 'app1' / 'visits.bin'
+        path.write_bytes(path.read_bytes()[:-5])
+        assert AnalyticsStore(tmp_path).per_app() == {'app1': 11}
+        assert AnalyticsStore(tmp_path).merge(
+            'app1', {'visits': [row('2024-03-01', 7, 0)]}
+        ) == 1
+
+    def test_fleet_queries(self, tmp_path):
+        store = AnalyticsStore(tmp_path)
+        store.merge('app1', ANALYTICS)
+        store.merge(
+            'app2',
+            {
+                'visits': [row('2024-01-01T12:00:00.000Z', 10, 0)],
+                'paths': [row('2024-01-01T12:00:00.000Z', 1, 50, '/other')],
+            },
+        )
+        assert store.rollup() == [
+            (datetime(2024, 1, 1), 15),
+            (datetime(2024, 1, 2), 5),
+            (datetime(2024, 2, 1), 1),
+        ]
+        assert store.rollup(app_ids=['app2']) == [(datetime(2024, 1, 1), 10)]
+        assert store.rollup('bytes', breakdown='paths') == [
+            (datetime(2024, 1, 1), 850),
+            (datetime(2024, 1, 2), 305),
+        ]
+        january = store.query(
+            'paths',
+            start=datetime(2024, 1, 1, 11),
+            end=datetime(2024, 1, 31, tzinfo=UTC),
+        )
+        assert january.totals('bytes') == {'/': 300, '/small': 5, '/other': 50}
+        assert store.per_app(start=datetime(2024, 1, 2)) == {
+            'app1': 6,
+            'app2': 0,
+        }
+
+    def test_invalid_arguments(self, tmp_path):
+        store = AnalyticsStore(tmp_path)
+        with pytest.raises(ValueError):
+            store.merge('../app', ANALYTICS)
+        with pytest.raises(ValueError):
+            store.query('unknown')
+
+
+@pytest.mark.http
+class TestDomainAnalytics:
+    async def test_columnar(self, api_server):
+        async def analytics(request: web.Request) -> web.Response:
+            return web.json_response(
+                {'status': 'success', 'response': ANALYTICS}
+            )
+
+        application = web.Application()
+        application.router.add_get(
+            '/v2/apps/{app_id}/network/analytics', analytics
+        )
+        await api_server(application)
+        async with Client('key') as client:
+            model = await client.domain_analytics('app')
+            columnar = await client.domain_analytics('app', columnar=True)
+        assert isinstance(model, DomainAnalytics)
+        assert isinstance(columnar, ColumnarAnalytics)
+        assert columnar.to_model() == model
+
+    async def test_store_fetch(self, api_server, tmp_path):
+        async def analytics(request: web.Request) -> web.Response:
+            if request.match_info['app_id'] == 'broken':
+                return web.json_response(
+                    {'status': 'error', 'code': 'APP_NOT_FOUND'}, status=404
+                )
+            return web.json_response(
+                {'status': 'success', 'response': ANALYTICS}
+            )
+
+        application = web.Application()
+        application.router.add_get(
+            '/v2/apps/{app_id}/network/analytics', analytics
+        )
+        await api_server(application)
+        store = AnalyticsStore(tmp_path)
+        async with Client('key') as client:
+            result = await store.fetch(client, ['app1', 'app2', 'broken'])
+            assert result.succeeded == {'app1': 11, 'app2': 11}
+            assert list(result.failed) == ['broken']
+            again = await store.fetch(client, ['app1', 'app2'])
+        assert again.succeeded == {'app1': 0, 'app2': 0}
+        assert store.per_app() == {'app1': 11, 'app2': 11}
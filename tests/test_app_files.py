@@ -0,0 +1,419 @@
+import asyncio
+import time
+from datetime import datetime
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from squarecloud import (
+    Client,
+    Endpoint,
+    FileContentCache,
+    RemoteFileIndex,
+    Response,
+    SyncResult,
+)
+from squarecloud.app import Application
+from squarecloud.data import FileInfo
+from squarecloud.errors import NotFoundError
+
+
+class FakeFiles:
+    """In-memory stand-in for the files endpoints of an application"""
+
+    def __init__(self, files: dict[str, bytes], delay: float = 0) -> None:
+        now = time.time() * 1000
+        self.files = dict(files)
+        self.modified = {path: now for path in files}
+        self.calls = {'list': 0, 'read': 0, 'create': 0, 'delete': 0}
+        self.delay = delay
+        self.listing = self.max_listing = 0
+
+    def application(self) -> web.Application:
+        application = web.Application(client_max_size=2**24)
+        route = '/v2/apps/{app_id}/files'
+        application.router.add_get(route, self.list)
+        application.router.add_put(route, self.create)
+        application.router.add_delete(route, self.delete)
+        application.router.add_get(route + '/content', self.read)
+        return application
+
+    async def list(self, request: web.Request) -> web.Response:
+        self.calls['list'] += 1
+        self.listing += 1
+        self.max_listing = max(self.max_listing, self.listing)
+        await asyncio.sleep(self.delay)
+        self.listing -= 1
+        prefix = '/' + request.query['path'].strip('/')
+        prefix = prefix.rstrip('/') + '/'
+        entries: dict[str, dict] = {}
+        for path, content in self.files.items():
+            if not path.startswith(prefix):
+                continue
+            name, *rest = path[len(prefix) :].split('/')
+            if rest:
+                # a directory is as recent as its most recent file
+                modified = max(
+                    self.modified[path],
+                    entries.get(name, {}).get('lastModified', 0),
+                )
+                entries[name] = {
+                    'type': 'directory',
+                    'name': name,
+                    'lastModified': modified,
+                }
+            else:
+                entries[name] = {
+                    'type': 'file',
+                    'name': name,
+                    'size': len(content),
+                    'lastModified': self.modified[path],
+                }
+        return web.json_response(
+            {'status': 'success', 'response': list(entries.values())}
+        )
+
+    async def read(self, request: web.Request) -> web.Response:
+        self.calls['read'] += 1
+        path = '/' + request.query['path'].strip('/')
+        if path not in self.files:
+            return web.json_response(
+                {'status': 'error', 'code': 'FILE_NOT_FOUND'}, status=404
+            )
+        return web.json_response(
+            {
+                'status': 'success',
+                'response': {'type': 'Buffer', 'data': list(self.files[path])},
+            }
+        )
+
+    async def create(self, request: web.Request) -> web.Response:
+        self.calls['create'] += 1
+        body = await request.json()
+        path = '/' + body['path'].strip('/')
+        self.files[path] = bytes(body['content'])
+        self.modified[path] = time.time() * 1000
+        return web.json_response({'status': 'success'})
+
+    async def delete(self, request: web.Request) -> web.Response:
+        self.calls['delete'] += 1
+        body = await request.json()
+        del self.files[body['path']]
+        return web.json_response({'status': 'success'})
+
+
+def make_app(client: Client) -> Application:
+    return Application(
+        client=client,
+        http=client._http,
+        id='app',
+        name='app',
+        ram=256,
+        lang='python',
+        cluster='test',
+        created_at=datetime.now(),
+        domain=None,
+        custom=None,
+    )
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    tree = {
+        'a.py': 'same',
+        'src/b.py': 'changed',
+        'src/c.py': 'new',
+        'debug.log': '',
+        '.gitignore': '*.log',
+        '.git/HEAD': '',
+    }
+    for name, content in tree.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(content)
+    return tmp_path
+
+
+@pytest.mark.http
+class TestSyncDirectory:
+    async def test_sync(self, api_server, source_tree):
+        fake = FakeFiles(
+            {'/a.py': b'same', '/src/b.py': b'old', '/old.py': b'orphan'}
+        )
+        fake.modified['/a.py'] += 60_000
+        await api_server(fake.application())
+        async with Client('key') as client:
+            app = make_app(client)
+            result = await app.sync_directory(source_tree, delete=True)
+            assert isinstance(result, SyncResult)
+            assert result.ok
+            assert result.uploaded == ['.gitignore', 'src/b.py', 'src/c.py']
+            assert result.deleted == ['old.py']
+            assert result.unchanged == ['a.py']
+            assert fake.files == {
+                '/a.py': b'same',
+                '/.gitignore': b'*.log',
+                '/src/b.py': b'changed',
+                '/src/c.py': b'new',
+            }
+
+            again = await app.sync_directory(source_tree, delete=True)
+            assert again.uploaded == again.deleted == []
+
+    async def test_failures_are_collected(
+        self, api_server, source_tree, monkeypatch
+    ):
+        fake = FakeFiles({})
+        await api_server(fake.application())
+        sent = []
+        create_file = Application.create_file
+
+        async def flaky(self, file, path):
+            sent.append(file)
+            if path == 'src/b.py':
+                raise aiohttp.ClientConnectionError('connection reset')
+            return await create_file(self, file, path)
+
+        monkeypatch.setattr(Application, 'create_file', flaky)
+        async with Client('key') as client:
+            result = await make_app(client).sync_directory(source_tree)
+        assert list(result.errors) == ['src/b.py']
+        assert result.uploaded == ['.gitignore', 'a.py', 'src/c.py']
+        assert all(file.bytes.closed for file in sent)
+
+    async def test_dry_run(self, api_server, source_tree):
+        fake = FakeFiles({'/old.py': b'orphan'})
+        await api_server(fake.application())
+        async with Client('key') as client:
+            result = await make_app(client).sync_directory(
+                source_tree, '/deploy', delete=True, dry_run=True
+            )
+        assert result.deleted == []
+        assert len(result.uploaded) == 4
+        assert fake.calls['create'] == fake.calls['delete'] == 0
+
+
+@pytest.mark.http
+class TestWalk:
+    async def test_walk(self, api_server):
+        files = {
+            f'/node_modules/pkg{i}/lib/index{j}.js': b'x'
+            for i in range(10)
+            for j in range(3)
+        }
+        files['/main.py'] = b'print()'
+        fake = FakeFiles(files, delay=0.02)
+        await api_server(fake.application())
+        async with Client('key') as client:
+            entries = [
+                entry async for entry in make_app(client).walk(
+                    max_concurrency=4
+                )
+            ]
+        assert all(isinstance(entry, FileInfo) for entry in entries)
+        assert {e.path for e in entries if e.type == 'file'} == set(files)
+        assert fake.calls['list'] == 1 + 1 + 10 + 10
+        assert 1 < fake.max_listing <= 4
+
+    async def test_without_concurrency(self, api_server):
+        fake = FakeFiles({'/src/main.py': b'print()'})
+        await api_server(fake.application())
+        async with Client('key') as client:
+            entries = [
+                entry.path
+                async for entry in make_app(client).walk(max_concurrency=0)
+            ]
+        assert sorted(entries) == ['/src', '/src/main.py']
+
+    async def test_stops_early(self, api_server):
+        files = {f'/dir{i}/file.txt': b'x' for i in range(20)}
+        fake = FakeFiles(files, delay=0.02)
+        await api_server(fake.application())
+        async with Client('key') as client:
+            async for entry in make_app(client).walk(max_concurrency=2):
+                assert entry.path == '/dir0'
+                break
+        await asyncio.sleep(0.05)
+        assert fake.calls['list'] < 5
+
+    async def test_missing_root(self, api_server):
+        async def missing(request: web.Request) -> web.Response:
+            return web.json_response(
+                {'status': 'error', 'code': 'FILE_NOT_FOUND'}, status=404
+            )
+
+        application = web.Application()
+        application.router.add_get('/v2/apps/{app_id}/files', missing)
+        await api_server(application)
+        async with Client('key') as client:
+            with pytest.raises(NotFoundError):
+                async for _ in make_app(client).walk('/missing'):
+                    pass
+
+
+INDEXED_FILES = {
+    '/main.py': b'print()',
+    '/src/app.py': b'x' * 100,
+    '/src/api/routes.py': b'x' * 50,
+    '/src/api/schema.json': b'{}',
+    '/static/logo.png': b'x' * 1000,
+}
+
+
+@pytest.mark.http
+class TestRemoteFileIndex:
+    async def test_queries(self, api_server):
+        fake = FakeFiles(INDEXED_FILES)
+        await api_server(fake.application())
+        async with Client('key') as client:
+            index = await make_app(client).file_index()
+        assert isinstance(index, RemoteFileIndex)
+        assert len(index) == 5
+        assert '/src/api/routes.py' in index
+        assert '/src/api' in index
+        assert '/missing.py' not in index
+        info = index.get('/src/app.py')
+        assert info.size == 100
+        assert info.path == '/src/app.py'
+        assert info.lastModified == fake.modified['/src/app.py']
+        assert index.get('/src/nope.py') is None
+        assert index.prefix('/src/app') == ['/src/app.py']
+        assert index.prefix('/src/a') == [
+            '/src/api/routes.py',
+            '/src/api/schema.json',
+            '/src/app.py',
+        ]
+        assert index.prefix('/src/api/') == [
+            '/src/api/routes.py',
+            '/src/api/schema.json',
+        ]
+        assert index.glob('**/*.py') == [
+            '/main.py',
+            '/src/api/routes.py',
+            '/src/app.py',
+        ]
+        assert index.glob('src/*.py') == ['/src/app.py']
+        assert index.glob('src/api/*.json') == ['/src/api/schema.json']
+        assert index.largest(2) == [
+            ('/static/logo.png', 1000),
+            ('/src/app.py', 100),
+        ]
+        assert index.total_size('/src') == 152
+        assert index.total_size() == sum(map(len, INDEXED_FILES.values()))
+        assert {info.path for info in index.files('/src/api')} == {
+            '/src/api/routes.py',
+            '/src/api/schema.json',
+        }
+
+    async def test_subdirectory(self, api_server):
+        await api_server(FakeFiles(INDEXED_FILES).application())
+        async with Client('key') as client:
+            index = await make_app(client).file_index('/src')
+        assert len(index) == 3
+        assert index.largest(1) == [('/src/app.py', 100)]
+        assert index.total_size() == 152
+        assert {info.path for info in index.files()} == {
+            '/src/app.py',
+            '/src/api/routes.py',
+            '/src/api/schema.json',
+        }
+        assert index.glob('*.py') == ['/src/app.py']
+
+    async def test_refresh(self, api_server):
+        fake = FakeFiles(INDEXED_FILES)
+        await api_server(fake.application())
+        async with Client('key') as client:
+            index = await make_app(client).file_index()
+            assert fake.calls['list'] == 4
+
+            fake.calls['list'] = 0
+            await index.refresh()
+            # only the root, whose subdirectories are all unchanged
+            assert fake.calls['list'] == 1
+
+            fake.files['/src/api/new.py'] = b'x' * 10
+            fake.modified['/src/api/new.py'] = time.time() * 1000 + 1000
+            del fake.files['/static/logo.png']
+            fake.calls['list'] = 0
+            await index.refresh()
+            # the root, /src, /src/api and /static, gone from the root
+            assert fake.calls['list'] == 3
+            assert '/src/api/new.py' in index
+            assert '/static/logo.png' not in index
+            assert index.get('/main.py').size == 7
+            assert len(index) == 5
+
+            fake.files['/main.py'] = b'print(1)'
+            fake.calls['list'] = 0
+            await index.refresh(['/src/api'])
+            assert fake.calls['list'] == 3
+            assert index.get('/main.py').size == 8
+
+
+@pytest.mark.http
+class TestFileContentCache:
+    async def test_reads_are_cached(self, api_server):
+        fake = FakeFiles({'/config/app.json': b'{"a": 1}'})
+        await api_server(fake.application())
+        cache = FileContentCache()
+        async with Client('key', file_cache=cache) as client:
+            app = make_app(client)
+            for _ in range(3):
+                content = await app.read_file('/config/app.json')
+                assert content.read() == b'{"a": 1}'
+            assert fake.calls['read'] == 1
+            assert fake.calls['list'] == 3
+            assert cache.hits == 2
+
+            fake.files['/config/app.json'] = b'{"a": 2}'
+            fake.modified['/config/app.json'] += 1000
+            content = await app.read_file('/config/app.json')
+            assert content.read() == b'{"a": 2}'
+            assert fake.calls['read'] == 2
+
+            [info] = await app.files_list('/config')
+            await app.read_file('/config/app.json', info)
+            assert fake.calls['list'] == 5
+            assert fake.calls['read'] == 2
+
+    async def test_listener_skips_cache_hits(self, api_server):
+        fake = FakeFiles({'/config/app.json': b'{"a": 1}'})
+        await api_server(fake.application())
+        responses = []
+        async with Client('key', file_cache=FileContentCache()) as client:
+
+            @client.on_request(endpoint=Endpoint.files_read())
+            async def on_read(response: Response) -> None:
+                responses.append(response)
+
+            for _ in range(2):
+                await client.read_app_file('app', '/config/app.json')
+        assert fake.calls['read'] == 1
+        assert [r.route.endpoint for r in responses] == [Endpoint.files_read()]
+
+    async def test_disk_tier(self, api_server, tmp_path):
+        fake = FakeFiles({'/a.txt': b'a' * 100, '/b.txt': b'b' * 100})
+        await api_server(fake.application())
+        cache = FileContentCache(max_bytes=150, directory=tmp_path)
+        async with Client('key', file_cache=cache) as client:
+            app = make_app(client)
+            await app.read_file('/a.txt')
+            await app.read_file('/b.txt')
+            # a.txt was evicted from memory but is still on disk
+            assert len(cache) == 1
+            assert cache.memory_bytes == 100
+            assert cache.disk_bytes == 200
+            assert (await app.read_file('/a.txt')).read() == b'a' * 100
+            assert fake.calls['read'] == 2
+
+        restarted = FileContentCache(directory=tmp_path, max_disk_bytes=100)
+        assert restarted.disk_bytes == 100
+        async with Client('key', file_cache=restarted) as client:
+            app = make_app(client)
+            # a.txt was the most recently used
+            assert (await app.read_file('/a.txt')).read() == b'a' * 100
+            assert fake.calls['read'] == 2
+            await app.read_file('/b.txt')
+            assert fake.calls['read'] == 3
+        restarted.clear()
+        assert not list(tmp_path.iterdir())
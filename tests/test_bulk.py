@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from squarecloud import BulkItem, BulkResult, Client
+from squarecloud.errors import NotFoundError, SquareException
+
+
+def lifecycle_app(
+    missing: set[str], delay: float = 0.01
+) -> tuple[web.Application, dict]:
+    state = {'calls': [], 'running': 0, 'max_running': 0}
+
+    async def handler(request: web.Request) -> web.Response:
+        app_id = request.match_info['app_id']
+        state['calls'].append((request.match_info['action'], app_id))
+        state['running'] += 1
+        state['max_running'] = max(state['max_running'], state['running'])
+        await asyncio.sleep(delay)
+        state['running'] -= 1
+        if app_id in missing:
+            return web.json_response(
+                {'status': 'error', 'code': 'APP_NOT_FOUND'}, status=404
+            )
+        return web.json_response({'status': 'success'})
+
+    application = web.Application()
+    application.router.add_post('/v2/apps/{app_id}/{action}', handler)
+    return application, state
+
+
+@pytest.mark.http
+class TestBulk:
+    async def test_restart(self, api_server):
+        application, state = lifecycle_app(missing={'app3'})
+        await api_server(application)
+        app_ids = [f'app{i}' for i in range(20)]
+        async with Client('key') as client:
+            result = await client.bulk_restart(app_ids, concurrency=4)
+        assert isinstance(result, BulkResult)
+        assert not result.ok
+        assert set(result.succeeded) == set(app_ids) - {'app3'}
+        assert isinstance(result.failed['app3'], NotFoundError)
+        assert sorted(state['calls']) == sorted(
+            ('restart', app_id) for app_id in app_ids
+        )
+        assert 1 < state['max_running'] <= 4
+
+    async def test_stream(self, api_server):
+        application, state = lifecycle_app(missing=set())
+        await api_server(application)
+        async with Client('key') as client:
+            items = [
+                item
+                async for item in client.bulk('stop', ['a', 'b', 'c'])
+            ]
+        assert all(isinstance(item, BulkItem) and item.ok for item in items)
+        assert {item.app_id for item in items} == {'a', 'b', 'c'}
+        assert {action for action, _ in state['calls']} == {'stop'}
+
+    async def test_custom_operation(self):
+        async def operation(app_id: str) -> str:
+            if app_id == 'bad':
+                raise ValueError(app_id)
+            return app_id.upper()
+
+        async with Client('key') as client:
+            bulk = client.bulk(operation, ['a', 'bad', 'a'])
+            assert len(bulk) == 2
+            result = await bulk
+            assert result.succeeded == {'a': 'A'}
+            assert isinstance(result.failed['bad'], ValueError)
+            with pytest.raises(SquareException):
+                await bulk
+            with pytest.raises(SquareException):
+                client.bulk('delete', ['a'])
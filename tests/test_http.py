@@ -0,0 +1,849 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import time
+import tracemalloc
+import zipfile
+from random import Random
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from squarecloud import (
+    Client,
+    Endpoint,
+    File,
+    RateLimit,
+    Response,
+    ResponseCache,
+    RetryPolicy,
+    Snapshot,
+    StatusData,
+    TransferProgress,
+)
+from squarecloud._internal.archive import DirectoryArchive
+from squarecloud.errors import (
+    ApplicationNotFound,
+    ClientClosed,
+    NotFoundError,
+    RequestError,
+    TooManyRequests,
+)
+from squarecloud.http import HTTPClient
+from squarecloud.http.transfer import READ_SIZE
+from squarecloud.utils import ConfigFile
+
+CALLS = web.AppKey('calls', dict)
+
+STATUS_PAYLOAD = {
+    'status': 'success',
+    'response': {
+        'cpu': '1%',
+        'ram': '20MB',
+        'status': 'running',
+        'running': True,
+        'storage': '1MB',
+        'network': {'total': '0KB', 'now': '0KB'},
+        'uptime': 1,
+    },
+}
+
+
+def status_app(delay: float = 0) -> web.Application:
+    async def status(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response(STATUS_PAYLOAD)
+
+    application = web.Application()
+    application.router.add_get('/v2/apps/{app_id}/status', status)
+    return application
+
+
+@pytest.mark.http
+class TestSession:
+    async def test_session_is_reused(self, api_server):
+        await api_server(status_app())
+        http = HTTPClient('key')
+        await http.fetch_app_status('app')
+        session = http._get_session()
+        await http.fetch_app_status('app')
+        assert http._get_session() is session
+        await http.close()
+        assert http.closed
+
+    async def test_client_context_manager(self, api_server):
+        await api_server(status_app())
+        async with Client('key') as client:
+            assert isinstance(await client.app_status('app'), StatusData)
+        assert client._http.closed
+
+    async def test_aclose_drains_in_flight(self, api_server):
+        await api_server(status_app(delay=0.2))
+        client = Client('key')
+        task = asyncio.create_task(client.app_status('app'))
+        await asyncio.sleep(0.05)
+        assert client._http.in_flight == 1
+        await client.aclose()
+        assert task.done()
+        assert isinstance(task.result(), StatusData)
+
+    async def test_no_session_after_close(self, api_server):
+        await api_server(status_app(delay=0.2))
+        client = Client('key')
+        task = asyncio.create_task(client.app_status('app'))
+        await asyncio.sleep(0.05)
+        closing = asyncio.create_task(client.aclose())
+        await asyncio.sleep(0)
+        with pytest.raises(ClientClosed):
+            await client.app_status('other')
+        await closing
+        assert isinstance(task.result(), StatusData)
+        assert client._http.closed
+
+    async def test_reopens_after_close(self, api_server):
+        await api_server(status_app())
+        client = Client('key')
+        await client.app_status('app')
+        await client.aclose()
+        assert client._http.closed
+        assert isinstance(await client.app_status('app'), StatusData)
+        assert not client._http.closed
+        await client.aclose()
+
+    async def test_new_session_on_another_loop(self, api_server):
+        await api_server(status_app())
+        client = Client('key')
+        await client.app_status('app')
+        session = client._http._get_session()
+        for _ in range(2):
+            # each asyncio.run has its own event loop
+            status = await asyncio.to_thread(
+                asyncio.run, client.app_status('app')
+            )
+            assert isinstance(status, StatusData)
+        assert client._http._get_session() is not session
+        await client.aclose()
+        assert client._http.closed
+
+
+def rate_limited_app(
+    failures: int, headers: dict[str, str] | None = None
+) -> web.Application:
+    calls = {'count': 0}
+
+    async def status(request: web.Request) -> web.Response:
+        calls['count'] += 1
+        if calls['count'] <= failures:
+            return web.json_response(
+                {'status': 'error', 'code': 'RATE_LIMITED'},
+                status=429,
+                headers={'Retry-After': '0.1'},
+            )
+        return web.json_response(STATUS_PAYLOAD, headers=headers)
+
+    application = web.Application()
+    application[CALLS] = calls
+    application.router.add_get('/v2/apps/{app_id}/status', status)
+    return application
+
+
+@pytest.mark.http
+class TestRateLimit:
+    async def test_waits_instead_of_raising(self, api_server):
+        application = rate_limited_app(failures=2)
+        await api_server(application)
+        async with Client('key') as client:
+            assert isinstance(await client.app_status('app'), StatusData)
+        assert application[CALLS]['count'] == 3
+
+    async def test_raises_after_max_retries(self, api_server):
+        await api_server(rate_limited_app(failures=10))
+        async with Client('key', rate_limit=RateLimit(max_retries=1)) as c:
+            with pytest.raises(TooManyRequests):
+                await c.app_status('app')
+
+    async def test_budget_from_headers(self, api_server):
+        headers = {
+            'X-RateLimit-Limit': '10',
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': '0.3',
+        }
+        await api_server(rate_limited_app(failures=0, headers=headers))
+        async with Client('key') as client:
+            await client.app_status('app')
+            assert client.rate_limit.limit == 10
+            assert client.rate_limit.remaining == 0
+            start = time.monotonic()
+            await client.app_status('app')
+            assert time.monotonic() - start >= 0.25
+
+
+def flaky_app(failures: int, status: int = 503) -> web.Application:
+    calls = {'count': 0}
+
+    async def handler(request: web.Request) -> web.Response:
+        calls['count'] += 1
+        if calls['count'] <= failures:
+            return web.Response(status=status, text='unavailable')
+        return web.json_response(STATUS_PAYLOAD)
+
+    application = web.Application()
+    application[CALLS] = calls
+    application.router.add_get('/v2/apps/{app_id}/status', handler)
+    application.router.add_post('/v2/apps/{app_id}/start', handler)
+    return application
+
+
+FAST_RETRY = RetryPolicy(base_delay=0.01, max_delay=0.05)
+
+
+@pytest.mark.http
+class TestRetry:
+    async def test_get_is_retried(self, api_server):
+        application = flaky_app(failures=2)
+        await api_server(application)
+        async with Client('key') as client:
+            client.set_retry_policy(Endpoint.app_status(), FAST_RETRY)
+            await client.app_status('app')
+            assert client._http.last_response.retries == 2
+        assert application[CALLS]['count'] == 3
+
+    async def test_request_timeout_is_retried(self, api_server):
+        application = flaky_app(failures=1, status=408)
+        await api_server(application)
+        async with Client('key') as client:
+            client.set_retry_policy(Endpoint.app_status(), FAST_RETRY)
+            await client.app_status('app')
+            assert client._http.last_response.retries == 1
+        assert application[CALLS]['count'] == 2
+
+    async def test_mutation_is_not_retried(self, api_server):
+        application = flaky_app(failures=1)
+        await api_server(application)
+        async with Client('key') as client:
+            with pytest.raises(RequestError):
+                await client.start_app('app')
+        assert application[CALLS]['count'] == 1
+
+    async def test_mutation_opt_in(self, api_server):
+        application = flaky_app(failures=1)
+        await api_server(application)
+        policies = {'START': FAST_RETRY}
+        async with Client('key', retry_policies=policies) as client:
+            response = await client.start_app('app')
+            assert response.retries == 1
+
+    async def test_gives_up_after_max_retries(self, api_server):
+        application = flaky_app(failures=10)
+        await api_server(application)
+        policy = RetryPolicy(max_retries=2, base_delay=0.01, max_delay=0.01)
+        async with Client('key') as client:
+            client.set_retry_policy(Endpoint.app_status(), policy)
+            with pytest.raises(RequestError):
+                await client.app_status('app')
+        assert application[CALLS]['count'] == 3
+
+
+@pytest.mark.http
+class TestCoalescing:
+    async def test_concurrent_gets_share_one_request(self, api_server):
+        application = flaky_app(failures=0)
+        await api_server(application)
+        async with Client('key') as client:
+            results = await asyncio.gather(
+                *(client.app_status('app') for _ in range(10))
+            )
+            assert all(isinstance(r, StatusData) for r in results)
+            assert client.stats.coalesced == 9
+            assert client.stats.sent == 1
+        assert application[CALLS]['count'] == 1
+
+    async def test_errors_are_shared(self, api_server):
+        application = flaky_app(failures=10)
+        await api_server(application)
+        async with Client('key') as client:
+            client.set_retry_policy(Endpoint.app_status(), None)
+            results = await asyncio.gather(
+                *(client.app_status('app') for _ in range(3)),
+                return_exceptions=True,
+            )
+            assert all(isinstance(r, RequestError) for r in results)
+        assert application[CALLS]['count'] == 1
+
+    async def test_mutations_are_not_coalesced(self, api_server):
+        application = flaky_app(failures=0)
+        await api_server(application)
+        async with Client('key') as client:
+            await asyncio.gather(*(client.start_app('app') for _ in range(3)))
+            assert client.stats.coalesced == 0
+        assert application[CALLS]['count'] == 3
+
+
+def files_app() -> web.Application:
+    calls = {'count': 0}
+
+    async def files(request: web.Request) -> web.Response:
+        calls['count'] += 1
+        if request.query.get('path') == '/slow':
+            await asyncio.sleep(0.1)
+        if request.query.get('path') == '/missing':
+            return web.json_response(
+                {'status': 'error', 'code': 'FILE_NOT_FOUND'}, status=404
+            )
+        if request.query.get('path') == '/invalid':
+            return web.json_response(
+                {'status': 'error', 'code': 'INVALID_PATH'}, status=400
+            )
+        return web.json_response({'status': 'success', 'response': []})
+
+    async def mutation(request: web.Request) -> web.Response:
+        return web.json_response({'status': 'success'})
+
+    application = web.Application()
+    application[CALLS] = calls
+    application.router.add_get('/v2/apps/{app_id}/status', files)
+    application.router.add_get('/v2/apps/{app_id}/files', files)
+    application.router.add_delete('/v2/apps/{app_id}/files', mutation)
+    application.router.add_post('/v2/apps/{app_id}/restart', mutation)
+    return application
+
+
+@pytest.mark.http
+class TestResponseCache:
+    async def test_reads_are_cached(self, api_server):
+        application = files_app()
+        await api_server(application)
+        cache = ResponseCache()
+        async with Client('key', response_cache=cache) as client:
+            await client.app_files_list('app', '/')
+            await client.app_files_list('app', '/')
+            assert cache.hits == 1
+        assert application[CALLS]['count'] == 1
+
+    async def test_not_found_is_cached(self, api_server):
+        application = files_app()
+        await api_server(application)
+        async with Client('key', response_cache=ResponseCache()) as client:
+            for _ in range(2):
+                with pytest.raises(NotFoundError):
+                    await client.app_files_list('app', '/missing')
+        assert application[CALLS]['count'] == 1
+
+    async def test_errors_are_not_cached(self, api_server):
+        application = files_app()
+        await api_server(application)
+        cache = ResponseCache()
+        async with Client('key', response_cache=cache) as client:
+            for _ in range(2):
+                with pytest.raises(RequestError):
+                    await client.app_files_list('app', '/invalid')
+        assert application[CALLS]['count'] == 2
+        assert len(cache) == 0
+
+    async def test_read_in_flight_during_mutation_is_dropped(
+        self, api_server
+    ):
+        application = files_app()
+        await api_server(application)
+        cache = ResponseCache()
+        async with Client('key', response_cache=cache) as client:
+            read = asyncio.create_task(client.app_files_list('app', '/slow'))
+            await asyncio.sleep(0.02)
+            await client.delete_app_file('app', '/slow/main.py')
+            await read
+            assert len(cache) == 0
+            await client.app_files_list('app', '/slow')
+            assert application[CALLS]['count'] == 2
+            assert len(cache) == 1
+
+    async def test_mutations_invalidate(self, api_server):
+        application = files_app()
+        await api_server(application)
+        cache = ResponseCache()
+        async with Client('key', response_cache=cache) as client:
+            await client.app_files_list('app', '/')
+            await client.app_files_list('app', '/src')
+            await client.delete_app_file('app', '/src/main.py')
+            await client.app_files_list('app', '/')
+            await client.app_files_list('app', '/src')
+            assert application[CALLS]['count'] == 3
+
+            await client._http.fetch_app_status('app')
+            await client.restart_app('app')
+            await client._http.fetch_app_status('app')
+            assert application[CALLS]['count'] == 5
+
+    async def test_lru_bound(self, api_server):
+        await api_server(files_app())
+        cache = ResponseCache(max_entries=2)
+        async with Client('key', response_cache=cache) as client:
+            for path in ('/a', '/b', '/c'):
+                await client.app_files_list('app', path)
+        assert len(cache) == 2
+
+
+@pytest.mark.http
+class TestJSONCodec:
+    async def test_custom_codec(self, api_server):
+        received = {}
+
+        async def envs(request: web.Request) -> web.Response:
+            received['body'] = await request.json()
+            return web.json_response({'status': 'success', 'response': {}})
+
+        application = web.Application()
+        application.router.add_post('/v2/apps/{app_id}/envs', envs)
+        await api_server(application)
+        calls = {'loads': 0, 'dumps': 0}
+
+        def loads(raw: bytes):
+            calls['loads'] += 1
+            return json.loads(raw)
+
+        def dumps(obj) -> str:
+            calls['dumps'] += 1
+            return json.dumps(obj)
+
+        async with Client('key', json_loads=loads, json_dumps=dumps) as c:
+            await c.set_app_envs('app', {'KEY': 'value'})
+        assert received['body'] == {'envs': {'KEY': 'value'}}
+        assert calls == {'loads': 1, 'dumps': 1}
+
+
+def snapshot_app(content: bytes, ranges: bool = True) -> web.Application:
+    calls = {'count': 0}
+
+    async def snapshot(request: web.Request) -> web.Response:
+        calls['count'] += 1
+        return web.Response(body=content)
+
+    async def ranged(request: web.Request) -> web.Response:
+        calls['count'] += 1
+        start, end = request.http_range.start, request.http_range.stop
+        if start is None:
+            return web.Response(body=content)
+        end = min(end or len(content), len(content))
+        return web.Response(
+            body=content[start:end],
+            status=206,
+            headers={
+                'Content-Range': f'bytes {start}-{end - 1}/{len(content)}'
+            },
+        )
+
+    application = web.Application()
+    application[CALLS] = calls
+    application.router.add_get(
+        '/snapshots/app.zip', ranged if ranges else snapshot
+    )
+    return application
+
+
+def zip_content() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        zip_file.writestr('main.py', os.urandom(50_000))
+    return buffer.getvalue()
+
+
+@pytest.mark.http
+class TestSnapshotDownload:
+    async def test_ranged_download(self, api_server, tmp_path):
+        content = zip_content()
+        application = snapshot_app(content)
+        server = await api_server(application)
+        url = str(server.make_url('/snapshots/app.zip')) + '?signature=1'
+        seen: list[TransferProgress] = []
+        snapshot = Snapshot(url=url, key='key')
+        zip_file = await snapshot.download(
+            str(tmp_path), chunk_size=8192, progress=seen.append
+        )
+        assert isinstance(zip_file, zipfile.ZipFile)
+        assert (tmp_path / 'app.zip').read_bytes() == content
+        assert seen[-1].transferred == seen[-1].total == len(content)
+        chunks = -(-len(content) // 8192)
+        assert application[CALLS]['count'] == chunks + 1
+        assert not list(tmp_path.glob('*.part*'))
+
+    async def test_fetch_snapshot_content(self, api_server):
+        content = zip_content()
+        server = await api_server(snapshot_app(content))
+        url = str(server.make_url('/snapshots/app.zip'))
+        with pytest.deprecated_call():
+            assert await HTTPClient.fetch_snapshot_content(url) == content
+
+    async def test_resume(self, api_server, tmp_path):
+        content = zip_content()
+        application = snapshot_app(content)
+        server = await api_server(application)
+        url = str(server.make_url('/snapshots/app.zip'))
+        dest = tmp_path / 'app.zip'
+        half = len(content) // 8192 // 2
+        (tmp_path / 'app.zip.part').write_bytes(content[: half * 8192])
+        (tmp_path / 'app.zip.part.json').write_text(
+            json.dumps(
+                {
+                    'total': len(content),
+                    'chunk_size': 8192,
+                    'done': list(range(half)),
+                }
+            )
+        )
+        await HTTPClient.download_snapshot(url, str(dest), chunk_size=8192)
+        assert dest.read_bytes() == content
+        chunks = -(-len(content) // 8192)
+        assert application[CALLS]['count'] == chunks - half + 1
+
+    async def test_failed_chunk_keeps_the_written_ones(
+        self, api_server, tmp_path
+    ):
+        content = zip_content()
+        failing = 3 * 8192
+
+        async def ranged(request: web.Request) -> web.Response:
+            start, end = request.http_range.start, request.http_range.stop
+            if start == failing:
+                await asyncio.sleep(0.05)
+                return web.Response(status=500)
+            if start > failing:
+                # still running when the failure happens
+                await asyncio.sleep(0.5)
+            end = min(end or len(content), len(content))
+            return web.Response(
+                body=content[start:end],
+                status=206,
+                headers={
+                    'Content-Range': f'bytes {start}-{end - 1}/{len(content)}'
+                },
+            )
+
+        application = web.Application()
+        application.router.add_get('/snapshots/app.zip', ranged)
+        server = await api_server(application)
+        url = str(server.make_url('/snapshots/app.zip'))
+        dest = tmp_path / 'app.zip'
+        with pytest.raises(aiohttp.ClientResponseError):
+            await HTTPClient.download_snapshot(
+                url, str(dest), chunk_size=8192, concurrency=8
+            )
+        state = json.loads((tmp_path / 'app.zip.part.json').read_text())
+        written = (tmp_path / 'app.zip.part').read_bytes()
+        assert state['done'] == [0, 1, 2]
+        for index in state['done']:
+            chunk = slice(index * 8192, (index + 1) * 8192)
+            assert written[chunk] == content[chunk]
+
+    async def test_without_ranges(self, api_server, tmp_path):
+        content = zip_content()
+        application = snapshot_app(content, ranges=False)
+        server = await api_server(application)
+        url = str(server.make_url('/snapshots/app.zip'))
+        dest = tmp_path / 'app.zip'
+        size = await HTTPClient.download_snapshot(url, str(dest))
+        assert size == len(content)
+        assert dest.read_bytes() == content
+        assert application[CALLS]['count'] == 1
+
+
+RECEIVED = web.AppKey('received', dict)
+
+
+def commit_app(keep: bool = False) -> web.Application:
+    received = {'size': 0, 'digest': None, 'filename': None, 'body': b''}
+
+    async def commit(request: web.Request) -> web.Response:
+        reader = await request.multipart()
+        part = await reader.next()
+        digest = hashlib.sha256()
+        while chunk := await part.read_chunk():
+            received['size'] += len(chunk)
+            digest.update(chunk)
+            if keep:
+                received['body'] += chunk
+        received['digest'] = digest.hexdigest()
+        received['filename'] = part.filename
+        return web.json_response({'status': 'success'})
+
+    application = web.Application()
+    application[RECEIVED] = received
+    application.router.add_post('/v2/apps/{app_id}/commit', commit)
+    return application
+
+
+class ReadSpy(io.BufferedReader):
+    sizes: list[int]
+
+    def read(self, size: int | None = -1) -> bytes:
+        self.sizes.append(size)
+        return super().read(size)
+
+
+@pytest.mark.http
+class TestUpload:
+    async def test_streams_from_path(self, api_server, tmp_path):
+        content = os.urandom(16 * 2**20)
+        path = tmp_path / 'app.zip'
+        path.write_bytes(content)
+        application = commit_app()
+        await api_server(application)
+        seen: list[TransferProgress] = []
+        async with Client('key') as client:
+            file = File(str(path))
+            tracemalloc.start()
+            await client.commit('app', file, progress=seen.append)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        received = application[RECEIVED]
+        assert received['filename'] == 'app.zip'
+        assert received['size'] == len(content)
+        assert received['digest'] == hashlib.sha256(content).hexdigest()
+        assert seen[-1].transferred == seen[-1].total == len(content)
+        assert peak < len(content) // 4
+
+    async def test_buffer_is_read_in_chunks(self, api_server, tmp_path):
+        path = tmp_path / 'app.zip'
+        path.write_bytes(os.urandom(2**20))
+        application = commit_app()
+        await api_server(application)
+        spy = ReadSpy(io.FileIO(path))
+        spy.sizes = []
+        async with Client('key') as client:
+            await client.commit('app', File(spy, filename='app.zip'))
+        assert application[RECEIVED]['size'] == 2**20
+        assert all(0 < size <= READ_SIZE for size in spy.sizes)
+        assert not spy.closed
+
+    async def test_bandwidth_cap(self, api_server):
+        await api_server(commit_app())
+        file = File(io.BytesIO(os.urandom(2**18)), filename='app.zip')
+        async with Client('key') as client:
+            start = time.monotonic()
+            await client.commit('app', file, max_bandwidth=2**20)
+            assert time.monotonic() - start >= 0.2
+
+    async def test_from_directory(self, api_server, tmp_path):
+        tree = {
+            'main.py': 'print("ok")',
+            'requirements.txt': 'discord.py',
+            'squarecloud.app': 'MAIN=old.py',
+            'debug.log': '',
+            'keep.log': 'kept',
+            'build/out.bin': '',
+            'src/util.py': '',
+            'src/secret.txt': '',
+            'src/.gitignore': 'secret.txt',
+            '.git/HEAD': '',
+            '.gitignore': '*.log\n!keep.log\nbuild/\n',
+        }
+        for name, content in tree.items():
+            (tmp_path / name).parent.mkdir(exist_ok=True)
+            (tmp_path / name).write_text(content)
+        config = ConfigFile(display_name='test', main='main.py', memory=256)
+        file = File.from_directory(tmp_path, config, ignore=['requirements.txt'])
+        application = commit_app(keep=True)
+        await api_server(application)
+        async with Client('key') as client:
+            await client.commit('app', file)
+        received = application[RECEIVED]
+        assert received['filename'] == f'{tmp_path.name}.zip'
+        with zipfile.ZipFile(io.BytesIO(received['body'])) as zip_file:
+            assert sorted(zip_file.namelist()) == [
+                '.gitignore',
+                'keep.log',
+                'main.py',
+                'squarecloud.app',
+                'src/.gitignore',
+                'src/util.py',
+            ]
+            assert zip_file.read('squarecloud.app').decode() == (
+                config.content()
+            )
+
+
+class TestDirectoryArchive:
+    def test_compression_level(self, tmp_path):
+        random = Random(0)
+        words = [f'word{number}' for number in range(500)]
+        (tmp_path / 'main.py').write_text(
+            ' '.join(random.choices(words, k=50_000))
+        )
+        config = ConfigFile(display_name='test', main='main.py', memory=256)
+        sizes = {}
+        for level in (1, 9):
+            archive = DirectoryArchive(tmp_path, config, compresslevel=level)
+            raw = b''.join(archive.chunks())
+            with zipfile.ZipFile(io.BytesIO(raw)) as zip_file:
+                sizes[level] = zip_file.getinfo('main.py').compress_size
+        assert sizes[9] < sizes[1]
+
+    def test_from_directory_has_no_buffer(self, tmp_path):
+        config = ConfigFile(display_name='test', main='main.py', memory=256)
+        file = File.from_directory(tmp_path, config)
+        assert file.bytes is None
+        assert file.path is None
+        assert file.filename == f'{tmp_path.name}.zip'
+        assert file.archive.path == str(tmp_path)
+
+
+@pytest.mark.http
+class TestCreateFile:
+    async def test_content_is_streamed_as_byte_array(self, api_server):
+        received = {}
+
+        async def create(request: web.Request) -> web.Response:
+            received['length'] = request.content_length
+            received['raw'] = await request.read()
+            return web.json_response({'status': 'success'})
+
+        application = web.Application(client_max_size=2**23)
+        application.router.add_put('/v2/apps/{app_id}/files', create)
+        await api_server(application)
+        content = os.urandom(300_000)
+        async with Client('key') as client:
+            await client.create_app_file(
+                'app', File(io.BytesIO(content), filename='a.bin'), 'a.bin'
+            )
+        body = json.loads(received['raw'])
+        assert received['length'] == len(received['raw'])
+        assert body == {'path': '/a.bin', 'content': list(content)}
+
+
+@pytest.mark.http
+class TestReadFile:
+    async def test_byte_array_is_decoded_to_bytes(self, api_server):
+        content = os.urandom(300_000)
+
+        async def read(request: web.Request) -> web.Response:
+            return web.json_response(
+                {
+                    'status': 'success',
+                    'response': {'type': 'Buffer', 'data': list(content)},
+                }
+            )
+
+        application = web.Application()
+        application.router.add_get('/v2/apps/{app_id}/files/content', read)
+        await api_server(application)
+        async with Client('key') as client:
+            file = await client.read_app_file('app', '/a.bin')
+            response = client._http.last_response
+        assert file.getvalue() == content
+        assert response.response == {'type': 'Buffer', 'data': content}
+
+    async def test_custom_decoder_reads_the_byte_array(self, api_server):
+        content = os.urandom(300_000)
+
+        async def read(request: web.Request) -> web.Response:
+            return web.json_response(
+                {
+                    'status': 'success',
+                    'response': {'type': 'Buffer', 'data': list(content)},
+                }
+            )
+
+        application = web.Application()
+        application.router.add_get('/v2/apps/{app_id}/files/content', read)
+        await api_server(application)
+        decoded = []
+
+        def loads(raw: bytes):
+            decoded.append(len(raw))
+            return json.loads(raw)
+
+        async with Client('key', json_loads=loads) as client:
+            file = await client.read_app_file('app', '/a.bin')
+        assert file.getvalue() == content
+        # the chunks of the array and the rest of the body
+        assert len(decoded) > 2
+
+
+def accounts_app(count: int) -> web.Application:
+    applications = [
+        {
+            'id': f'app{i}',
+            'name': f'app {i}',
+            'cluster': 'florida-1',
+            'ram': 256,
+            'lang': 'python',
+            'created_at': '2024-01-01T00:00:00Z',
+            'domain': None,
+            'custom': None,
+            'desc': None,
+        }
+        for i in range(count)
+    ]
+    by_id = {application['id']: application for application in applications}
+    calls = {'user': 0, 'app_data': 0}
+
+    async def user(_request: web.Request) -> web.Response:
+        calls['user'] += 1
+        return web.json_response(
+            {
+                'status': 'success',
+                'response': {
+                    'user': {'id': 'u', 'name': 'user', 'plan': None},
+                    'applications': applications,
+                },
+            }
+        )
+
+    async def app_data(request: web.Request) -> web.Response:
+        calls['app_data'] += 1
+        if (data := by_id.get(request.match_info['app_id'])) is None:
+            return web.json_response(
+                {'status': 'error', 'code': 'APP_NOT_FOUND'}, status=404
+            )
+        payload = dict(data, owner='u')
+        payload['language'] = {'name': payload.pop('lang'), 'version': '3'}
+        return web.json_response({'status': 'success', 'response': payload})
+
+    application = web.Application()
+    application[CALLS] = calls
+    application.router.add_get('/v2/users/me', user)
+    application.router.add_get('/v2/apps/{app_id}', app_data)
+    return application
+
+
+@pytest.mark.http
+class TestAppLookup:
+    async def test_app_data(self, api_server):
+        application = accounts_app(1000)
+        await api_server(application)
+        async with Client('key') as client:
+            app = await client.app('app500')
+            assert (app.id, app.name, app.lang) == ('app500', 'app 500', 'python')
+            with pytest.raises(ApplicationNotFound):
+                await client.app('missing')
+        assert application[CALLS] == {'user': 0, 'app_data': 2}
+
+    async def test_index(self, api_server):
+        application = accounts_app(10)
+        await api_server(application)
+        async with Client('key', index_apps=True) as client:
+            apps = [await client.app(f'app{i}') for i in range(10)]
+            assert [app.id for app in apps] == [f'app{i}' for i in range(10)]
+            assert application[CALLS] == {'user': 1, 'app_data': 0}
+            assert len(await client.all_apps()) == 10
+            assert application[CALLS] == {'user': 2, 'app_data': 0}
+            with pytest.raises(ApplicationNotFound):
+                await client.app('missing')
+            assert application[CALLS] == {'user': 2, 'app_data': 1}
+
+    async def test_index_hits_do_not_notify(self, api_server):
+        await api_server(accounts_app(10))
+        notified = []
+        async with Client('key', index_apps=True) as client:
+
+            @client.on_request(endpoint=Endpoint.app_data())
+            async def on_app_data(response: Response) -> None:
+                notified.append(response.response['id'])
+
+            await client.app('app0')
+            # not indexed, requested through APP_DATA
+            del client._app_index['app1']
+            await client.app('app1')
+            await client.app('app2')
+        assert notified == ['app1']
@@ -0,0 +1,133 @@
+import logging
+
+import pytest
+from pydantic import BaseModel
+
+from squarecloud.http import Response
+from squarecloud.http.endpoints import Endpoint, Router
+from squarecloud.listeners import Listener, ListenerConfig
+from squarecloud.listeners.request_listener import RequestListenerManager
+
+ENDPOINT = Endpoint.app_status()
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+class Car(BaseModel):
+    year: int
+
+
+def response() -> Response:
+    return Response(
+        {'status': 'success', 'response': {}}, Router(ENDPOINT, app_id='app')
+    )
+
+
+async def notify(callback, extra=None, **config):
+    manager = RequestListenerManager()
+    manager.include_listener(Listener(ENDPOINT, callback, **config))
+    return await manager.notify(ENDPOINT, response(), extra)
+
+
+class TestDispatchPlan:
+    def test_compiled_once(self):
+        async def callback(response, extra: Person | Car):
+            pass
+
+        def other(extra: Person | Car):
+            pass
+
+        plan = Listener(ENDPOINT, callback).plan
+        assert plan.arguments == {'response', 'extra'}
+        assert plan.is_coroutine
+        assert plan.extra_models == "['Person', 'Car']"
+        assert Listener(ENDPOINT, other).plan.extra_adapter is (
+            plan.extra_adapter
+        )
+        assert not Listener(ENDPOINT, other).plan.is_coroutine
+
+    def test_without_models(self):
+        def callback(extra: dict):
+            pass
+
+        plan = Listener(ENDPOINT, callback).plan
+        assert plan.extra_adapter is None
+        assert plan.cast_extra({}) == (True, {})
+
+
+class TestNotify:
+    async def test_binds_the_parameters(self):
+        def callback(response):
+            return response.status
+
+        assert await notify(callback) == 'success'
+
+        async def without_parameters():
+            return 1
+
+        assert await notify(without_parameters) == 1
+
+    async def test_casts_extra(self):
+        async def callback(extra: Person):
+            return extra
+
+        assert await notify(callback, {'name': 'Jhon', 'age': 18}) == (
+            Person(name='Jhon', age=18)
+        )
+        assert await notify(callback, {'name': 'Jhon'}) is None
+
+    async def test_union_is_tried_from_left_to_right(self):
+        async def callback(extra: Car | Person | dict):
+            return extra
+
+        both = {'name': 'Jhon', 'age': 18, 'year': 1969}
+        assert await notify(callback, both) == Car(year=1969)
+        assert await notify(callback, {'name': 'Jhon', 'age': 18}) == (
+            Person(name='Jhon', age=18)
+        )
+        assert await notify(callback, {'other': 1}) is None
+
+    async def test_force_raise(self):
+        def callback():
+            raise ValueError
+
+        assert await notify(callback) is None
+        with pytest.raises(ValueError):
+            await notify(callback, config=ListenerConfig(force_raise=True))
+
+    async def test_logging_is_lazy(self):
+        formatted = []
+
+        class Result:
+            def __str__(self) -> str:
+                formatted.append(self)
+                return 'result'
+
+        def callback():
+            return Result()
+
+        logger = logging.getLogger('squarecloud')
+        level = logger.level
+        try:
+            logger.setLevel(logging.WARNING)
+            await notify(callback)
+            assert not formatted
+            logger.setLevel(logging.INFO)
+            await notify(callback)
+            assert formatted
+        finally:
+            logger.setLevel(level)
+
+
+class TestCastToPydanticModel:
+    def test_deprecated_wrapper(self):
+        values = {'name': 'Jhon', 'age': 18}
+        with pytest.deprecated_call():
+            cast = RequestListenerManager.cast_to_pydantic_model
+            assert cast(Person, values) == Person(**values)
+            assert cast(Car | Person, values) == Person(**values)
+            assert cast(Car, values) is None
+            assert cast(dict, values) is values
@@ -0,0 +1,137 @@
+import pytest
+from aiohttp import web
+
+from squarecloud import Client, LogHistory
+from squarecloud._internal.logs import LogTail, overlap
+
+from .test_app_files import make_app
+
+
+class FakeLogs:
+    """Stand-in for the logs endpoint, serving one window per poll"""
+
+    def __init__(self, windows: list[str]) -> None:
+        self.windows = windows
+        self.polls = 0
+
+    def application(self) -> web.Application:
+        application = web.Application()
+        application.router.add_get('/v2/apps/{app_id}/logs', self.logs)
+        return application
+
+    async def logs(self, _request: web.Request) -> web.Response:
+        window = self.windows[min(self.polls, len(self.windows) - 1)]
+        self.polls += 1
+        return web.json_response(
+            {'status': 'success', 'response': {'logs': window}}
+        )
+
+
+class TestLogTail:
+    def test_overlap(self):
+        assert overlap(['a', 'b', 'c'], ['b', 'c', 'd']) == 2
+        assert overlap(['a', 'b'], ['c', 'd']) == 0
+        assert overlap([], ['a']) == 0
+        assert overlap(['x', 'a', 'a'], ['a', 'a', 'a']) == 2
+        lines = [f'line {i}' for i in range(10_000)]
+        assert overlap(lines, lines[3_000:] + ['new']) == 7_000
+
+    def test_sliding_window(self):
+        tail = LogTail()
+        assert tail.update('a\nb\nc\n') == ['a', 'b', 'c']
+        assert tail.update('a\nb\nc\n') == []
+        assert tail.update('a\nb\nc\nd\n') == ['d']
+        # the window dropped its first lines
+        assert tail.update('c\nd\ne\nf\n') == ['e', 'f']
+        assert tail.update('x\ny\n') == ['x', 'y']
+
+    def test_pending_line(self):
+        tail = LogTail()
+        assert tail.update('a\nloading') == ['a']
+        assert tail.update('a\nloading...') == []
+        assert tail.update('a\nloading...') == ['loading...']
+        assert tail.update('a\nloading...\nb\n') == ['b']
+
+
+@pytest.mark.http
+class TestTailLogs:
+    async def test_tail(self, api_server):
+        fake = FakeLogs(
+            ['start\n', 'start\n', 'start\nready\n', 'ready\nrequest 1\n']
+        )
+        await api_server(fake.application())
+        async with Client('key') as client:
+            lines = []
+            async for line in make_app(client).tail_logs(
+                interval=0.01, min_interval=0.01
+            ):
+                lines.append(line)
+                if len(lines) == 3:
+                    break
+        assert lines == ['start', 'ready', 'request 1']
+        assert fake.polls == 4
+
+    async def test_skip_existing(self, api_server):
+        fake = FakeLogs(['old\n', 'old\nnew\n'])
+        await api_server(fake.application())
+        async with Client('key') as client:
+            async for line in make_app(client).tail_logs(
+                interval=0.01, min_interval=0.01, include_existing=False
+            ):
+                assert line == 'new'
+                break
+
+
+class TestLogHistory:
+    def test_deduplicates_windows(self):
+        history = LogHistory()
+        assert history.add('a\nb\n', timestamp=1) == 2
+        assert history.add('a\nb\nc\n', timestamp=2) == 1
+        assert history.add('b\nc\nd\n', timestamp=3) == 1
+        assert len(history) == 4
+        assert [line for _, line in history.query()] == ['a', 'b', 'c', 'd']
+
+    @pytest.mark.parametrize('in_file', [False, True])
+    def test_queries_and_eviction(self, tmp_path, in_file):
+        history = LogHistory(
+            max_bytes=4096,
+            path=tmp_path / 'logs.bin' if in_file else None,
+            block_size=1024,
+        )
+        for second in range(200):
+            history.extend(
+                [f'{second} request {i} {second * i:x}' for i in range(10)],
+                timestamp=second,
+            )
+        # the compressed blocks are bounded, the oldest lines evicted
+        assert history.stored_bytes <= 4096
+        kept = list(history.query())
+        assert len(kept) == len(history) < 2000
+        assert kept[-1][1] == '199 request 9 6ff'
+        assert [kept[0][0].timestamp()] * 10 == [
+            moment.timestamp() for moment, _ in kept[:10]
+        ]
+
+        ranged = list(history.query(start=190, end=191.5))
+        assert len(ranged) == 20
+        assert {moment.timestamp() for moment, _ in ranged} == {190, 191}
+        assert [line for _, line in history.query(contains=' 6ff')] == [
+            '199 request 9 6ff'
+        ]
+        history.close()
+        if in_file:
+            assert (tmp_path / 'logs.bin').stat().st_size <= 2 * 4096
+
+
+@pytest.mark.http
+class TestAppLogHistory:
+    async def test_logs_feed_history(self, api_server):
+        fake = FakeLogs(['a\nb\n', 'b\nc\n'])
+        await api_server(fake.application())
+        async with Client('key') as client:
+            app = make_app(client)
+            history = app.enable_log_history(max_bytes=2**16)
+            assert app.log_history is history
+            await app.logs()
+            await app.logs()
+        assert [line for _, line in history.query()] == ['a', 'b', 'c']
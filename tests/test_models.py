@@ -0,0 +1,107 @@
+import dataclasses
+from datetime import UTC, datetime
+
+import pytest
+
+from squarecloud._internal.models import decode, slots_dataclass
+from squarecloud.data import AppData, DomainAnalytics
+
+
+@slots_dataclass
+class Plan:
+    name: str
+    memory: dict
+
+
+@slots_dataclass
+class Account:
+    id: str
+    ram: float
+    plan: Plan
+    created_at: datetime
+    history: list[Plan] = dataclasses.field(default_factory=list)
+    email: str | None = None
+
+
+class TestSlotsBackend:
+    def test_conversions(self):
+        account = Account(
+            id='1',
+            ram=256,
+            plan={'name': 'pro', 'memory': {}},
+            created_at='2024-01-01T00:00:00Z',
+            history=[{'name': 'free', 'memory': {}, 'unknown': 1}],
+            unknown='ignored',
+        )
+        assert account.ram == 256.0
+        assert isinstance(account.ram, float)
+        assert account.plan == Plan('pro', {})
+        assert account.created_at == datetime(2024, 1, 1, tzinfo=UTC)
+        assert account.history == [Plan('free', {})]
+        assert account.email is None
+        assert not hasattr(account, '__dict__')
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            account.id = '2'
+
+    def test_defaults_are_not_shared(self):
+        first = Account('1', 1.0, Plan('a', {}), datetime.now())
+        second = Account('2', 1.0, Plan('a', {}), datetime.now())
+        assert first.history == second.history == []
+        assert first.history is not second.history
+
+    def test_decode(self):
+        raw = b'{"name": "pro", "memory": {"limit": 1}, "unknown": null}'
+        assert decode(Plan, raw) == Plan('pro', {'limit': 1})
+
+
+class TestModels:
+    def test_from_json(self):
+        app = AppData.from_json(
+            b'{"id": "a", "name": "app", "cluster": "c", "ram": 256,'
+            b' "created_at": "2024-01-01T00:00:00Z", "lang": "python",'
+            b' "owner": "u"}'
+        )
+        assert app.ram == 256.0
+        assert app.created_at.year == 2024
+        assert app.to_dict()['lang'] == 'python'
+
+    def test_from_dict_ignores_unknown_keys(self):
+        app = AppData.from_dict(
+            {
+                'id': 'a',
+                'name': 'app',
+                'cluster': 'c',
+                'ram': 256,
+                'created_at': '2024-01-01T00:00:00Z',
+                'lang': 'python',
+                'owner': 'u',
+                'unknown': 1,
+            }
+        )
+        assert app.id == 'a'
+        assert not hasattr(app, 'unknown')
+
+    def test_nested(self):
+        row = {'visits': 1, 'requests': 2, 'bytes': 3, 'date': '2024-01-01'}
+        analytics = DomainAnalytics.from_dict(
+            {
+                'visits': [row],
+                **{
+                    name: [dict(row, type=name)]
+                    for name in (
+                        'countries',
+                        'devices',
+                        'os',
+                        'browsers',
+                        'protocols',
+                        'methods',
+                        'paths',
+                        'referers',
+                        'providers',
+                    )
+                },
+            }
+        )
+        assert isinstance(analytics.countries[0], DomainAnalytics.Countries)
+        assert analytics.countries[0].type == 'countries'
+        assert analytics.visits[0].date_time == datetime(2024, 1, 1)
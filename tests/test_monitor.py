@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from squarecloud import Client, Monitor, StatusEvent
+from squarecloud.http.endpoints import Endpoint
+from squarecloud.monitor import parse_megabytes
+
+
+def status(app_id: str, running: bool = True, ram: str = '100MB') -> dict:
+    return {'id': app_id, 'running': running, 'cpu': '1%', 'ram': ram}
+
+
+def statuses_app(polls: list[list[dict]]) -> tuple[web.Application, list]:
+    requests = []
+
+    async def handler(_request: web.Request) -> web.Response:
+        response = polls[min(len(requests), len(polls) - 1)]
+        requests.append(response)
+        return web.json_response({'status': 'success', 'response': response})
+
+    application = web.Application()
+    application.router.add_get('/v2/apps/status', handler)
+    return application, requests
+
+
+def test_parse_megabytes():
+    assert parse_megabytes('512MB') == 512
+    assert parse_megabytes('1.5GB') == 1536
+    assert parse_megabytes('256') == 256
+    assert parse_megabytes(None) is None
+
+
+@pytest.mark.http
+class TestMonitor:
+    async def test_events(self, api_server):
+        application, requests = statuses_app(
+            [
+                [status('a'), status('b'), status('c')],
+                [
+                    status('a', running=False),
+                    status('b', ram='600MB'),
+                    status('d'),
+                ],
+            ]
+        )
+        await api_server(application)
+        async with Client('key') as client:
+            monitor = client.monitor(ram_threshold=512)
+            assert isinstance(monitor, Monitor)
+            assert await monitor.poll() == []
+            events = await monitor.poll()
+        assert len(requests) == 2
+        assert all(isinstance(event, StatusEvent) for event in events)
+        assert sorted((e.kind, e.app_id) for e in events) == [
+            ('added', 'd'),
+            ('ram_above', 'b'),
+            ('removed', 'c'),
+            ('stopped', 'a'),
+        ]
+        stopped = next(e for e in events if e.kind == 'stopped')
+        assert stopped.previous.running
+        assert not stopped.current.running
+
+    async def test_listener_and_queue(self, api_server):
+        application, requests = statuses_app(
+            [[status('a')], [status('a')], [status('a', running=False)]]
+        )
+        await api_server(application)
+        received = []
+        async with Client('key') as client:
+
+            @client.on_request(Endpoint.all_apps_status())
+            async def on_change(extra):
+                received.extend(extra)
+
+            monitor = client.monitor(interval=0.01, min_interval=0.01)
+            queue: asyncio.Queue[StatusEvent] = asyncio.Queue()
+            task = asyncio.create_task(monitor.run(queue))
+            event = await asyncio.wait_for(queue.get(), 1)
+            task.cancel()
+        assert (event.kind, event.app_id) == ('stopped', 'a')
+        assert received == [event]
+        assert len(requests) == 3
+
+    async def test_adaptive_interval(self, api_server):
+        application, _ = statuses_app([[status('a')]])
+        await api_server(application)
+        async with Client('key') as client:
+            monitor = client.monitor(
+                interval=0.01, min_interval=0.01, max_interval=0.02
+            )
+            task = asyncio.create_task(monitor.run(asyncio.Queue()))
+            await asyncio.sleep(0.1)
+            task.cancel()
+        assert monitor.interval == 0.02
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+from squarecloud import Client
+from squarecloud._internal.decorators import validate
+
+
+class Inner:
+    def __init__(self, validation: str) -> None:
+        self.validation = validation
+
+    @validate
+    async def double(self, value: int) -> int:
+        return value * 2
+
+
+class Outer:
+    def __init__(self, inner: Inner) -> None:
+        self.inner = inner
+
+    @property
+    def validation(self) -> str:
+        return self.inner.validation
+
+    @validate
+    async def double(self, value: str) -> int:
+        # passes a str where Inner expects an int
+        return await self.inner.double(value)
+
+
+@validate
+def parse(value: int) -> int:
+    return value
+
+
+class TestValidation:
+    async def test_full_validates_every_call(self):
+        outer = Outer(Inner('full'))
+        assert await outer.inner.double('2') == 4
+        with pytest.raises(ValidationError):
+            await outer.double('x')
+
+    async def test_boundary_validates_the_outermost_call(self):
+        outer = Outer(Inner('boundary'))
+        assert await outer.double('x') == 'xx'
+        with pytest.raises(ValidationError):
+            await outer.double(1)
+        with pytest.raises(ValidationError):
+            await outer.inner.double('x')
+
+    async def test_off(self):
+        outer = Outer(Inner('off'))
+        assert await outer.double(3) == 6
+        assert await outer.inner.double('x') == 'xx'
+
+    def test_functions_use_the_default_mode(self, monkeypatch):
+        monkeypatch.setattr(
+            'squarecloud._internal.decorators.VALIDATION', 'full'
+        )
+        assert parse('1') == 1
+        with pytest.raises(ValidationError):
+            parse('x')
+
+    async def test_client_switch(self):
+        client = Client('key', validation='off')
+        assert client.validation == 'off'
+        with pytest.raises(ValueError):
+            Client('key', validation='sometimes')
+        with pytest.raises(ValidationError):
+            await Client('key', validation='full').app_status(app_id=1)
+
+    def test_environment_variable(self):
+        script = (
+            'from squarecloud import Client;'
+            'print(Client("key").validation)'
+        )
+        for value, expected in (
+            ('off', 'off'),
+            ('boundary', 'boundary'),
+            ('nonsense', 'full'),
+        ):
+            output = subprocess.run(
+                [sys.executable, '-c', script],
+                env={**os.environ, 'SQUARECLOUD_VALIDATE': value},
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+            assert output.strip() == expected